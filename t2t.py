@@ -35,6 +35,12 @@ Filtering options (For data in the specified column):
     - NOT EQUALS int    (Data must not match the specified value exactly)
     - EQUALS float      (Data must match the specified value exactly)
     - NOT EQUALS float  (Data must not match the specified value exactly)
+    - IN                (Data must match one of the specified values exactly)
+    - CONTAINS ANY      (Data must contain at least one of the specified
+                        substrings)
+    - NOT CONTAINS ANY  (Data must not contain any of the specified substrings)
+    - MATCHES           (Data must match the specified regular expression)
+    - NOT MATCHES       (Data must not match the specified regular expression)
 
 
 
@@ -43,7 +49,23 @@ USAGE:
     python27 t2t.py <input_path> <{input_format}> <output_path>
             [-f {output_format}] <col_no>... [filter]...
             [-h keep|skip|rearrange N|C <number>|<character>]...
-            [-n <novel_unique_cols>]
+            [-n <novel_unique_cols>] [-u <global_unique_cols>]
+            [--bloom <expected_count> <false_positive_rate>]
+            [--window rows|keys <window_size>]
+            [--sorted <col_no> asc|desc num|str]... [--check-sorted]
+            [--index <interval>] [--rows <first_row> <last_row>]
+            [--zone-map <block_size>] [--value-index <col_no> num|str]
+            [--join <lookup_path> <{lookup_format}> <col_no> <lookup_col_no>
+                    inner|left]
+            [--aggregate count|sum|min|max|mean [<col_no>]]...
+            [--top <K> <col_no> max|min]
+            [--sort <col_no> asc|desc num|str]... [--profile]
+            [--shard rows|bytes <size>]
+            [--sql-table <table_name>] [--sql-type <col_no> <sql_type>]...
+            [--sql-index <col_no>]... [--cache <cache_dir> [--cache-hash]]
+            [--incremental] [--follow] [--checkpoint <rows>] [--resume]
+            [--limit <rows>] [--sample every|random <N>] [--estimate]
+            [--metrics-json <metrics_path>]
 
 
 
@@ -63,6 +85,18 @@ MANDATORY:
     output_path
         
         The filepath of the output file.
+        
+        To write the rows of data to a separate file for each value in a column,
+        include the column number in the filepath, in the form "{colN}". Ex.
+        "Output_{col5}.tsv" writes the rows with "Desert" in column 5 to
+        "Output_Desert.tsv". Several columns may be included. Any "/" or "\\"
+        in a value is replaced with "_". Lines at the start of the file which
+        are kept or rearranged are written to every file. If any files which
+        could be written to already exist, overwriting them is confirmed or
+        forbidden once, in the same manner as overwriting a single file.
+        
+        Up to MAX_OPEN_FILES files are kept open at once. Cannot be used with
+        --aggregate, --top, --sort or --profile.
 
 OPTIONAL:
     
@@ -74,6 +108,34 @@ OPTIONAL:
             tsv - Tab-separated values
             csv - Comma-separated values
             ssv - Space-separated values
+            sqlite - A table in an SQLite database
+            npy - A NumPy array file for each column
+        
+        For sqlite, the rows of data are inserted into a new table in the
+        database file at the output filepath, replacing any table of the same
+        name. The column names are taken from the last line at the start of the
+        file which is rearranged, if any. Otherwise, the columns are named after
+        the column numbers. Ex. "col3", "j2"
+        
+        Replacing an existing table is confirmed or forbidden in the same
+        manner as overwriting an existing file. If the output filepath is a
+        file which is not an SQLite database, an error is printed.
+        
+        For npy, each column is written to a separate ".npy" file, named after
+        the output filepath (without its file extension) and the column name,
+        which is determined as for sqlite. Ex. "Output.HEIGHT.npy" A schema
+        describing the files is written in JSON format to a file with the
+        extension ".schema.json" instead of the output file's extension.
+        If any such files already exist, overwriting them is confirmed or
+        forbidden once, in the same manner as overwriting a single file.
+        
+        The type of each array is determined as for sqlite. (See --sql-type)
+        INTEGER columns are written as 64-bit integers, with 0 in place of
+        values which are not integers. REAL and NUMERIC columns are written as
+        64-bit floats, with NaN in place of values which are not numbers. TEXT
+        columns are written as fixed-width byte strings, as wide as the longest
+        value.
+        The number of values replaced in each column is recorded in the schema.
     
     col_no
         
@@ -88,6 +150,10 @@ OPTIONAL:
         first column, enter "1".
         
         To create an empty column, use 0.
+        
+        To output a column from the lookup table specified using --join, add a
+        "j" before its column number. Ex. To output the third column of the
+        lookup table, enter "j3".
     
     filter
         
@@ -135,6 +201,12 @@ OPTIONAL:
                     i!= Does not equal <int query>
                     f=  Equals <float query>
                     f!= Does not equal <float query>
+                    in= Is one of <list query>
+                    in@ Is one of <file query>
+                    :@  Contains any of <file query>
+                    !:@ Does not contain any of <file query>
+                    ~   Matches <regex query>
+                    !~  Does not match <regex query>
                 
                 The "Equals" and "Does not equal" operators can compare ints
                 with floats, but may not work perfectly.
@@ -146,6 +218,25 @@ OPTIONAL:
             query
                 
                 The value used as the substring or cutoff.
+                
+                A list query is a comma-separated list of strings. A file query
+                is the filepath of a file containing one string per line, which
+                can contain a very large number of strings. For either, use an
+                exclusion criteria to exclude rows where the data is one of the
+                strings.
+                
+                The substrings in the file query for "Contains any of" and "Does
+                not contain any of" are searched for all at once, so the time
+                taken does not depend on how many substrings there are. To
+                search for a single substring beginning with "@" instead, with
+                "Contains" or "Does not contain", double the "@". Ex.
+                "col2:@@gmail.com"
+                
+                A regex query is a Python regular expression, which may match
+                anywhere in the data unless anchored with "^" or "$". It is
+                compiled once. If the regular expression requires a certain
+                substring, data without that substring is rejected without
+                running the regular expression.
     
     keep|skip|rearrange
         
@@ -191,6 +282,512 @@ OPTIONAL:
         
         If no unique columns are specified, no rows of data will be filtered
         out.
+    
+    global_unique_cols
+        
+        An "n"-separated list of columns. A row of data will only be accepted if
+        its combination of values in these columns appears exactly once in the
+        entire file, counting all the rows of data regardless of the filtering
+        criteria. The rows which are accepted keep their original order.
+        
+        The file is read twice. If there are too many combinations of values to
+        hold in memory, they are partitioned into temporary files.
+    
+    expected_count
+    false_positive_rate
+        
+        Optional. Only has an effect if novel_unique_cols were specified.
+        
+        Record the combinations of values which have been seen so far in a
+        Bloom filter instead of recording every combination exactly. The Bloom
+        filter is sized for [expected_count] distinct combinations with a
+        false positive rate of [false_positive_rate], and its memory usage is
+        fixed when the program starts.
+        
+        A false positive causes a row with a novel combination of values to be
+        rejected, so a small fraction of rows which should have been accepted
+        may be lost. The estimated false positive rate is reported at the end
+        of the run.
+    
+    rows|keys
+    window_size
+        
+        Optional. Only has an effect if novel_unique_cols were specified.
+        
+        Only require a combination of values to be novel within a window of
+        limited size, rather than across all the rows seen so far. Memory usage
+        is constant regardless of the length of the file. This is suitable for
+        roughly ordered data in which duplicates only occur close together.
+        
+        rows
+            The window contains the combinations of values of the last
+            [window_size] rows which were accepted.
+        
+        keys
+            The window contains the [window_size] combinations of values which
+            were seen most recently. Seeing a combination again, even in a row
+            which is rejected for not being novel, makes it the most recent.
+            Rows rejected by the filtering criteria, --join or -u do not
+            count as seeing their combination.
+        
+        Cannot be used with --bloom.
+    
+    --sorted
+        
+        Optional. Can be specified multiple times.
+        
+        Declare that the input file is already sorted by the specified column.
+        If specified multiple times, the first column specified is the primary
+        sort column, the second is used to break ties in the first, and so on.
+        
+        asc|desc
+            Whether the column is sorted in ascending or descending order.
+        
+        num|str
+            Whether the column is sorted numerically or lexically.
+        
+        When the input is sorted, inclusion criteria on the primary sort column
+        are used to jump directly to the first row which could satisfy them, and
+        to stop reading the file once no more rows can satisfy them. This
+        applies to the numerical operators for a numerically sorted column, and
+        to the "Equals <string query>" operator for a lexically sorted column.
+        The lines jumped over are not counted, so the rows read are then not
+        identified by their row numbers in the messages printed.
+        
+        If the novel_unique_cols are the same as the first sort column(s), and
+        those are sorted lexically, rows with the same combination of values are
+        adjacent to each other, and only the previous combination of values is
+        recorded, unless --bloom or --window is specified.
+        
+        The results are unreliable if the input is not actually sorted. Use
+        --check-sorted to verify the rows which are read and stop with an error
+        if one is out of order.
+    
+    --index
+        
+        Optional.
+        
+        Build a sidecar index file next to the input file (with the extension
+        ".t2ti" appended), recording the position of every [interval]th line.
+        The index is reused by later runs for as long as the size and
+        modification time of the input file are unchanged, and is rebuilt
+        otherwise.
+    
+    --rows
+        
+        Optional.
+        
+        Only process the rows of data from [first_row] to [last_row], inclusive.
+        The rows of data are numbered from 1, after the lines at the start of
+        the file which are kept/skipped/rearranged. If an up-to-date index file
+        exists, it is used to jump straight to [first_row] instead of reading
+        every line before it.
+        
+        This allows a large file to be split between several runs of this
+        program by row ranges.
+    
+    --zone-map
+        
+        Optional.
+        
+        Build a sidecar statistics file next to the input file (with the
+        extension ".t2tz" appended), which records the minimum and maximum
+        numbers, and the number of empty and non-numerical values, in every
+        column for each block of [block_size] lines. The statistics file is
+        reused by later runs for as long as the size and modification time of
+        the input file are unchanged, and is rebuilt otherwise.
+        
+        Whenever an up-to-date statistics file exists, it is used to skip
+        blocks of rows without reading them, if the numerical filtering criteria
+        show that none of the rows in the block can be accepted.
+    
+    --value-index
+        
+        Optional.
+        
+        Build a sidecar index file next to the input file (with the extension
+        ".t2tv" and the column number appended), which lists the values in the
+        specified column in sorted order, along with the position of the row of
+        data each value came from.
+        
+        num|str
+            Whether the values are sorted numerically or lexically. Values which
+            are not numbers are never matched by a numerical index.
+        
+        The index is reused by later runs for as long as the size and
+        modification time of the input file are unchanged, and the same number
+        of lines at the start of the file are kept/skipped/rearranged. It is
+        rebuilt otherwise.
+        
+        Whenever an up-to-date index exists for a column with inclusion
+        criteria, it is used automatically to find the matching rows, and only
+        those rows are read. A numerical index is used for the numerical
+        operators, while a lexical index is used for the "Equals <string query>"
+        operator. The index is not used if it matches more rows than can be held
+        in memory, or if --rows is specified.
+    
+    --join
+        
+        Optional.
+        
+        Join each row of data to the row of a second table (the lookup table)
+        whose value in [lookup_col_no] equals the row's value in [col_no]. The
+        lookup table's columns can then be output, as described for col_no.
+        If several rows of the lookup table have the same value, the first is
+        used.
+        
+        lookup_format
+            The file format of the lookup table. (tsv, csv or ssv)
+        
+        inner|left
+            inner
+                Rows of data with no matching row in the lookup table are
+                rejected.
+            left
+                Rows of data with no matching row in the lookup table are
+                accepted, with empty values for the lookup table's columns.
+        
+        The lookup table is read into memory once. If it is larger than
+        MAX_LOOKUP_BYTES, only the position of each row is held in memory, and
+        the rows are read from the memory-mapped file when needed.
+        
+        The lines at the start of the lookup table which are specified by -h,
+        in the same manner as for the input file, are not joined to the rows of
+        data. Instead, the lines at the start of the input file which are
+        rearranged are joined to them, so column headers can be output for the
+        lookup table's columns if both tables have headers for the joined
+        columns.
+    
+    --aggregate
+        
+        Optional.
+        
+        Group the rows of data which are accepted by their values in the
+        specified columns (col_no), and output one row per group instead of one
+        row per accepted row. Each row output contains the values of the
+        specified columns, followed by the result of each --aggregate, in the
+        order they were specified. The groups are output in sorted order.
+        
+        count|sum|min|max|mean
+            count
+                The number of rows in the group. (No column number is needed)
+            sum
+                The sum of the numbers in the column.
+            min
+                The smallest number in the column.
+            max
+                The largest number in the column.
+            mean
+                The mean of the numbers in the column.
+        
+        Empty and non-numerical values are ignored by sum, min, max and mean.
+        If a group has no numbers in the column, the result is left empty.
+        
+        If there are more than MAX_RECORDS_IN_MEMORY groups, the results so far
+        are written to temporary files, and combined once all the rows have
+        been read.
+    
+    --top
+        
+        Optional.
+        
+        Only output the K rows of data accepted with the largest (max) or
+        smallest (min) numbers in the specified column, in that order. Rows
+        with an empty or non-numerical value in the column are rejected. Of the
+        rows with equal numbers, the earliest ones are kept.
+        
+        Only K rows are held in memory at any one time, so any number of rows
+        can be processed in a single pass of the input file.
+        
+        Cannot be used with --aggregate or --profile.
+    
+    --sort
+        
+        Optional.
+        
+        Sort the rows of data accepted by the values in the specified column of
+        the input file, in ascending or descending order, numerically or as
+        strings. Specify --sort several times to sort by several columns; rows
+        with equal values in the first column are sorted by the second column,
+        and so on. Rows which are equal in all the sort columns are kept in
+        their original order.
+        
+        When sorting numerically, empty and non-numerical values are placed
+        after all the numbers, in ascending lexical order.
+        
+        Up to MAX_RECORDS_IN_MEMORY rows are sorted in memory at a time. If more
+        rows are accepted, each sorted run of rows is written to a temporary
+        file, and the runs are then merged, so the output can be much larger
+        than the available memory.
+        
+        Cannot be used with --aggregate or --top.
+    
+    --profile
+        
+        Optional.
+        
+        Record statistics for each column output, and write them in JSON format
+        to a file next to the output file (with the extension ".profile.json"
+        appended). For each column, the number of values, the number of empty
+        and non-numerical values, the minimum and maximum numbers, and an
+        estimate of the number of distinct values are recorded.
+        
+        The number of distinct values is estimated using a HyperLogLog sketch
+        with 4096 registers, which has a standard error of about 1.6%. The
+        registers are included in the file, in hexadecimal, so the sketches of
+        several files can be merged, by taking the largest value of each
+        register, to estimate the number of distinct values across all of them.
+        
+        The statistics are recorded for every row of data accepted, which are
+        the rows written to the output file.
+        
+        Cannot be used with --aggregate, --top or a filepath containing
+        "{colN}".
+    
+    --shard
+        
+        Optional.
+        
+        Split the output into several numbered files (shards), starting a new
+        shard once the current one contains [size] rows of data, or would exceed
+        [size] bytes. (A shard always contains at least one row of data) The
+        shards are named after the output file, with the shard number added
+        before the file extension. Ex. "Output_1.tsv", "Output_2.tsv"... Lines
+        at the start of the file which are kept or rearranged are written to
+        every shard. If any shards or the manifest already exist, overwriting
+        them is confirmed or forbidden once, in the same manner as overwriting a
+        single file. All the existing shards are then deleted, including any
+        beyond those written by this run.
+        
+        A manifest is written in JSON format to a file named after the output
+        file (with the extension ".manifest.json" appended). It lists each
+        shard along with the number of rows of data it contains, the row
+        numbers of its first and last rows, its size in bytes, and the position
+        and size of its rows of data within the output as a whole.
+        
+        Cannot be used with a filepath containing "{colN}".
+    
+    --sql-table
+        
+        Optional.
+        
+        The name of the table to insert the rows of data into, when the output
+        format is sqlite. The default is "data".
+    
+    --sql-type
+        
+        Optional.
+        
+        The type of the specified column in the table, when the output format
+        is sqlite or npy. Acceptable options are:
+            int - INTEGER
+            real - REAL
+            num - NUMERIC
+            text - TEXT
+        
+        Columns without a specified type are typed according to the filtering
+        criteria on them. Columns with the "Greater than" or "Less than"
+        operators are NUMERIC, while those with the "Equals (integer)" or
+        "Equals (float)" operators are INTEGER or REAL. Otherwise, columns are
+        TEXT. The results of aggregate functions are INTEGER for count and
+        NUMERIC otherwise. Empty values in columns which are not TEXT are
+        inserted as NULL.
+    
+    --sql-index
+        
+        Optional.
+        
+        Create an index on the specified column of the table, when the output
+        format is sqlite. The column must be one of the columns output.
+        Indexes are created after all the rows of data have been inserted.
+        
+        The rows of data are inserted in batches of SQLITE_BATCH_ROWS, all
+        within a single transaction, with the database's journal and disk
+        synchronization turned off. The database may be left corrupted if the
+        program is interrupted.
+    
+    --cache
+        
+        Optional.
+        
+        Keep the outputs of jobs in the specified directory, and serve the
+        output of a repeated job from there instead of processing the input
+        file again. A job is identified by the input file (its filepath, size
+        and time of last modification), any lookup table, and the arguments
+        which affect the output, such as the file formats, columns, filtering
+        criteria and header options. (Options such as --index, which only
+        change how the input file is read, are ignored)
+        
+        Cached outputs are served through hard links where possible
+        (See CACHE_HARD_LINKS), so an output served from the cache should not
+        be modified in place. Once the cache holds more than CACHE_MAX_BYTES,
+        the least recently used outputs are removed.
+        
+        Cannot be used with --profile, --shard, the sqlite or npy output
+        formats, or a filepath containing "{colN}".
+    
+    --cache-hash
+        
+        Optional.
+        
+        Identify the input file and lookup table by a hash of their contents,
+        instead of their filepaths, sizes and times of last modification. The
+        files must be read in full to do so, but a copy of a file, or a file
+        which was rewritten without being changed, shares the same cached
+        outputs.
+    
+    --incremental
+        
+        Optional.
+        
+        Process an input file which is only ever appended to, such as a log
+        file, in several runs. The position in the input file which processing
+        stopped at, the number of rows read and accepted, and the combinations
+        of values recorded for -n are saved to a file named after the output
+        file (with the extension ".state.json" appended). With the default
+        method for -n, the combinations of values are instead appended to a
+        second file (with the extension ".state.keys" appended), so each save
+        only writes the new ones. If the state file already exists, only the
+        lines appended to the input file since then are processed, and the
+        rows accepted are appended to the output file, without confirmation.
+        
+        An incomplete line at the end of the input file is left for the next
+        run. If the state file belongs to a different job, or the input file no
+        longer begins with what was processed, an error is printed. Delete the
+        state file to start again from the beginning.
+        
+        Cannot be used with --rows, --sorted, -u, --aggregate, --top, --sort,
+        --profile, --shard, --cache, the sqlite or npy output formats, or a
+        filepath containing "{colN}".
+    
+    --follow
+        
+        Optional.
+        
+        As --incremental, but keep waiting for more lines to be appended to the
+        input file once the end is reached, in the manner of "tail -f", and
+        process them as they arrive. The input file is checked every
+        FOLLOW_INTERVAL seconds, and the state is saved each time the end is
+        reached. Press Ctrl+C to stop.
+    
+    --checkpoint
+        
+        Optional.
+        
+        Save the state, as for --incremental, after every [rows] rows read, so
+        that a run which is interrupted can be resumed with --resume. The
+        output file is flushed to disk before each checkpoint, and the state
+        file is replaced in a single step, so it is never left incomplete. The
+        state file is deleted once the run is complete, unless --incremental
+        or --follow is also used.
+        
+        A run which is stopped by --limit counts as interrupted, and the state
+        file from its last checkpoint is kept, so the rest of the input file
+        can be processed with --resume.
+        
+        Cannot be used with the same options as --incremental.
+    
+    --resume
+        
+        Optional.
+        
+        Continue an interrupted run from its last checkpoint. The output file
+        is truncated to its size at that checkpoint, without confirmation, and
+        the rest of the input file is processed, so the output is identical to
+        that of an uninterrupted run. The arguments must be the same as those
+        of the interrupted run. If there is no state file, the run starts from
+        the beginning. The rows read and accepted are reported for the whole
+        job, including those before the checkpoint, as for an uninterrupted
+        run, followed by the number of rows read by this run.
+        
+        Cannot be used with the same options as --incremental.
+    
+    --limit
+        
+        Optional.
+        
+        Stop reading the input file once the specified number of rows of data
+        have been accepted. With --aggregate, --top or --sort, these are the
+        rows accepted before they are grouped, selected or sorted.
+    
+    --sample
+        
+        Optional.
+        
+        Only process a sample of the rows of data. The rest are rejected
+        without being parsed. Acceptable options are:
+            every - Every Nth row, starting with the first
+            random - A random sample of N rows, chosen uniformly from all the
+                    rows of data
+        
+        A random sample is chosen using reservoir sampling before any rows are
+        processed, so the number of rows skipped before the next one enters
+        the sample is drawn directly, and only the rows in the sample are held
+        in memory. The rows in the sample are then processed in the order in
+        which they appear in the file. (See SAMPLE_SEED) With --rows, the
+        sample is chosen from that range of rows.
+        
+        A random sample cannot be used with the same options as
+        --incremental.
+    
+    --estimate
+        
+        Optional.
+        
+        Estimate the cost of the job instead of running it. Nothing is written
+        to the output file. ESTIMATE_SAMPLE_BYTES of the input file are read,
+        in ESTIMATE_BLOCKS blocks of lines, the first at the start of the rows
+        of data and the rest at random positions. (See SAMPLE_SEED) The rows
+        read are filtered, joined, checked for novel combinations of values and
+        output as usual, and the results are extrapolated to the whole file by
+        its size.
+        
+        The estimated number of rows of data, the number and percentage which
+        would be accepted, the size of the output, and the time the job would
+        take are reported, along with the percentage of rows which satisfy
+        each filtering criteria, counting each criteria separately. For --join
+        and -n, the percentage is of the rows accepted by the filtering
+        criteria (and --join).
+        
+        Duplicate combinations of values are only found within the sample, so
+        -n may reject more rows than estimated. Options which only change how
+        the rows are read, selected, grouped, sorted or written, such as
+        --rows, -u, --aggregate, --top, --sort, --limit and --sample, are
+        ignored.
+    
+    --metrics-json
+        
+        Optional.
+        
+        Write a report of the run to the specified file, in JSON format, for
+        use by other programs. The report contains:
+            - The number of bytes and rows of data read, and the number of rows
+              accepted
+            - The number of rows and bytes of rows of data written
+            - The rows and megabytes read per second
+            - The time spent in each stage of the run (setup, main_loop,
+              output and finish)
+            - For each filtering criteria, the number of rows it was applied
+              to, and the number of rows it rejected
+            - The number of rows rejected by --join, -u and -n
+        
+        A row is counted as rejected by the first inclusion criteria it does
+        not satisfy, in the order they were specified, or, if it satisfies
+        them all, by the first exclusion criteria it satisfies. Criteria which
+        reject many rows can then be specified earlier, so that fewer criteria
+        are applied to each row.
+        
+        While the rows are being read, the report is rewritten every
+        METRICS_INTERVAL seconds with the progress so far, including the
+        position in the input file and the estimated number of seconds until
+        the end of it is reached. The report is replaced in a single step, so
+        it can be read at any time. "complete" is true once the run has
+        finished.
+        
+        The timings, "elapsed_seconds", "rows_per_sec", "mb_per_sec", "stages"
+        and "eta_seconds", vary from run to run. Everything else is the same
+        each time the same job is run on the same input file, so reports can be
+        compared once the timings are removed.
 
 
 
@@ -214,6 +811,104 @@ EXAMPLES EXPLANATION:
     Keep columns 1, 2, 3, and 4 in that order, keeping only unique combinations
     of values in columns 1, 2, and 3.
     
+    5:
+    As example 4, but record the combinations of values in a Bloom filter sized
+    for 1000000 combinations with a 0.1% false positive rate.
+    
+    6:
+    As example 4, but only reject a row if its combination of values was seen
+    in one of the last 1000 accepted rows.
+    
+    7:
+    Keep columns 1, 2, 3, and 4 in that order, keeping only rows whose value in
+    column 4 does not appear in any other row of the file.
+    
+    8:
+    Keep columns 1, 2, 3, and 4 in that order for rows 1001 to 2000 only, using
+    an index of the position of every 1000th line to jump to row 1001.
+    
+    9:
+    Keep columns 1, 2, 3, and 4 in that order where column 3 is greater than
+    1.8, skipping blocks of 10000 lines in which no value in column 3 is
+    greater than 1.8.
+    
+    10:
+    Keep columns 1, 2, 3, and 4 in that order where column 2 is "Henry", using
+    an index of the values in column 2 to find the matching rows.
+    
+    11:
+    Keep columns 1, 2, 3, and 4 in that order where column 2 is one of the
+    names listed in Names.txt, and column 5 is not "Arctic" or "Forest".
+    
+    12:
+    Keep columns 1 and 2 where column 2 does not contain any of the substrings
+    listed in Banned_Terms.txt.
+    
+    13:
+    Keep columns 1 and 2 where column 2 begins with "A" and ends with "nn".
+    
+    14:
+    Keep columns 1 and 2, followed by column 3 of Ages.csv, for the rows whose
+    value in column 2 appears in column 1 of Ages.csv.
+    
+    15:
+    For each combination of values in columns 5 and 4, output the number of
+    accepted rows and the mean of column 3.
+    
+    16:
+    Keep columns 1, 2 and 3 for the 100 tallest entries in the Desert.
+    
+    17:
+    Keep columns 1, 2 and 5, sorted by column 5 in ascending lexical order, and
+    then by column 3 in descending numerical order.
+    
+    18:
+    Keep columns 1, 2, 3 and 4, and record the statistics of those columns.
+    
+    19:
+    Keep columns 1, 2 and 3, writing the rows for each value in column 5 to a
+    separate file, along with the headers.
+    
+    20:
+    Keep columns 1, 2, 3 and 4, writing them to shards of 1000000 rows each.
+    
+    21:
+    Insert columns 1, 2, 3 and 5 into the table "People" in an SQLite database,
+    with the column names from the first line of the file, and an index on
+    column 5.
+    
+    22:
+    Write columns 1, 3 and 4 to separate NumPy array files, as integers, floats
+    and integers respectively.
+    
+    23:
+    As example 1, but serve the output from the cache in the Cache directory
+    if the same job was run before.
+    
+    24:
+    Keep columns 1, 2 and 3 of a log file for the rows where column 5 is
+    "Desert", processing only the lines appended since the previous run.
+    
+    25:
+    As example 1, but save the state every 1000000 rows, and continue from
+    the last checkpoint if a previous run was interrupted.
+    
+    26:
+    Preview columns 1, 2, 3 and 4 of every 1000th row, stopping after the first
+    20 such rows in the Desert.
+    
+    27:
+    Estimate the size of the output and the time taken for example 1, without
+    writing the output.
+    
+    28:
+    As example 1, but write a report of the throughput and of the number of
+    rows rejected by each filtering criteria to Metrics.json.
+    
+    29:
+    Keep columns 2 and 3 from a file which is sorted by the numbers in column
+    3 in ascending order, stopping once the values are no longer below 1.8.
+    
 EXAMPLES:
 
     python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4 5
@@ -227,12 +922,87 @@ EXAMPLES:
 
     python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4 -n 1n2n3
 
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4 -n 1n2n3
+            --bloom 1000000 0.001
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4 -n 1n2n3
+            --window rows 1000
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4 -u 4
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            --index 1000 --rows 1001 2000
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            "col3>1.8" --zone-map 10000
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            col2=Henry --value-index 2 str
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            col2in@Names.txt !col5in=Arctic,Forest
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2
+            "col2!:@Banned_Terms.txt"
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2
+            "col2~^A.*nn$"
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 j3
+            --join Ages.csv csv 2 1 inner
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 5 4
+            --aggregate count --aggregate mean 3
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3
+            col5=Desert --top 100 3 max
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 5
+            --sort 5 asc str --sort 3 desc num
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            --profile
+
+    python27 t2t.py Test_Data_2__Headers.tsv tsv Output_{col5}.tsv 1 2 3
+            -h keep N 1
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            --shard rows 1000000
+
+    python27 t2t.py Test_Data_2__Headers.tsv tsv Test_Output.db -f sqlite
+            1 2 3 5 -h rearrange N 1 --sql-table People --sql-type 1 int
+            --sql-index 5
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.npy -f npy 1 3 4
+            --sql-type 1 int --sql-type 3 real --sql-type 4 int
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4 5
+            col5=Desert "col3>1.8" --cache Cache
+
+    python27 t2t.py Log.tsv tsv Test_Output.tsv 1 2 3 col5=Desert
+            --incremental
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4 5
+            col5=Desert "col3>1.8" --checkpoint 1000000 --resume
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 1 2 3 4
+            col5=Desert --sample every 1000 --limit 20
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4 5
+            col5=Desert "col3>1.8" --estimate
+
+    python27 t2t.py Test_Data_1.tsv tsv Test_Output.csv -f csv 2 3 4 5
+            col5=Desert "col3>1.8" --metrics-json Metrics.json
+
+    python27 t2t.py Sorted_Data.tsv tsv Test_Output.csv -f csv 2 3 "col3<1.8"
+            --sorted 3 asc num
+
 USAGE:
     
     python27 t2t.py <input_path> <{input_format}> <output_path>
             [-f {output_format}] <col_no>... [filter]...
             [-h keep|skip|rearrange N|C <number>|<character>]...
-            [-u <col_no>]...
+            [-n <novel_unique_cols>] [-u <global_unique_cols>]
 """
 
 
@@ -248,11 +1018,79 @@ PRINT_ERRORS = True
 PRINT_PROGRESS = True
 PRINT_METRICS = True
 
+MAX_RECORDS_IN_MEMORY = 1000000 # The number of records which may be held in
+                                # memory before they are spilled to temporary
+                                # files
+MAX_PARTITIONS = 256 # The largest number of temporary files to partition
+                     # records into at once
+TEMP_DIR = None # The directory for temporary files (None for the system
+                # default)
+
+MAX_LOOKUP_BYTES = 256*1024*1024 # Lookup tables larger than this are accessed
+                                 # through a memory-mapped file instead of
+                                 # being read into memory
+
+MAX_OPEN_FILES = 128 # The largest number of output files to keep open at once
+                     # when writing rows to a file per value
+PARTITION_BUFFER_BYTES = 65536 # The buffer size of each of those files
+
+SQLITE_BATCH_ROWS = 10000 # The number of rows inserted into an SQLite table at
+                          # once
+SQLITE_CACHE_KB = 262144 # The page cache size of an SQLite database
+
+NPY_CHUNK_VALUES = 65536 # The number of values of each column held in memory
+                         # before they are written to a NumPy array file
+NPY_HEADER_BYTES = 128 # The space reserved for the header of a NumPy array
+                       # file, which is rewritten once the length is known
+
+CACHE_MAX_BYTES = 1024*1024*1024 # The largest total size of the outputs kept
+                                 # in a result cache, beyond which the least
+                                 # recently used are removed
+CACHE_HARD_LINKS = True # Serve cached outputs through hard links where
+                        # possible, instead of copying them
+
+FOLLOW_INTERVAL = 1.0 # The number of seconds to wait before checking whether
+                      # more lines were appended to a followed input file
+STATE_PREFIX_BYTES = 65536 # The number of bytes at the start of the input file
+                           # recorded in the state of an incremental run, to
+                           # check that it is the same file when continuing
+
+SAMPLE_SEED = None # The seed for random samples of rows (None for a different
+                   # sample each time)
+
+ESTIMATE_SAMPLE_BYTES = 4*1024*1024 # The number of bytes of the input file
+                                    # read to estimate the cost of a job
+ESTIMATE_BLOCKS = 16 # The number of blocks those bytes are read in, the first
+                     # at the start of the rows of data and the rest at random
+
+METRICS_INTERVAL = 10.0 # The number of seconds between each time the progress
+                        # of a run is written to its metrics file
+
+BISECT_MIN_BYTES = 4096 # Stop a binary search on a file once the remaining
+                        # section is this small, and read it sequentially
+
 
 
 # Imported Modules #############################################################
 
+import os
+import re
 import sys
+import json
+import time
+import array
+import math
+import mmap
+import heapq
+import random
+import struct
+import shutil
+import glob
+import sqlite3
+import hashlib
+import tempfile
+import sre_parse
+import collections
 
 
 
@@ -271,6 +1109,11 @@ class OP:
     NOT_EQUAL__INT=10
     EQUALS__FLOAT=11
     NOT_EQUAL__FLOAT=12
+    IN=13
+    CONTAINS_ANY=14
+    NOT_CONTAIN_ANY=15
+    MATCHES=16
+    NOT_MATCH=17
 
 class ALIGN:
     LEFT=1
@@ -287,6 +1130,40 @@ class HEADER_TYPE:
     CHAR=1
     NUM=2
 
+class DEDUPE:
+    EXACT=1
+    BLOOM=2
+    WINDOW_ROWS=3
+    WINDOW_KEYS=4
+    PREVIOUS=5
+
+class AGGREGATE:
+    COUNT=1
+    SUM=2
+    MIN=3
+    MAX=4
+    MEAN=5
+
+class JOIN:
+    INNER=1
+    LEFT=2
+
+class SHARD:
+    ROWS=1
+    BYTES=2
+
+class SAMPLE:
+    EVERY=1
+    RESERVOIR=2
+
+class SORT_ORDER:
+    ASC=1
+    DESC=2
+
+class SORT_TYPE:
+    NUM=1
+    STR=2
+
 
 
 # Strings ######################################################################
@@ -305,6 +1182,9 @@ output file, move the currently existing file, or configure the default options
 in t2t.py."""
 STR__IO_error_write_unable = """
 ERROR: Unable to write to the specified output file."""
+STR__IO_error_not_database = """
+ERROR: The specified output file already exists, but is not an SQLite
+database."""
 STR__invalid_file_format = """
 ERROR: Invalid {io} file format: {s}
 Please specify one of:
@@ -325,44 +1205,365 @@ ERROR: Please specify columns for which a new unique combination of values is
 required for row of data to be accepted. Separated by the character "n" and no
 whitespaces."""
 
-STR__invalid_header_ksr = """
-ERROR: Invalid action to take: {s}
+STR__specify_bloom = """
+ERROR: Please specify 2 arguments if you use --bloom; the expected number of
+distinct combinations of values, and the desired false positive rate."""
+
+STR__invalid_bloom = """
+ERROR: Invalid Bloom filter parameters: {s}
+Please specify a positive integer for the expected number of combinations and a
+number between 0 and 1 (exclusive) for the false positive rate."""
+
+STR__specify_window = """
+ERROR: Please specify 2 arguments if you use --window; whether the window
+contains the last accepted ROWS or the most recently seen KEYS, and the size of
+the window."""
+
+STR__invalid_window = """
+ERROR: Invalid window type: {s}
 Please specify one of:
-    KEEP
-    SKIP
-    REARRANGE"""
+    ROWS
+    KEYS"""
 
-STR__invalid_header_type = """
-ERROR: Invalid type action to take: {s}
+STR__invalid_window_size = "\nERROR: Please specify a positive integer for "\
+        "the window size."
+
+STR__specify_sorted = """
+ERROR: Please specify 3 arguments if you use --sorted; the column number,
+whether the column is sorted in ASCENDING or DESCENDING order, and whether it is
+sorted NUMERICALLY or as STRINGS."""
+
+STR__invalid_sorted_col = "\nERROR: Invalid column number for --sorted: {s}"
+
+STR__invalid_sort_order = """
+ERROR: Invalid sort order: {s}
+Please specify one of:
+    ASC
+    DESC"""
+
+STR__invalid_sort_type = """
+ERROR: Invalid sort type: {s}
 Please specify one of:
     NUM
-    CHAR"""
+    STR"""
 
-STR__invalid_nc_num = "\nERROR: Please specify a positive integer."
+STR__check_without_sorted = """
+ERROR: --check-sorted requires the sort columns to be specified using
+--sorted."""
 
-STR__invalid_nc_char = "\nERROR: Please specify a character."
+STR__not_sorted = """
+ERROR: The input file is not sorted as declared. Row {N} is out of order:
+{s}"""
 
-STR__invalid_argument = "\nERROR: Invalid argument: {s}"
+STR__not_sorted_skip = """
+ERROR: The input file is not sorted as declared. This row is out of order:
+{s}"""
 
-STR__at_least_one_column = "\nERROR: Please specify at least one column."
+STR__method_without_n = """
+ERROR: --bloom and --window require novel unique columns to be specified using
+-n."""
+
+STR__bloom_with_window = """
+ERROR: --bloom and --window cannot be used together."""
+
+STR__specify_global_unique_columns = """
+ERROR: Please specify columns for which the combination of values must be unique
+across the entire file for a row of data to be accepted. Separated by the
+character "n" and no whitespaces."""
+
+STR__specify_index = """
+ERROR: Please specify the number of lines between each position recorded in the
+index if you use --index."""
+
+STR__specify_rows = """
+ERROR: Please specify 2 arguments if you use --rows; the first and the last row
+of data to be processed."""
+
+STR__invalid_rows = """
+ERROR: Invalid row range: {s}
+Please specify two positive integers, the second no smaller than the first."""
+
+STR__specify_zone_map = """
+ERROR: Please specify the number of lines in each block if you use
+--zone-map."""
+
+STR__specify_value_index = """
+ERROR: Please specify 2 arguments if you use --value-index; the column number,
+and whether the values are to be sorted NUMERICALLY or as STRINGS."""
+
+STR__invalid_value_index_col = "\nERROR: Invalid column number for "\
+        "--value-index: {s}"
+
+STR__specify_join = """
+ERROR: Please specify 5 arguments if you use --join; the filepath of the lookup
+table, its file format, the column number in the input file and in the lookup
+table to join on, and whether to perform an INNER or LEFT join."""
+
+STR__IO_error_read_lookup = "\nERROR: Lookup table does not exist or could "\
+        "not be opened."
+
+STR__invalid_join_col = "\nERROR: Invalid column number for --join: {s}"
+
+STR__invalid_join_type = """
+ERROR: Invalid join type: {s}
+Please specify one of:
+    INNER
+    LEFT"""
+
+STR__specify_aggregate = """
+ERROR: Please specify the function to aggregate the rows of each group with if
+you use --aggregate, and the column number for all functions except COUNT."""
+
+STR__invalid_aggregate = """
+ERROR: Invalid aggregate function: {s}
+Please specify one of:
+    COUNT
+    SUM
+    MIN
+    MAX
+    MEAN"""
+
+STR__invalid_aggregate_col = "\nERROR: Invalid column number for "\
+        "--aggregate: {s}"
+
+STR__specify_top = """
+ERROR: Please specify 3 arguments if you use --top; the number of rows to keep,
+the column number, and whether to keep the rows with the MAXIMUM or MINIMUM
+numbers."""
+
+STR__invalid_top_count = "\nERROR: Invalid number of rows for --top: {s}"
+
+STR__invalid_top_col = "\nERROR: Invalid column number for --top: {s}"
+
+STR__invalid_top_order = """
+ERROR: Invalid choice of rows to keep: {s}
+Please specify one of:
+    MAX
+    MIN"""
+
+STR__specify_sort = """
+ERROR: Please specify 3 arguments if you use --sort; the column number, whether
+to sort in ASCENDING or DESCENDING order, and whether to sort NUMERICALLY or as
+STRINGS."""
+
+STR__invalid_sort_col = "\nERROR: Invalid column number for --sort: {s}"
+
+STR__sort_with_aggregate = """
+ERROR: --sort cannot be used with --aggregate or --top."""
+
+STR__profile_with_aggregate = """
+ERROR: --profile cannot be used with --aggregate or --top."""
+
+STR__partition_pattern = r"\{col(\d+)\}" # Columns in the output filepath
+
+STR__invalid_partition_col = "\nERROR: Invalid column number in the output "\
+        "filepath: {s}"
+
+STR__partition_with_aggregate = """
+ERROR: Rows cannot be written to a file per value with --aggregate, --top,
+--sort or --profile."""
+
+STR__specify_shard = """
+ERROR: Please specify 2 arguments if you use --shard; whether to limit the size
+of each shard by ROWS or BYTES, and the largest number of rows or bytes."""
+
+STR__invalid_shard_type = """
+ERROR: Invalid shard size unit: {s}
+Please specify one of:
+    ROWS
+    BYTES"""
+
+STR__invalid_shard_size = "\nERROR: Please specify a positive integer for the "\
+        "shard size."
+
+STR__shard_with_partition = """
+ERROR: --shard cannot be used with a file per value."""
+
+STR__specify_limit = """
+ERROR: Please specify the number of rows to accept if you use --limit."""
+
+STR__specify_sample = """
+ERROR: Please specify 2 arguments if you use --sample; whether to keep EVERY Nth
+row or a RANDOM sample of N rows, and N."""
+
+STR__invalid_sample_type = """
+ERROR: Invalid sampling method: {s}
+Please specify one of:
+    EVERY
+    RANDOM"""
+
+STR__invalid_sample_size = "\nERROR: Please specify a positive integer for "\
+        "the sample interval or size."
+
+STR__record_delim = "\x1f" # Separates the values of rows for sqlite and npy
+
+STR__specify_sql_table = "\nERROR: Please specify the name of the table if "\
+        "you use --sql-table."
+
+STR__specify_sql_type = """
+ERROR: Please specify 2 arguments if you use --sql-type; the column number and
+the type of the column."""
+
+STR__invalid_sql_type = """
+ERROR: Invalid column type: {s}
+Please specify one of:
+    INT
+    REAL
+    NUM
+    TEXT"""
+
+STR__invalid_sql_col = "\nERROR: Invalid column number for --sql-type or "\
+        "--sql-index: {s}"
+
+STR__sql_index_not_output = "\nERROR: The column for --sql-index is not "\
+        "one of the columns output: {s}"
+
+STR__sql_without_sqlite = """
+ERROR: --sql-table and --sql-index require the output format to be sqlite, and
+--sql-type requires it to be sqlite or npy."""
+
+STR__sqlite_with_partition = """
+ERROR: The sqlite and npy output formats cannot be used with --shard or a file
+per value."""
+
+STR__specify_cache = "\nERROR: Please specify the cache directory if you "\
+        "use --cache."
+
+STR__cache_with_partition = """
+ERROR: --cache requires a single output file, and so cannot be used with
+--profile, --shard, the sqlite or npy output formats, or a file per value."""
+
+STR__hash_without_cache = """
+ERROR: --cache-hash cannot be used without --cache."""
+
+STR__incremental_with_x = """
+ERROR: --incremental, --follow, --checkpoint and --resume require rows to be
+written to a single output file as they are read, and so cannot be used with
+--rows, --sorted, -u, --aggregate, --top, --sort, --profile, --shard, --cache,
+a random --sample, the sqlite or npy output formats, or a file per value."""
+
+STR__specify_metrics_json = "\nERROR: Please specify the filepath of the "\
+        "metrics file if you use --metrics-json."
+
+STR__specify_checkpoint = """
+ERROR: Please specify the number of rows between each checkpoint if you use
+--checkpoint."""
+
+STR__state_mismatch = """
+ERROR: The state file does not belong to the same job, or the input or output
+file was changed since it was saved. Delete it to start from the beginning:
+    {s}"""
+
+STR__top_with_aggregate = """
+ERROR: --top cannot be used with --aggregate."""
+
+STR__join_col_without_join = """
+ERROR: Columns from a lookup table were specified without specifying the lookup
+table using --join."""
+
+STR__invalid_header_ksr = """
+ERROR: Invalid action to take: {s}
+Please specify one of:
+    KEEP
+    SKIP
+    REARRANGE"""
+
+STR__invalid_header_type = """
+ERROR: Invalid type action to take: {s}
+Please specify one of:
+    NUM
+    CHAR"""
+
+STR__invalid_nc_num = "\nERROR: Please specify a positive integer."
+
+STR__invalid_nc_char = "\nERROR: Please specify a character."
+
+STR__invalid_argument = "\nERROR: Invalid argument: {s}"
+
+STR__at_least_one_column = "\nERROR: Please specify at least one column."
 
 STR__overwrite_confirm = "\nFile already exists. Do you wish to overwrite it? "\
         "(y/n): "
 
+STR__overwrite_files_confirm = "\n{N} output file(s) already exist. Do you "\
+        "wish to overwrite them? (y/n): "
+
+STR__overwrite_table_confirm = "\nTable \"{s}\" already exists in the "\
+        "database. Do you wish to replace it? (y/n): "
+
 STR__invalid_operation = "\nERROR: Invalid operation specified."
 
+STR__invalid_regex = "\nERROR: Invalid regular expression: {s}"
+
+STR__IO_error_query_file = "\nERROR: Query file does not exist or could not "\
+        "be opened: {s}"
+
 
 
 STR__metrics_lines = "\nTotal_Lines:  {N}"
 
 STR__metrics_passed = "Total_Passed: {N} ( {P}% )"
 
+STR__metrics_bloom = "Est_FP_Rate:  {P}%"
+
+STR__metrics_sorted_skip = "Sorted_Skip:  {N} bytes skipped before the first "\
+        "qualifying row"
+
+STR__metrics_sorted_stop = "Sorted_Stop:  stopped after row {N}"
+
+STR__metrics_sorted_stop_skip = "Sorted_Stop:  stopped after the last "\
+        "qualifying row"
+
+STR__metrics_rows = "Row_Range:    rows {M} to {N}"
+
+STR__metrics_zone_map = "Zone_Skip:    {N} rows skipped in {B} blocks"
+
+STR__metrics_groups = "Groups:       {N}"
+
+STR__metrics_partitions = "Partitions:   {N} files written"
+
+STR__metrics_shards = "Shards:       {N} files written"
+
+STR__metrics_limit = "Row_Limit:    stopped after row {N}"
+
+STR__metrics_limit_skip = "Row_Limit:    stopped once {N} rows were accepted"
+
+STR__metrics_sample = "Sampled:      {N} rows"
+
+STR__metrics_resumed = "Resumed:      continued from row {N}, {M} new rows "\
+        "read"
+
+STR__metrics_value_index = "Value_Index:  used the index on column {C} to "\
+        "read {N} rows"
+
+STR__metrics_est_sample = "\nEst_Sample:   {N} rows ( {P}% of the input )"
+
+STR__metrics_est_lines = "Est_Lines:    {N}"
+
+STR__metrics_est_passed = "Est_Passed:   {N} ( {P}% )"
+
+STR__metrics_est_bytes = "Est_Bytes:    {N} bytes of rows of data output"
+
+STR__metrics_est_time = "Est_Time:     {N} seconds"
+
+STR__metrics_pass_rate = "Pass_Rate:    {P}%  {s}"
+
+STR__pass_rate_join = "--join (of the rows accepted by the above)"
+
+STR__pass_rate_novel = "-n (of the rows accepted by the above)"
+
 STR__parsing_args = "\nParsing arguments..."
 
+STR__cache_hit = "\nThe output was served from the cache."
+
 STR__t2t_begin = "\nRunning Table2Table..."
 
 STR__t2t_complete = "\nTable2Table successfully finished."
 
+STR__estimate_begin = "\nEstimating Table2Table..."
+
+STR__estimate_complete = "\nTable2Table estimate successfully finished."
+
 
 
 # Lists ########################################################################
@@ -377,7 +1578,8 @@ LIST__csv = [",", "C", "c", "CSV", "Csv", "csv", "COMMA", "Comma", "comma"]
 LIST__ssv = [" ", "S", "s", "SSV", "Ssv", "ssv", "SPACE", "Space", "space"]
 
 LIST__search_ops = ["=", "!=", ":", "!:", ">", ">=", "<", "<=",
-        "i=", "i!=", "f=", "f!="] # Syn with DICT__ops
+        "i=", "i!=", "f=", "f!=",
+        "in=", "in@", ":@", "!:@", "~", "!~"] # Syn with DICT__ops
 
 LIST__math_ops = [OP.GREATER_THAN, OP.GREAQUALS, OP.LESS_THAN, OP.LEQUALS]
 LIST__math_ops_i = [OP.EQUALS__INT, OP.NOT_EQUAL__INT]
@@ -389,6 +1591,41 @@ LIST__ksr_skip = ["S", "s", "SKIP", "Skip", "skip"]
 LIST__ksr_rear = ["R", "r", "REARRANGE", "Rearrange", "rearrange", "REAR",
         "Rear", "rear"]
 
+LIST__count = ["C", "c", "COUNT", "Count", "count"]
+LIST__sum = ["S", "s", "SUM", "Sum", "sum"]
+LIST__min = ["MIN", "Min", "min", "MINIMUM", "Minimum", "minimum"]
+LIST__max = ["MAX", "Max", "max", "MAXIMUM", "Maximum", "maximum"]
+LIST__mean = ["MEAN", "Mean", "mean", "AVERAGE", "Average", "average", "AVG",
+        "Avg", "avg"]
+
+LIST__sqlite = ["SQLITE", "SQLite", "Sqlite", "sqlite", "DB", "Db", "db"]
+
+LIST__npy = ["NPY", "Npy", "npy", "NUMPY", "NumPy", "Numpy", "numpy"]
+
+LIST__int = ["I", "i", "INT", "Int", "int", "INTEGER", "Integer", "integer"]
+LIST__real = ["R", "r", "REAL", "Real", "real", "FLOAT", "Float", "float"]
+LIST__text = ["T", "t", "TEXT", "Text", "text"]
+
+LIST__bytes = ["B", "b", "BYTES", "Bytes", "bytes"]
+
+LIST__every = ["E", "e", "EVERY", "Every", "every", "SYSTEMATIC", "Systematic",
+        "systematic"]
+LIST__reservoir = ["R", "r", "RANDOM", "Random", "random", "RESERVOIR",
+        "Reservoir", "reservoir"]
+
+LIST__inner = ["I", "i", "INNER", "Inner", "inner"]
+LIST__left = ["L", "l", "LEFT", "Left", "left"]
+
+LIST__window_rows = ["R", "r", "ROWS", "Rows", "rows"]
+LIST__window_keys = ["K", "k", "KEYS", "Keys", "keys"]
+
+LIST__asc = ["A", "a", "ASC", "Asc", "asc", "ASCENDING", "Ascending",
+        "ascending"]
+LIST__desc = ["D", "d", "DESC", "Desc", "desc", "DESCENDING", "Descending",
+        "descending"]
+
+LIST__str = ["S", "s", "STR", "Str", "str", "STRING", "String", "string"]
+
 LIST__num = ["N", "n", "NUMBER", "Number", "number", "NUM", "Num", "num"]
 LIST__char = ["C", "c", "CHARACTER", "Character", "character", "CHAR", "Char",
         "char"]
@@ -416,7 +1653,13 @@ DICT__ops = {
         "i=":  OP.EQUALS__INT, 
         "i!=": OP.NOT_EQUAL__INT,
         "f=":  OP.EQUALS__FLOAT, 
-        "f!=": OP.NOT_EQUAL__FLOAT
+        "f!=": OP.NOT_EQUAL__FLOAT,
+        "in=": OP.IN,
+        "in@": OP.IN,
+        ":@":  OP.CONTAINS_ANY,
+        "!:@": OP.NOT_CONTAIN_ANY,
+        "~":   OP.MATCHES,
+        "!~":  OP.NOT_MATCH
         } # Sync with LIST__search_ops
 
 
@@ -426,223 +1669,3673 @@ for i in LIST__ksr_keep: DICT__ksr[i] = KSR.KEEP
 for i in LIST__ksr_skip: DICT__ksr[i] = KSR.SKIP
 for i in LIST__ksr_rear: DICT__ksr[i] = KSR.REAR
 
+DICT__aggregate = {}
+for i in LIST__count: DICT__aggregate[i] = AGGREGATE.COUNT
+for i in LIST__sum: DICT__aggregate[i] = AGGREGATE.SUM
+for i in LIST__min: DICT__aggregate[i] = AGGREGATE.MIN
+for i in LIST__max: DICT__aggregate[i] = AGGREGATE.MAX
+for i in LIST__mean: DICT__aggregate[i] = AGGREGATE.MEAN
+
+DICT__top = {}
+for i in LIST__max: DICT__top[i] = SORT_ORDER.DESC
+for i in LIST__min: DICT__top[i] = SORT_ORDER.ASC
+
+DICT__shard = {}
+for i in LIST__window_rows: DICT__shard[i] = SHARD.ROWS
+for i in LIST__bytes: DICT__shard[i] = SHARD.BYTES
+
+DICT__sample = {}
+for i in LIST__every: DICT__sample[i] = SAMPLE.EVERY
+for i in LIST__reservoir: DICT__sample[i] = SAMPLE.RESERVOIR
+
+DICT__sql_type = {}
+for i in LIST__int: DICT__sql_type[i] = "INTEGER"
+for i in LIST__real: DICT__sql_type[i] = "REAL"
+for i in LIST__num: DICT__sql_type[i] = "NUMERIC"
+for i in LIST__str + LIST__text: DICT__sql_type[i] = "TEXT"
+
+DICT__join = {}
+for i in LIST__inner: DICT__join[i] = JOIN.INNER
+for i in LIST__left: DICT__join[i] = JOIN.LEFT
+
+DICT__window = {}
+for i in LIST__window_rows: DICT__window[i] = DEDUPE.WINDOW_ROWS
+for i in LIST__window_keys: DICT__window[i] = DEDUPE.WINDOW_KEYS
+
+DICT__sort_order = {}
+for i in LIST__asc: DICT__sort_order[i] = SORT_ORDER.ASC
+for i in LIST__desc: DICT__sort_order[i] = SORT_ORDER.DESC
+
+DICT__sort_type = {}
+for i in LIST__num: DICT__sort_type[i] = SORT_TYPE.NUM
+for i in LIST__str: DICT__sort_type[i] = SORT_TYPE.STR
+
 DICT__header_type = {}
 for i in LIST__num: DICT__header_type[i] = HEADER_TYPE.NUM
 for i in LIST__char: DICT__header_type[i] = HEADER_TYPE.CHAR
 
 
 
-# File Processing Code #########################################################
+# Data Structures ##############################################################
 
-def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
-            inc_filters, exc_filters, headers, novel_unique):
+class Bloom_Filter(object):
     """
-    Function which performs the basic table file parsing.
-    
-    @path_in
-            (str - filepath)
-            The filepath of the input file.
-    @delim_in
-            (str)
-            The delimiter use by the input file.
-    @path_out
-            (str - filepath)
-            The filepath of the output file.
-    @delim_out
-            (str)
-            The delimiter use by the output file.
-    @columns
-            (list<int>)
-            An list of the columns to be retained from the input file, in that
-            specified order.
-            Uses the 1-index system. (The first column's index number is 1)
-            0 is used to signify an empty column.
-    @inc_filters
-    @exc_filters
-            (list<int,int,str/int/float>)
-            A list of filtering criteria. [inc_filters] is a list of criteria
-            for inclusion while [exc_filters] is a list of criteria for
-            exclusion.
-            Each item in the list is a criteria.
-            Each criteria item consists of three parts:
-                1) The column number of the data to be filtered. (index-1 system)
-                2) An integer denoting the type of filtering operation:
-                    1:  EQUALS (string)
-                    2:  NOT_EQUAL (string)
-                    3:  CONTAINS
-                    4:  NOT_CONTAIN
-                    5:  GREATER_THAN
-                    6:  GREAQUALS
-                    7:  LESS_THAN
-                    8:  LEQUALS
-                    9:  EQUALS (int)
-                    10: NOT_EQUAL (int)
-                    11: EQUALS (float)
-                    12: NOT_EQUAL (float)
-                3) The string/substring/cutoff used for filtering.
-    @headers
-            (list<[int,int,str/int]>)
-            A list of lists which specify special treatment for line(s) at the
-            beginning of the file.
-            Each sublist contains 3 elements:
-                1) An integer denoting the type of action to take:
-                    1:  KEEP
-                    2:  SKIP
-                    3:  REARRANGE
-                2) An integer denoting whether to act on a set number of lines
-                        or on an unknown NUMBER of lines beginning with a
-                        specified CHARACTER:
-                    1:  CHARACTER
-                    2:  NUMBER
-                3) If element 2 was CHARACTER, element 3 will be the character
-                        which denotes the lines to be acted on. If element 2 was
-                        NUMBER, element 3 will be the integer which denotes the
-                        number of lines to act on.
-    @novel_unique
-            (list<int>)
-            A list of the columns which will be used to determine the columns,
-            for which a novel combination of values is necessary for that row of
-            data to be accepted.
-            That is to say, if multiple rows have the same combination of values
-            in the specified columns, only the first row will be accepted.
-            This is not the same as specifying that the combination of values in
-            the specified columns needs to be unique across the entire file.
-            Uses the 1-index system. (The first column's index number is 1)
-            0 is used to signify an empty column.
+    A Bloom filter which can be used in place of a set to record the
+    combinations of values which have been seen so far.
     
-    Return a value of 0 if the function runs successfully.
+    Membership tests may return false positives but never false negatives. The
+    number of bits and hash functions are derived from the expected number of
+    items and the desired false positive rate, and the memory usage is fixed
+    upon creation.
     
-    Table_To_Table(str, str, str, str, list<int>, list<int,int,str/int/float>,
-            list<int,int,str/int/float>) -> int
+    Bloom_Filter(int, float) -> Bloom_Filter
     """
-    printP(STR__t2t_begin)
+    def __init__(self, expected_count, fp_rate):
+        """
+        @expected_count
+                (int)
+                The expected number of distinct items to be recorded.
+        @fp_rate
+                (float)
+                The desired false positive rate once [expected_count] items have
+                been recorded. (Between 0 and 1, exclusive)
+        """
+        ln2 = math.log(2)
+        size = -(expected_count * math.log(fp_rate)) / (ln2 * ln2)
+        self.size = max(8, int(math.ceil(size)))
+        self.hashes = max(1, int(round((float(self.size) / expected_count) *
+                ln2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.bits_set = 0
+
+    def __contains__(self, item):
+        bits = self.bits
+        for i in self.Get_Indexes(item):
+            if not bits[i >> 3] & (1 << (i & 7)): return False
+        return True
+
+    def add(self, item):
+        """
+        Record [item] in the Bloom filter.
+        
+        Bloom_Filter.add(tuple<str...>) -> None
+        """
+        bits = self.bits
+        for i in self.Get_Indexes(item):
+            mask = 1 << (i & 7)
+            if not bits[i >> 3] & mask:
+                bits[i >> 3] |= mask
+                self.bits_set += 1
+
+    def Get_Indexes(self, item):
+        """
+        Return the indexes of the bits corresponding to [item], using double
+        hashing on a single MD5 digest.
+        
+        Bloom_Filter.Get_Indexes(tuple<str...>) -> list<int>
+        """
+        digest = hashlib.md5("\x00".join(item)).hexdigest()
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:], 16) | 1
+        size = self.size
+        return [(h1 + i*h2) % size for i in range(self.hashes)]
+
+    def Get_FP_Rate(self):
+        """
+        Return the estimated false positive rate of the Bloom filter, based on
+        the proportion of bits which have been set.
+        
+        Bloom_Filter.Get_FP_Rate() -> float
+        """
+        return (float(self.bits_set) / self.size) ** self.hashes
+
+
+
+class Hyper_Log_Log(object):
+    """
+    A HyperLogLog sketch which estimates the number of distinct values recorded,
+    using a fixed amount of memory.
     
-    # Initialize File IO
-    r = open(path_in, "U")
-    w = open(path_out, "w")
+    The registers of sketches with the same precision, such as those in the
+    profiles of several output files, can be merged by taking the largest value
+    of each, to estimate the number of distinct values recorded by any of them.
+    
+    Hyper_Log_Log(int) -> Hyper_Log_Log
+    """
+    def __init__(self, precision=12):
+        """
+        @precision
+                (int)
+                (Optional)
+                The number of bits of each hash used to choose a register. There
+                are 2 to the power of [precision] registers.
+        """
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self.bits = 64 - precision
+        self.mask = (1 << self.bits) - 1
+
+    def add(self, value):
+        """
+        Record [value] in the sketch.
+        
+        Hyper_Log_Log.add(str) -> None
+        """
+        h = int(hashlib.md5(value).hexdigest()[:16], 16)
+        i = h >> self.bits
+        rank = self.bits - (h & self.mask).bit_length() + 1
+        if rank > self.registers[i]: self.registers[i] = rank
+
+    def Get_Estimate(self):
+        """
+        Return the estimated number of distinct values recorded.
+        
+        Hyper_Log_Log.Get_Estimate() -> int
+        """
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum([2.0 ** -r for r in self.registers])
+        zeros = self.registers.count("\x00")
+        if estimate <= 2.5 * m and zeros: # Small range correction
+            estimate = m * math.log(float(m) / zeros)
+        return int(round(estimate))
+
+    def To_Hex(self):
+        """
+        Return the registers as a hexadecimal string.
+        
+        Hyper_Log_Log.To_Hex() -> str
+        """
+        return str(self.registers).encode("hex")
 
-    line = r.readline()
+
+
+class Column_Profile(object):
+    """
+    Records statistics for each column output, for the rows of data accepted.
     
-    # Initialize Metrics
-    count_total = 0
-    count_passed = 0
+    Column_Profile(list<int>) -> Column_Profile
+    """
+    def __init__(self, columns):
+        """
+        @columns
+                (list<int>)
+                The columns output. See Table_To_Table for details.
+        """
+        self.columns = columns
+        self.rows = 0
+        self.stats = [Create_Column_Stats() for i in columns]
+        self.sketches = [Hyper_Log_Log() for i in columns]
+
+    def Update(self, data, joined):
+        """
+        Update the statistics with the values output for a row of data.
+        
+        Column_Profile.Update(list<str>, list<str>) -> None
+        """
+        self.rows += 1
+        for i, col in enumerate(self.columns):
+            if col == 0: value = ""
+            elif col < 0: value = Get_Joined_Value(joined, col)
+            else: value = data[col - 1]
+            Update_Column_Stats(self.stats[i], value)
+            self.sketches[i].add(value)
+
+    def Write(self, path):
+        """
+        Write the statistics to a file, in JSON format.
+        
+        Column_Profile.Write(str) -> None
+        """
+        columns = []
+        for col, stats, sketch in zip(self.columns, self.stats, self.sketches):
+            if col < 0: name = "j" + str(-col)
+            else: name = str(col)
+            columns.append(collections.OrderedDict([
+                    ["column", name],
+                    ["count", stats[0]],
+                    ["empty", stats[1]],
+                    ["non_numeric", stats[2]],
+                    ["min", stats[3]],
+                    ["max", stats[4]],
+                    ["distinct", sketch.Get_Estimate()],
+                    ["hll_precision", sketch.precision],
+                    ["hll_registers", sketch.To_Hex()]]))
+        w = open(path, "w")
+        json.dump(collections.OrderedDict([["rows", self.rows],
+                ["columns", columns]]), w, indent = 1,
+                separators = (",", ": "))
+        w.write("\n")
+        w.close()
+
+
+
+class Run_Metrics(object):
+    """
+    Records the throughput of a run, the time spent in each stage, and the
+    number of rows rejected by each filtering criteria, and writes them to a
+    file in JSON format. While the rows of data are being read, the file is
+    rewritten every METRICS_INTERVAL seconds with the progress so far, and an
+    estimate of the time remaining based on the position in the input file.
     
-    # Header and Comments
-    for header_list in headers:
-        action, action_type, value = header_list
+    Run_Metrics(str, str, list<int,int,str/int/float>,
+            list<int,int,str/int/float>) -> Run_Metrics
+    """
+    def __init__(self, path, path_in, inc_filters, exc_filters):
+        """
+        @path
+                (str - filepath)
+                The filepath of the metrics file.
+        @path_in
+                (str - filepath)
+                The filepath of the input file.
+        @inc_filters
+        @exc_filters
+                (list<int,int,str/int/float>)
+                The filtering criteria. See Table_To_Table for details.
+        """
+        self.path = path
+        self.path_in = path_in
+        self.inc_filters = inc_filters
+        self.exc_filters = exc_filters
+        self.inc_counts = [[0, 0] for f in inc_filters] # Applied, rejected
+        self.exc_counts = [[0, 0] for f in exc_filters]
+        self.counts = collections.OrderedDict()
+        self.stages = collections.OrderedDict()
+        self.stage = None
+        self.time_start = time.time()
+        self.time_stage = self.time_start
+        self.time_written = self.time_start
+        self.position_start = 0
+        self.position = 0
+        self.rows = 0
+        self.rows_before = 0 # Read by the runs a continued run follows on from
+        self.Start_Stage("setup")
+
+    def Start_Stage(self, stage):
+        """
+        Record the time spent in the current stage, and start the next one. If
+        [stage] is None, no further stage is started.
         
-        # A set number of lines
-        if action_type == HEADER_TYPE.NUM:
-            while value > 0:
-                Process_Header(line, action, w, delim_in, delim_out, columns)
-                line = r.readline()
-                value = value - 1
+        Run_Metrics.Start_Stage(str/None) -> None
+        """
+        now = time.time()
+        if self.stage:
+            self.stages[self.stage] = (self.stages.get(self.stage, 0) + now -
+                    self.time_stage)
+        self.stage = stage
+        self.time_stage = now
+
+    def Filter(self, data):
+        """
+        As Filter, but also count the rows each criteria is applied to, and
+        the rows it rejects. A row is rejected by the first inclusion criteria
+        it does not meet or, if it meets them all, by the first exclusion
+        criteria it meets.
         
-        # Lines beginning with a specified characters
-        elif action_type == HEADER_TYPE.CHAR:
-            while line[0] == value:
-                Process_Header(line, action, w, delim_in, delim_out, columns)
-                line = r.readline()
+        Run_Metrics.Filter(list<str>) -> bool
+        """
+        inc = True
+        for f, counts in zip(self.inc_filters, self.inc_counts):
+            counts[0] += 1
+            if not Filter_Single(data, f):
+                counts[1] += 1
+                inc = False
+                break
+        for f, counts in zip(self.exc_filters, self.exc_counts):
+            counts[0] += 1
+            if Filter_Single(data, f):
+                if inc: counts[1] += 1
+                return False
+        return inc
+
+    def Update(self, readfile, rows_read, rows_passed):
+        """
+        Record the progress so far, and rewrite the file if METRICS_INTERVAL
+        seconds have passed since it was last written. Called for each row of
+        data read, but only checks the time every 1024 rows.
+        
+        Run_Metrics.Update(file, int, int) -> None
+        """
+        self.rows += 1
+        if self.rows & 1023: return
+        now = time.time()
+        if now - self.time_written < METRICS_INTERVAL: return
+        self.position = readfile.tell()
+        self.counts["rows_read"] = rows_read
+        self.counts["rows_passed"] = rows_passed
+        self.Write(False)
+
+    def Write(self, complete):
+        """
+        Write the metrics to the file, in JSON format. The file is replaced in
+        a single step, so it is never read while incomplete.
+        
+        Run_Metrics.Write(bool) -> None
+        """
+        now = time.time()
+        self.time_written = now
+        elapsed = now - self.time_start
+        size = os.path.getsize(self.path_in)
+        bytes_read = self.position - self.position_start
+        rows_read = self.counts.get("rows_read", 0)
+        criteria = []
+        for inc_exc, filters, counts in [[1, self.inc_filters, self.inc_counts],
+                [0, self.exc_filters, self.exc_counts]]:
+            for f, (applied, rejected) in zip(filters, counts):
+                criteria.append(collections.OrderedDict([
+                        ["criteria", Get_Criteria_String(f, inc_exc)],
+                        ["applied", applied],
+                        ["rejected", rejected]]))
+        stages = collections.OrderedDict(self.stages)
+        if self.stage: # Include the time spent in the current stage so far
+            stages[self.stage] = (stages.get(self.stage, 0) + now -
+                    self.time_stage)
+        # Time remaining, at the rate the input file has been read so far
+        eta = None
+        if complete: eta = 0.0
+        elif self.stage == "main_loop" and bytes_read > 0:
+            eta = (now - self.time_stage)*(size - self.position)/bytes_read
+            eta = round(eta, 1)
+        progress = collections.OrderedDict([
+                ["position", self.position],
+                ["input_bytes", size],
+                ["percent", round(self.position*100.0/max(1, size), 2)],
+                ["eta_seconds", eta]])
+        metrics = collections.OrderedDict([
+                ["input", self.path_in],
+                ["complete", complete],
+                ["elapsed_seconds", round(elapsed, 6)],
+                ["bytes_read", bytes_read]])
+        metrics.update(self.counts)
+        metrics.update([
+                ["rows_per_sec", round((rows_read - self.rows_before)/
+                        max(elapsed, 1e-6), 1)],
+                ["mb_per_sec", round(bytes_read/1048576.0/max(elapsed, 1e-6),
+                        3)],
+                ["stages", collections.OrderedDict([[k, round(v, 6)]
+                        for k, v in stages.items()])],
+                ["criteria", criteria],
+                ["progress", progress]])
+        path_temp = self.path + ".tmp"
+        w = open(path_temp, "w")
+        json.dump(metrics, w, indent = 1, separators = (",", ": "))
+        w.write("\n")
+        w.close()
+        Replace_File(path_temp, self.path)
+
+
+
+class Partitioned_Output(object):
+    """
+    Writes each row of data to the output file for its values in the partition
+    columns. Can be used in place of the output file.
     
-    # Intialize Other Processing Nnecessities
-    temp = []
-    for i in novel_unique: temp.append(i - 1)
-    novel_unique = temp
-    recorded_combinations = set([])    
+    Lines written before the first row of data, such as headers, are written to
+    every output file. Only MAX_OPEN_FILES files are kept open at once; the
+    least recently used file is closed when another needs to be opened, and
+    reopened for appending if needed again.
     
-    # Main Loop
-    while line:
-        count_total += 1
+    Partitioned_Output(str) -> Partitioned_Output
+    """
+    def __init__(self, template):
+        """
+        @template
+                (str - filepath)
+                The filepath of the output files, with "{colN}" in place of the
+                value in column N. See Get_Partition_Columns.
+        """
+        self.pieces = re.split(STR__partition_pattern, template)
+        self.headers = []
+        self.handles = collections.OrderedDict()
+        self.created = set()
+        self.path = None
+        self.handle = None
+
+    def write(self, string):
+        """
+        Record a line to be written to every output file, before its rows of
+        data.
         
-        data = Parse_Line(line, delim_in)
+        Partitioned_Output.write(str) -> None
+        """
+        self.headers.append(string)
+
+    def Write_Row(self, data, string):
+        """
+        Write the output string of a row of data to the output file for its
+        values.
         
-        test = Filter(data, inc_filters, exc_filters)
+        Partitioned_Output.Write_Row(list<str>, str) -> None
+        """
+        path = self.Get_Path(data)
+        if path != self.path:
+            handle = self.handles.pop(path, None)
+            if not handle: handle = self.Open(path)
+            self.handles[path] = handle # Most recently used
+            self.path = path
+            self.handle = handle
+        self.handle.write(string)
+
+    def Get_Path(self, data):
+        """
+        Return the filepath of the output file for a row of data.
         
-        if novel_unique:
-            tup = Filter_Novel_Uniques(data, recorded_combinations,
-                    novel_unique)
-        else:
-            tup = True
+        Partitioned_Output.Get_Path(list<str>) -> str
+        """
+        sb = []
+        for i, piece in enumerate(self.pieces):
+            if i % 2 == 0:
+                sb.append(piece)
+                continue
+            col = int(piece)
+            if col > len(data): value = ""
+            else: value = data[col - 1].replace("/", "_").replace("\\", "_")
+            sb.append(value)
+        return "".join(sb)
+
+    def Open(self, path):
+        """
+        Open the output file [path], closing the least recently used file if
+        there are too many open. A new file is started with the header lines.
         
-        if test and tup:
-            count_passed += 1
-            recorded_combinations.add(tup)
-            string = Create_Output(data, columns, delim_out)
-            w.write(string)
+        Partitioned_Output.Open(str) -> file
+        """
+        if len(self.handles) >= MAX_OPEN_FILES:
+            self.handles.popitem(last = False)[1].close()
+        if path in self.created:
+            return open(path, "a", PARTITION_BUFFER_BYTES)
+        handle = open(path, "w", PARTITION_BUFFER_BYTES)
+        handle.writelines(self.headers)
+        self.created.add(path)
+        return handle
+
+    def close(self):
+        """
+        Close all the output files.
+        
+        Partitioned_Output.close() -> None
+        """
+        for handle in self.handles.itervalues(): handle.close()
+        self.handles = collections.OrderedDict()
+        self.path = None
+        self.handle = None
+
+
+
+class Sharded_Output(object):
+    """
+    Writes rows of data to a series of numbered output files (shards), starting
+    a new shard once the current one is full. Can be used in place of the
+    output file.
+    
+    Lines written before the first row of data, such as headers, are written to
+    every shard. A manifest of the shards is written when closed. Any shards
+    already named after the output file are deleted first, so none are left
+    over from a previous run which wrote more shards.
+    
+    Sharded_Output(str, int, int) -> Sharded_Output
+    """
+    def __init__(self, path_out, shard_type, size):
+        """
+        @path_out
+                (str - filepath)
+                The filepath of the output file. The shards and the manifest
+                are named after it.
+        @shard_type
+                (int)
+                An integer denoting how the size of the shards is limited:
+                    1:  ROWS (The number of rows of data.)
+                    2:  BYTES (The size of the file.)
+        @size
+                (int)
+                The largest number of rows or bytes in each shard.
+        """
+        self.path_out = path_out
+        self.shard_type = shard_type
+        self.size = size
+        self.headers = []
+        self.shards = [] # The manifest entry of each shard
+        self.handle = None
+        self.rows = 0 # The number of rows of data in the current shard
+        self.bytes = 0 # The size of the current shard
+        self.total_rows = 0
+        self.total_bytes = 0 # The total size of the rows of data
+        root, ext = os.path.splitext(path_out)
+        for path in glob.glob(Escape_Glob(root) + "_[0-9]*" + Escape_Glob(ext)):
+            if path[len(root) + 1:len(path) - len(ext)].isdigit():
+                os.remove(path)
+
+    def write(self, string):
+        """
+        Record a line to be written to every shard, before its rows of data.
+        
+        Sharded_Output.write(str) -> None
+        """
+        self.headers.append(string)
+
+    def Write_Row(self, data, string):
+        """
+        Write the output string of a row of data to the current shard, starting
+        a new shard first if the current one is full.
+        
+        Sharded_Output.Write_Row(list<str>, str) -> None
+        """
+        if not self.handle: self.Open()
+        elif self.shard_type == SHARD.ROWS:
+            if self.rows >= self.size: self.Open()
+        elif self.bytes + len(string) > self.size: self.Open()
+        self.handle.write(string)
+        self.rows += 1
+        self.bytes += len(string)
+        self.total_rows += 1
+        self.total_bytes += len(string)
+
+    def Open(self):
+        """
+        Close the current shard, if any, and start the next one.
+        
+        Sharded_Output.Open() -> None
+        """
+        self.Close_Shard()
+        root, ext = os.path.splitext(self.path_out)
+        path = root + "_" + str(len(self.shards) + 1) + ext
+        self.handle = open(path, "w")
+        self.handle.writelines(self.headers)
+        self.rows = 0
+        self.bytes = sum([len(i) for i in self.headers])
+        self.shards.append(collections.OrderedDict([
+                ["path", os.path.basename(path)],
+                ["rows", 0],
+                ["first_row", self.total_rows + 1],
+                ["last_row", self.total_rows],
+                ["bytes", 0],
+                ["data_offset", self.total_bytes],
+                ["data_bytes", 0]]))
+
+    def Close_Shard(self):
+        """
+        Close the current shard, if any, and complete its manifest entry.
+        
+        Sharded_Output.Close_Shard() -> None
+        """
+        if not self.handle: return
+        self.handle.close()
+        self.handle = None
+        shard = self.shards[-1]
+        shard["rows"] = self.rows
+        shard["last_row"] = self.total_rows
+        shard["bytes"] = self.bytes
+        shard["data_bytes"] = self.total_bytes - shard["data_offset"]
+
+    def close(self):
+        """
+        Close the current shard and write the manifest. If there were no rows
+        of data, a single shard containing only the header lines is written.
+        
+        Sharded_Output.close() -> None
+        """
+        if not self.shards: self.Open()
+        self.Close_Shard()
+        w = open(self.path_out + ".manifest.json", "w")
+        json.dump(collections.OrderedDict([["rows", self.total_rows],
+                ["data_bytes", self.total_bytes], ["shards", self.shards]]), w,
+                indent = 1, separators = (",", ": "))
+        w.write("\n")
+        w.close()
+
+
+
+class SQLite_Output(object):
+    """
+    Inserts rows of data into a new table in an SQLite database. Can be used in
+    place of the output file.
+    
+    The rows are inserted in batches, within a single transaction. The indexes
+    are created once all the rows have been inserted.
+    
+    SQLite_Output(str, str, list<str>, list<str>, list<int>, str)
+            -> SQLite_Output
+    """
+    def __init__(self, path_out, table, names, types, indexes, delim):
+        """
+        @path_out
+                (str - filepath)
+                The filepath of the database.
+        @table
+                (str)
+                The name of the table.
+        @names
+                (list<str>)
+                The default name of each column, used unless the last header
+                line has the same number of columns.
+        @types
+                (list<str>)
+                The type of each column. (INTEGER, REAL, NUMERIC or TEXT)
+        @indexes
+                (list<int>)
+                The columns to create indexes on. (0-index)
+        @delim
+                (str)
+                The delimiter separating the values in the output strings.
+        """
+        self.table = table
+        self.names = names
+        self.types = types
+        self.indexes = indexes
+        self.delim = delim
+        self.header = None
+        self.batch = []
+        self.insert = None
+        self.typed = [i for i, t in enumerate(types) if t != "TEXT"]
+        self.connection = sqlite3.connect(path_out)
+        self.connection.text_factory = str
+        cursor = self.connection.cursor()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA locking_mode = EXCLUSIVE")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.execute("PRAGMA cache_size = " + str(-SQLITE_CACHE_KB))
+
+    def write(self, string):
+        """
+        Record a line from the start of the file. The column names are taken
+        from the last one.
+        
+        SQLite_Output.write(str) -> None
+        """
+        self.header = string
+
+    def Write_Row(self, data, string):
+        """
+        Insert the output string of a row of data into the table.
+        
+        SQLite_Output.Write_Row(list<str>, str) -> None
+        """
+        if not self.insert: self.Create_Table()
+        values = string[:-1].split(self.delim)
+        for i in self.typed:
+            if not values[i]: values[i] = None
+        self.batch.append(values)
+        if len(self.batch) >= SQLITE_BATCH_ROWS: self.Flush()
+
+    def Create_Table(self):
+        """
+        Create the table, replacing any table of the same name.
+        
+        SQLite_Output.Create_Table() -> None
+        """
+        names = self.names
+        if self.header:
+            header = self.header.rstrip("\n").split(self.delim)
+            if len(header) == len(names): names = header
+        names = Get_SQL_Names(names)
+        table = Quote_SQL_Name(self.table)
+        columns = []
+        for name, sql_type in zip(names, self.types):
+            columns.append(Quote_SQL_Name(name) + " " + sql_type)
+        cursor = self.connection.cursor()
+        cursor.execute("DROP TABLE IF EXISTS " + table)
+        cursor.execute("CREATE TABLE " + table + " (" + ", ".join(columns) +
+                ")")
+        self.insert = ("INSERT INTO " + table + " VALUES (" +
+                ", ".join(["?"] * len(names)) + ")")
+        self.names = names
+
+    def Flush(self):
+        """
+        Insert the batch of rows into the table.
+        
+        SQLite_Output.Flush() -> None
+        """
+        if self.batch:
+            self.connection.executemany(self.insert, self.batch)
+        self.batch = []
+
+    def close(self):
+        """
+        Insert the remaining rows, create the indexes, and close the database.
+        
+        SQLite_Output.close() -> None
+        """
+        if not self.insert: self.Create_Table()
+        self.Flush()
+        cursor = self.connection.cursor()
+        for i in self.indexes:
+            name = Quote_SQL_Name(self.table + "__" + self.names[i])
+            cursor.execute("CREATE INDEX " + name + " ON " +
+                    Quote_SQL_Name(self.table) + " (" +
+                    Quote_SQL_Name(self.names[i]) + ")")
+        self.connection.commit()
+        self.connection.close()
+
+
+
+class NPY_Output(object):
+    """
+    Writes each column of the rows of data to a separate NumPy array file, and
+    a schema of the files in JSON format. Can be used in place of the output
+    file.
+    
+    Numbers are held in memory in chunks of NPY_CHUNK_VALUES, and appended to
+    their file as each chunk is filled. Strings are written to a temporary file
+    until the width of the longest string is known. The header of each file is
+    rewritten with the length of the array once all the rows have been
+    written.
+    
+    NPY_Output(str, list<str>, list<str>, str) -> NPY_Output
+    """
+    def __init__(self, path_out, names, types, delim):
+        """
+        @path_out
+                (str - filepath)
+                The filepath of the output file. The array files and the schema
+                are named after it.
+        @names
+                (list<str>)
+                The default name of each column, used unless the last header
+                line has the same number of columns.
+        @types
+                (list<str>)
+                The type of each column. (INTEGER, REAL, NUMERIC or TEXT)
+        @delim
+                (str)
+                The delimiter separating the values in the output strings.
+        """
+        self.root = os.path.splitext(path_out)[0]
+        self.names = names
+        self.types = types
+        self.delim = delim
+        self.header = None
+        self.columns = None
+        self.count = 0
+        self.temp_dir = None
+
+    def write(self, string):
+        """
+        Record a line from the start of the file. The column names are taken
+        from the last one.
+        
+        NPY_Output.write(str) -> None
+        """
+        self.header = string
+
+    def Write_Row(self, data, string):
+        """
+        Append the values of the output string of a row of data to the arrays.
+        
+        NPY_Output.Write_Row(list<str>, str) -> None
+        """
+        if not self.columns: self.Open()
+        values = string[:-1].split(self.delim)
+        self.count += 1
+        for column, value in zip(self.columns, values):
+            chunk = column["chunk"]
+            if column["type"] == "TEXT":
+                column["temp"].write(value + "\n")
+                if len(value) > column["width"]: column["width"] = len(value)
+                continue
+            try:
+                if column["type"] == "INTEGER": n = int(value)
+                else: n = float(value)
+                chunk.append(n)
+            except (ValueError, OverflowError):
+                chunk.append(column["missing"])
+                column["replaced"] += 1
+            if len(chunk) >= NPY_CHUNK_VALUES:
+                chunk.tofile(column["file"])
+                column["chunk"] = array.array(chunk.typecode)
+
+    def Open(self):
+        """
+        Open the array file of each column, reserving space for its header.
+        
+        NPY_Output.Open() -> None
+        """
+        names = self.names
+        if self.header:
+            header = self.header.rstrip("\n").split(self.delim)
+            if len(header) == len(names): names = header
+        names = Get_SQL_Names(names)
+        order = "<"
+        if sys.byteorder == "big": order = ">"
+        self.columns = []
+        for name, sql_type in zip(names, self.types):
+            name_ = name.replace("/", "_").replace("\\", "_")
+            path = self.root + "." + name_ + ".npy"
+            column = {"name": name, "path": path, "type": sql_type,
+                    "replaced": 0, "width": 1, "chunk": None}
+            if sql_type == "TEXT":
+                if not self.temp_dir:
+                    self.temp_dir = tempfile.mkdtemp(dir = TEMP_DIR)
+                column["temp"] = open(os.path.join(self.temp_dir,
+                        "column_" + str(len(self.columns))), "w")
+            else:
+                if sql_type == "INTEGER":
+                    column["chunk"] = array.array("l")
+                    column["missing"] = 0
+                    size = array.array("l").itemsize
+                    column["dtype"] = order + "i" + str(size)
+                else:
+                    column["chunk"] = array.array("d")
+                    column["missing"] = float("nan")
+                    column["dtype"] = order + "f8"
+                column["file"] = open(path, "wb")
+                column["file"].write(" " * NPY_HEADER_BYTES)
+            self.columns.append(column)
+
+    def close(self):
+        """
+        Write the remaining values and the headers of the array files, and the
+        schema.
+        
+        NPY_Output.close() -> None
+        """
+        if not self.columns: self.Open()
+        try:
+            for column in self.columns:
+                if column["type"] == "TEXT":
+                    self.Write_Text_Column(column)
+                    continue
+                w = column["file"]
+                column["chunk"].tofile(w)
+                w.seek(0)
+                Write_NPY_Header(w, column["dtype"], self.count)
+                w.close()
+        finally:
+            if self.temp_dir: shutil.rmtree(self.temp_dir, True)
+        columns = []
+        for column in self.columns:
+            columns.append(collections.OrderedDict([
+                    ["name", column["name"]],
+                    ["path", os.path.basename(column["path"])],
+                    ["type", column["type"]],
+                    ["dtype", column["dtype"]],
+                    ["replaced", column["replaced"]]]))
+        w = open(self.root + ".schema.json", "w")
+        json.dump(collections.OrderedDict([["rows", self.count],
+                ["columns", columns]]), w, indent = 1,
+                separators = (",", ": "))
+        w.write("\n")
+        w.close()
+
+    def Write_Text_Column(self, column):
+        """
+        Write the array file of a TEXT column from its temporary file, as
+        fixed-width byte strings.
+        
+        NPY_Output.Write_Text_Column(dict) -> None
+        """
+        column["temp"].close()
+        width = column["width"]
+        column["dtype"] = "|S" + str(width)
+        w = open(column["path"], "wb")
+        Write_NPY_Header(w, column["dtype"], self.count)
+        r = open(column["temp"].name, "r")
+        chunk = []
+        for line in r:
+            chunk.append(line[:-1].ljust(width, "\x00"))
+            if len(chunk) >= NPY_CHUNK_VALUES:
+                w.write("".join(chunk))
+                chunk = []
+        w.write("".join(chunk))
+        r.close()
+        w.close()
+
+
+
+class Window_Rows(object):
+    """
+    A first-in-first-out window which can be used in place of a set to record
+    the combinations of values of the last N rows which were accepted.
+    
+    Window_Rows(int) -> Window_Rows
+    """
+    def __init__(self, size):
+        """
+        @size
+                (int)
+                The number of combinations of values held in the window.
+        """
+        self.size = size
+        self.queue = collections.deque()
+        self.counts = {}
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def add(self, item):
+        """
+        Record [item] in the window, discarding the oldest item if the window
+        is full.
+        
+        Window_Rows.add(tuple<str...>) -> None
+        """
+        self.queue.append(item)
+        self.counts[item] = self.counts.get(item, 0) + 1
+        if len(self.queue) > self.size:
+            oldest = self.queue.popleft()
+            count = self.counts[oldest] - 1
+            if count: self.counts[oldest] = count
+            else: del self.counts[oldest]
+
+
+
+class Window_Keys(object):
+    """
+    A least-recently-used window which can be used in place of a set to record
+    the N combinations of values which were seen most recently.
+    
+    Window_Keys(int) -> Window_Keys
+    """
+    def __init__(self, size):
+        """
+        @size
+                (int)
+                The number of combinations of values held in the window.
+        """
+        self.size = size
+        self.keys = collections.OrderedDict()
+
+    def __contains__(self, item):
+        return item in self.keys
+
+    def add(self, item):
+        """
+        Record [item] in the window as the most recently seen item, discarding
+        the least recently seen item if the window is full. If [item] is
+        already in the window, it is moved to the most recent position.
+        
+        Window_Keys.add(tuple<str...>) -> None
+        """
+        if item in self.keys: del self.keys[item]
+        self.keys[item] = None
+        if len(self.keys) > self.size:
+            self.keys.popitem(last = False)
+
+
+
+class Aho_Corasick(object):
+    """
+    An Aho-Corasick automaton, which searches a string for any of a number of
+    substrings at once, in time proportional to the length of the string.
+    
+    Aho_Corasick(list<str>) -> Aho_Corasick
+    """
+    def __init__(self, patterns):
+        """
+        @patterns
+                (list<str>)
+                The substrings to search for.
+        """
+        # Trie of the patterns
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [False]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(False)
+                state = next_state
+            self.output[state] = True
+        # Failure links, in breadth-first order
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].iteritems():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(char, 0)
+                if self.output[self.fail[next_state]]:
+                    self.output[next_state] = True
+
+    def Search(self, text):
+        """
+        Return True if [text] contains any of the substrings. Return False
+        otherwise.
+        
+        Aho_Corasick.Search(str) -> bool
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        if output[0]: return True # An empty substring
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]: return True
+        return False
+
+
+
+class Regex_Query(object):
+    """
+    A compiled regular expression, along with the longest substring which any
+    match must contain, if there is one. Strings without that substring are
+    rejected without running the regular expression.
+    
+    Regex_Query(str) -> Regex_Query
+    """
+    def __init__(self, pattern):
+        """
+        @pattern
+                (str)
+                The regular expression.
+        """
+        self.regex = re.compile(pattern)
+        self.literal = Get_Required_Literal(pattern, self.regex.flags)
+
+    def Search(self, text):
+        """
+        Return True if the regular expression matches anywhere in [text].
+        Return False otherwise.
+        
+        Regex_Query.Search(str) -> bool
+        """
+        if self.literal and self.literal not in text: return False
+        return self.regex.search(text) is not None
+
+
+
+class Lookup_Table(object):
+    """
+    A table whose rows can be looked up by their value in a key column, for
+    joining them to the rows of the input file.
+    
+    Each row is held in memory as a single string, which is only split when it
+    is looked up. If the table is larger than MAX_LOOKUP_BYTES, only the
+    positions of the rows are held in memory, and the rows are read from the
+    memory-mapped file instead.
+    
+    The lines at the start of the table which are specified by [headers] are
+    held separately, and are only joined to the lines at the start of the
+    input file.
+    
+    Lookup_Table(str, str, int, int, list<[int,int,str/int]>) -> Lookup_Table
+    """
+    def __init__(self, path, delim, key_col, col_in, headers=None):
+        """
+        @path
+                (str - filepath)
+                The filepath of the lookup table.
+        @delim
+                (str)
+                The delimiter used by the lookup table.
+        @key_col
+                (int)
+                The column of the lookup table to look rows up by. (1-index)
+        @col_in
+                (int)
+                The column of the input file whose values are looked up.
+                (1-index)
+        @headers
+                (list<[int,int,str/int]>)
+                (Optional)
+                The specification of the lines at the start of the input file,
+                which is applied to the table as well. See Table_To_Table for
+                details.
+        """
+        self.delim = delim
+        self.col_in = col_in - 1
+        self.rows = {}
+        self.headers = {}
+        self.map = None
+        key_col = key_col - 1
+        size = os.path.getsize(path)
+        header_count = 0
+        if headers:
+            f = open(path, "U")
+            header_count = Process_Headers(f, None, headers, delim, delim,
+                    [])[1]
+            f.close()
+        if size > MAX_LOOKUP_BYTES:
+            self.file = open(path, "rb")
+            self.map = mmap.mmap(self.file.fileno(), 0,
+                    access = mmap.ACCESS_READ)
+            position = 0
+            while position < size:
+                end = self.map.find("\n", position)
+                if end < 0: end = size
+                line = self.map[position:end].rstrip("\r")
+                values = line.split(delim)
+                if header_count:
+                    header_count -= 1
+                    if key_col < len(values):
+                        self.headers.setdefault(values[key_col], line)
+                elif key_col < len(values) and values[key_col] not in self.rows:
+                    self.rows[values[key_col]] = position
+                position = end + 1
+        else:
+            f = open(path, "U")
+            for line in f:
+                line = line.rstrip("\n")
+                values = line.split(delim)
+                if header_count:
+                    header_count -= 1
+                    if key_col < len(values):
+                        self.headers.setdefault(values[key_col], line)
+                elif key_col < len(values) and values[key_col] not in self.rows:
+                    self.rows[values[key_col]] = line
+            f.close()
+
+    def Get(self, data):
+        """
+        Return the values of the row of the lookup table which matches a row of
+        data from the input file.
+        Return None if there is no such row.
+        
+        Lookup_Table.Get(list<str>) -> list<str>
+        Lookup_Table.Get(list<str>) -> None
+        """
+        if self.col_in >= len(data): return None
+        line = self.rows.get(data[self.col_in])
+        if line is None: return None
+        if self.map is not None:
+            end = self.map.find("\n", line)
+            if end < 0: end = len(self.map)
+            line = self.map[line:end].rstrip("\r")
+        return line.split(self.delim)
+
+    def Get_Header(self, values):
+        """
+        Return the values of the line at the start of the lookup table which
+        matches a line at the start of the input file.
+        Return None if there is no such line.
+        
+        Lookup_Table.Get_Header(list<str>) -> list<str>
+        Lookup_Table.Get_Header(list<str>) -> None
+        """
+        if self.col_in >= len(values): return None
+        line = self.headers.get(values[self.col_in])
+        if line is None: return None
+        return line.split(self.delim)
+
+    def Close(self):
+        """
+        Close the memory-mapped file, if there is one.
+        
+        Lookup_Table.Close() -> None
+        """
+        if self.map is not None:
+            self.map.close()
+            self.file.close()
+
+
+
+class Group_Aggregates(object):
+    """
+    Records one accumulator per group of rows for each aggregate function, and
+    yields the results of the aggregate functions for each group, sorted by
+    the groups' keys.
+    
+    If more than MAX_RECORDS_IN_MEMORY groups are recorded, the accumulators
+    are written to a temporary file, sorted by key, and recording starts over.
+    The temporary files are merged when the results are yielded, or whenever
+    there are MAX_PARTITIONS of them.
+    
+    Group_Aggregates(list<[int,int]>) -> Group_Aggregates
+    """
+    def __init__(self, aggregates):
+        """
+        @aggregates
+                (list<[int,int]>)
+                A list of aggregate functions. Each consists of two parts:
+                    1) An integer denoting the type of aggregate function:
+                        1:  COUNT
+                        2:  SUM
+                        3:  MIN
+                        4:  MAX
+                        5:  MEAN
+                    2) The column to aggregate. (1-index) (Ignored by COUNT)
+        """
+        self.aggregates = aggregates
+        self.groups = {}
+        self.runs = []
+        self.count_files = 0
+        self.temp_dir = None
+
+    def Add(self, key, data):
+        """
+        Update the accumulators of the group [key] with a row of data.
+        
+        Group_Aggregates.Add(str, list<str>) -> None
+        """
+        accs = self.groups.get(key)
+        if accs is None:
+            if len(self.groups) >= MAX_RECORDS_IN_MEMORY: self.Spill()
+            accs = self.New_Accumulators()
+            self.groups[key] = accs
+        for i, (function, col) in enumerate(self.aggregates):
+            if function == AGGREGATE.COUNT:
+                accs[i] += 1
+                continue
+            try:
+                value = data[col - 1]
+                try:
+                    n = int(value)
+                except:
+                    n = float(value)
+            except:
+                continue
+            if n != n: continue # NaN
+            if function == AGGREGATE.SUM: accs[i] += n
+            elif function == AGGREGATE.MIN:
+                if accs[i] is None or n < accs[i]: accs[i] = n
+            elif function == AGGREGATE.MAX:
+                if accs[i] is None or n > accs[i]: accs[i] = n
+            elif function == AGGREGATE.MEAN:
+                accs[i][0] += n
+                accs[i][1] += 1
+
+    def New_Accumulators(self):
+        """
+        Return a new list of accumulators, one for each aggregate function.
+        
+        Group_Aggregates.New_Accumulators() -> list
+        """
+        accs = []
+        for function, col in self.aggregates:
+            if function in [AGGREGATE.COUNT, AGGREGATE.SUM]: accs.append(0)
+            elif function == AGGREGATE.MEAN: accs.append([0, 0])
+            else: accs.append(None)
+        return accs
+
+    def Merge_Accumulators(self, accs1, accs2):
+        """
+        Combine the accumulators of two records of the same group into
+        [accs1].
+        
+        Group_Aggregates.Merge_Accumulators(list, list) -> None
+        """
+        for i, (function, col) in enumerate(self.aggregates):
+            a = accs1[i]
+            b = accs2[i]
+            if function in [AGGREGATE.COUNT, AGGREGATE.SUM]: accs1[i] = a + b
+            elif function == AGGREGATE.MEAN:
+                accs1[i] = [a[0] + b[0], a[1] + b[1]]
+            elif b is None: pass
+            elif a is None: accs1[i] = b
+            elif function == AGGREGATE.MIN: accs1[i] = min(a, b)
+            elif function == AGGREGATE.MAX: accs1[i] = max(a, b)
+
+    def Spill(self):
+        """
+        Write the accumulators of all the groups to a temporary file, sorted by
+        key, and clear them from memory.
+        
+        Each line of the file contains the key, in hexadecimal, and the
+        accumulators, in JSON format. Hexadecimal preserves the order of the
+        keys, and allows them to contain any character.
+        
+        Group_Aggregates.Spill() -> None
+        """
+        if not self.temp_dir: self.temp_dir = tempfile.mkdtemp(dir = TEMP_DIR)
+        items = ([key, self.groups[key]] for key in sorted(self.groups))
+        self.Write_Run(items)
+        self.groups = {}
+        # Limit the number of temporary files open at once when merging
+        if len(self.runs) >= MAX_PARTITIONS:
+            runs = self.runs
+            self.runs = []
+            self.Write_Run(self.Merge_Runs(runs, []))
+            for path in runs: os.remove(path)
+
+    def Write_Run(self, items):
+        """
+        Write a sorted run of groups and their accumulators to a new temporary
+        file.
+        
+        Group_Aggregates.Write_Run(iterable<[str, list]>) -> None
+        """
+        path = os.path.join(self.temp_dir, "groups_" + str(self.count_files))
+        self.count_files += 1
+        w = open(path, "w")
+        for key, accs in items:
+            w.write(key.encode("hex") + "\t" + json.dumps(accs) + "\n")
+        w.close()
+        self.runs.append(path)
+
+    def Merge_Runs(self, runs, items):
+        """
+        A generator which merges the sorted runs of groups in the temporary
+        files [runs] and in [items], combining the accumulators of each group.
+        
+        Group_Aggregates.Merge_Runs(list<str>, iterable<[str, list]>)
+                -> generator<[str, list]>
+        """
+        def Iterate_Run(f):
+            for line in f:
+                key, accs = line.split("\t", 1)
+                yield [key.decode("hex"), json.loads(accs)]
+        files = [open(path, "r") for path in runs]
+        iterators = [Iterate_Run(f) for f in files]
+        iterators.append(items)
+        prev = None
+        for item in heapq.merge(*iterators):
+            if prev and prev[0] == item[0]:
+                self.Merge_Accumulators(prev[1], item[1])
+                continue
+            if prev: yield prev
+            prev = item
+        if prev: yield prev
+        for f in files: f.close()
+
+    def Iterate(self):
+        """
+        A generator which yields the key of each group, in sorted order, and
+        the list of accumulators for that group.
+        
+        Group_Aggregates.Iterate() -> generator<[str, list]>
+        """
+        items = ([key, self.groups[key]] for key in sorted(self.groups))
+        return self.Merge_Runs(self.runs, items)
+
+    def Get_Results(self, accs):
+        """
+        Return the results of the aggregate functions from a list of
+        accumulators, as strings.
+        
+        Group_Aggregates.Get_Results(list) -> list<str>
+        """
+        results = []
+        for i, (function, col) in enumerate(self.aggregates):
+            a = accs[i]
+            if function == AGGREGATE.MEAN:
+                if a[1]: a = a[0] / float(a[1])
+                else: a = None
+            if a is None: results.append("")
+            elif isinstance(a, float): results.append("%.15g" % a)
+            else: results.append(str(a))
+        return results
+
+    def Close(self):
+        """
+        Delete any temporary files.
+        
+        Group_Aggregates.Close() -> None
+        """
+        if self.temp_dir: shutil.rmtree(self.temp_dir, True)
+        self.temp_dir = None
+
+
+
+class Top_Rows(object):
+    """
+    Records the K rows with the largest or smallest numbers in a column, using
+    a heap of at most K rows. The row which would be discarded next is at the
+    top of the heap.
+    
+    Top_Rows(int, int, int) -> Top_Rows
+    """
+    def __init__(self, k, col, order):
+        """
+        @k
+                (int)
+                The number of rows to keep.
+        @col
+                (int)
+                The column containing the numbers to compare. (1-index)
+        @order
+                (int)
+                An integer denoting which rows to keep:
+                    1:  ASC (The rows with the smallest numbers.)
+                    2:  DESC (The rows with the largest numbers.)
+        """
+        self.k = k
+        self.col = col - 1
+        self.sign = 1
+        if order == SORT_ORDER.ASC: self.sign = -1
+        self.heap = []
+        self.count = 0
+
+    def Add(self, data, string):
+        """
+        Record the output string of a row of data, if it is one of the top K
+        rows so far.
+        Return False if the row does not have a number in the column, and True
+        otherwise.
+        
+        Top_Rows.Add(list<str>, str) -> bool
+        """
+        try:
+            n = Get_Sort_Value(data[self.col], SORT_TYPE.NUM)
+        except (IndexError, ValueError):
+            return False
+        if n != n: return False # NaN
+        self.count += 1
+        # Of the rows with equal numbers, later rows are discarded first
+        item = (n * self.sign, -self.count, string)
+        if len(self.heap) < self.k: heapq.heappush(self.heap, item)
+        elif item > self.heap[0]: heapq.heapreplace(self.heap, item)
+        return True
+
+    def Iterate(self):
+        """
+        A generator which yields the output strings of the top K rows, in
+        order.
+        
+        Top_Rows.Iterate() -> generator<str>
+        """
+        for item in sorted(self.heap, reverse = True): yield item[2]
+
+
+
+class External_Sort(object):
+    """
+    Sorts records by the keys returned by a function. The sort is stable.
+    
+    Up to MAX_RECORDS_IN_MEMORY records are sorted in memory at a time. If there
+    are more records than that, each sorted run of records is written to a
+    temporary file, and the runs are then merged. Whenever there are
+    MAX_PARTITIONS runs, they are merged into a single run first.
+    
+    External_Sort(function) -> External_Sort
+    """
+    def __init__(self, get_key):
+        """
+        @get_key
+                (function)
+                A function which takes a record and returns its sort key.
+        """
+        self.get_key = get_key
+        self.run = []
+        self.runs = []
+        self.count_files = 0
+        self.temp_dir = None
+
+    def add(self, record):
+        """
+        Add a record to be sorted. Each record is a line of text, ending in a
+        newline character.
+        
+        External_Sort.add(str) -> None
+        """
+        self.run.append(record)
+        if len(self.run) >= MAX_RECORDS_IN_MEMORY: self.Spill()
+
+    def Spill(self):
+        """
+        Sort the records in memory, write them to a temporary file, and clear
+        them from memory.
+        
+        External_Sort.Spill() -> None
+        """
+        if not self.temp_dir: self.temp_dir = tempfile.mkdtemp(dir = TEMP_DIR)
+        self.run.sort(key = self.get_key)
+        self.Write_Run(self.run)
+        self.run = []
+        # Limit the number of temporary files open at once when merging
+        if len(self.runs) >= MAX_PARTITIONS:
+            runs = self.runs
+            self.runs = []
+            self.Write_Run(self.Merge_Runs(runs, []))
+            for path in runs: os.remove(path)
+
+    def Write_Run(self, records):
+        """
+        Write a sorted run of records to a new temporary file.
+        
+        External_Sort.Write_Run(iterable<str>) -> None
+        """
+        path = os.path.join(self.temp_dir, "run_" + str(self.count_files))
+        self.count_files += 1
+        w = open(path, "w")
+        w.writelines(records)
+        w.close()
+        self.runs.append(path)
+
+    def Merge_Runs(self, runs, records):
+        """
+        A generator which merges the sorted runs of records in the temporary
+        files [runs] and in [records], keeping records with equal keys in the
+        order they were added.
+        
+        External_Sort.Merge_Runs(list<str>, iterable<str>) -> generator<str>
+        """
+        def Iterate_Run(records, run_no):
+            for i, record in enumerate(records):
+                yield [self.get_key(record), run_no, i, record]
+        files = [open(path, "r") for path in runs]
+        iterators = [Iterate_Run(f, i) for i, f in enumerate(files)]
+        iterators.append(Iterate_Run(records, len(files)))
+        for item in heapq.merge(*iterators): yield item[3]
+        for f in files: f.close()
+
+    def Iterate(self):
+        """
+        Return an iterator over all the records added, in sorted order.
+        
+        External_Sort.Iterate() -> iterator<str>
+        """
+        self.run.sort(key = self.get_key)
+        if not self.runs: return iter(self.run)
+        return self.Merge_Runs(self.runs, self.run)
+
+    def Close(self):
+        """
+        Delete any temporary files.
+        
+        External_Sort.Close() -> None
+        """
+        if self.temp_dir: shutil.rmtree(self.temp_dir, True)
+        self.temp_dir = None
+
+
+
+class Reverse_Key(object):
+    """
+    A wrapper for a sort key which reverses its order, for sorting strings in
+    descending order.
+    
+    Reverse_Key(str) -> Reverse_Key
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def __cmp__(self, other):
+        return cmp(other.value, self.value)
+
+
+
+class Previous_Key(object):
+    """
+    A container which can be used in place of a set to record only the most
+    recent combination of values. This is sufficient when the input is sorted
+    such that rows with the same combination of values are adjacent.
+    
+    Previous_Key() -> Previous_Key
+    """
+    def __init__(self):
+        self.key = None
+
+    def __contains__(self, item):
+        return item == self.key
+
+    def add(self, item):
+        """
+        Record [item], replacing the previously recorded item.
+        
+        Previous_Key.add(tuple<str...>) -> None
+        """
+        self.key = item
+
+
+
+# File Processing Code #########################################################
+
+def Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
+            inc_filters, exc_filters, headers, novel_unique,
+            novel_unique_method=None, sorted_columns=None, check_sorted=False,
+            global_unique=None, row_range=None, index_interval=0,
+            zone_map_size=0, value_index=None, join=None, aggregates=None,
+            top=None, sort_output=None, profile=False, shard=None,
+            sqlite=None, npy=None, incremental=False, follow=False,
+            checkpoint=0, resume=False, limit=0, sample=None,
+            metrics_json=None):
+    """
+    Function which performs the basic table file parsing.
+    
+    @path_in
+            (str - filepath)
+            The filepath of the input file.
+    @delim_in
+            (str)
+            The delimiter use by the input file.
+    @path_out
+            (str - filepath)
+            The filepath of the output file. If it contains "{colN}", each row
+            of data is written to the file for its value in column N instead.
+            See Partitioned_Output for details.
+    @delim_out
+            (str)
+            The delimiter use by the output file.
+    @columns
+            (list<int>)
+            An list of the columns to be retained from the input file, in that
+            specified order.
+            Uses the 1-index system. (The first column's index number is 1)
+            0 is used to signify an empty column.
+    @inc_filters
+    @exc_filters
+            (list<int,int,str/int/float>)
+            A list of filtering criteria. [inc_filters] is a list of criteria
+            for inclusion while [exc_filters] is a list of criteria for
+            exclusion.
+            Each item in the list is a criteria.
+            Each criteria item consists of three parts:
+                1) The column number of the data to be filtered. (index-1 system)
+                2) An integer denoting the type of filtering operation:
+                    1:  EQUALS (string)
+                    2:  NOT_EQUAL (string)
+                    3:  CONTAINS
+                    4:  NOT_CONTAIN
+                    5:  GREATER_THAN
+                    6:  GREAQUALS
+                    7:  LESS_THAN
+                    8:  LEQUALS
+                    9:  EQUALS (int)
+                    10: NOT_EQUAL (int)
+                    11: EQUALS (float)
+                    12: NOT_EQUAL (float)
+                    13: IN
+                    14: CONTAINS_ANY
+                    15: NOT_CONTAIN_ANY
+                    16: MATCHES
+                    17: NOT_MATCH
+                3) The string/substring/cutoff used for filtering, the set of
+                        strings for IN, the Aho_Corasick automaton for
+                        CONTAINS_ANY and NOT_CONTAIN_ANY, or the Regex_Query for
+                        MATCHES and NOT_MATCH.
+    @headers
+            (list<[int,int,str/int]>)
+            A list of lists which specify special treatment for line(s) at the
+            beginning of the file.
+            Each sublist contains 3 elements:
+                1) An integer denoting the type of action to take:
+                    1:  KEEP
+                    2:  SKIP
+                    3:  REARRANGE
+                2) An integer denoting whether to act on a set number of lines
+                        or on an unknown NUMBER of lines beginning with a
+                        specified CHARACTER:
+                    1:  CHARACTER
+                    2:  NUMBER
+                3) If element 2 was CHARACTER, element 3 will be the character
+                        which denotes the lines to be acted on. If element 2 was
+                        NUMBER, element 3 will be the integer which denotes the
+                        number of lines to act on.
+    @novel_unique
+            (list<int>)
+            A list of the columns which will be used to determine the columns,
+            for which a novel combination of values is necessary for that row of
+            data to be accepted.
+            That is to say, if multiple rows have the same combination of values
+            in the specified columns, only the first row will be accepted.
+            This is not the same as specifying that the combination of values in
+            the specified columns needs to be unique across the entire file.
+            Uses the 1-index system. (The first column's index number is 1)
+            0 is used to signify an empty column.
+    @novel_unique_method
+            (list<int,...>)
+            (Optional)
+            Specifies how the combinations of values seen so far are recorded.
+            The first element is an integer denoting the method:
+                1:  EXACT (Default. Every combination is recorded exactly.)
+                2:  BLOOM (Combinations are recorded in a Bloom filter.)
+                3:  WINDOW_ROWS (Only the last N accepted rows are recorded.)
+                4:  WINDOW_KEYS (Only the N most recently seen combinations are
+                        recorded.)
+            For BLOOM, the second and third elements are the expected number of
+            distinct combinations and the desired false positive rate.
+            For WINDOW_ROWS and WINDOW_KEYS, the second element is N.
+    @sorted_columns
+            (list<[int,int,int]>)
+            (Optional)
+            A list of the columns by which the input file is already sorted,
+            from the primary sort column onwards.
+            Each sublist contains 3 elements:
+                1) The column number. (index-1 system)
+                2) An integer denoting the sort order:
+                    1:  ASC
+                    2:  DESC
+                3) An integer denoting the sort type:
+                    1:  NUM
+                    2:  STR
+            Inclusion criteria on the primary sort column are used to skip to
+            the first row which could satisfy them and to stop reading once no
+            more rows can. If [novel_unique] matches the leading sort columns,
+            which are sorted lexically, and [novel_unique_method] is EXACT, only
+            the previous combination of values is recorded.
+    @check_sorted
+            (bool)
+            (Optional)
+            Whether to verify that the rows which are read are sorted in
+            accordance with [sorted_columns]. If a row is out of order, an error
+            is printed and the function returns 1.
+    @global_unique
+            (list<int>)
+            (Optional)
+            A list of columns for which the combination of values must appear
+            exactly once across all the rows of data in the file for a row to
+            be accepted.
+            Uses the 1-index system. (The first column's index number is 1)
+    @row_range
+            (list<int,int>)
+            (Optional)
+            The first and last rows of data to be processed, inclusive. The rows
+            of data are numbered from 1, after the header lines. If an
+            up-to-date line index of the input file exists, it is used to jump
+            to the first row.
+    @index_interval
+            (int)
+            (Optional)
+            If non-zero, build a line index of the input file recording the
+            position of every [index_interval]th line, unless an up-to-date one
+            already exists.
+    @zone_map_size
+            (int)
+            (Optional)
+            If non-zero, build a zone map of the input file, recording
+            statistics for every block of [zone_map_size] lines, unless an
+            up-to-date one already exists.
+            Whenever an up-to-date zone map exists, blocks of rows which cannot
+            satisfy the filtering criteria are skipped.
+    @value_index
+            (list<int,int>)
+            (Optional)
+            If specified, build a value index of the input file for the column
+            (index-1 system) in the first element, sorted according to the sort
+            type (1: NUM, 2: STR) in the second element, unless an up-to-date
+            one already exists.
+            Whenever an up-to-date value index exists for a column with
+            inclusion criteria, it is used to read only the matching rows.
+    @join
+            (list<str,str,int,int,int>)
+            (Optional)
+            If specified, join each row of data to a row of a lookup table. The
+            list contains 5 elements:
+                1) The filepath of the lookup table.
+                2) The delimiter used by the lookup table.
+                3) The column of the input file to join on. (1-index)
+                4) The column of the lookup table to join on. (1-index)
+                5) An integer denoting the type of join:
+                    1:  INNER (Rows without a match are rejected.)
+                    2:  LEFT (Rows without a match are accepted.)
+            Columns of the lookup table are specified in [columns] as negative
+            numbers. Ex. -3 for the third column of the lookup table.
+    @aggregates
+            (list<[int,int]>)
+            (Optional)
+            If specified, the rows of data accepted are grouped by their values
+            in [columns], and one row is output for each group, containing
+            those values followed by the results of the aggregate functions.
+            See Group_Aggregates for details.
+    @top
+            (list<int,int,int>)
+            (Optional)
+            If specified, only the K rows accepted with the largest or smallest
+            numbers in a column are output. The list contains 3 elements:
+                1) K, the number of rows to output.
+                2) The column containing the numbers. (1-index)
+                3) An integer denoting which rows to keep:
+                    1:  ASC (The rows with the smallest numbers.)
+                    2:  DESC (The rows with the largest numbers.)
+            Rows without a number in the column are rejected.
+    @sort_output
+            (list<[int,int,int]>)
+            (Optional)
+            If specified, the rows output are sorted by these columns of the
+            input file, in the same format as [sorted_columns]. The rows are
+            sorted using External_Sort. See Get_Output_Sort_Key for details.
+    @profile
+            (bool)
+            (Optional)
+            If True, statistics for each column output are written to a file
+            next to the output file, with ".profile.json" appended.
+            See Column_Profile for details.
+    @shard
+            (list<int,int>)
+            (Optional)
+            If specified, the output is split into numbered shards instead. The
+            list contains 2 elements:
+                1) An integer denoting how the size of the shards is limited:
+                    1:  ROWS (The number of rows of data.)
+                    2:  BYTES (The size of the file.)
+                2) The largest number of rows or bytes in each shard.
+            See Sharded_Output for details.
+    @sqlite
+            (list<str,list<[int,str]>,list<int>>)
+            (Optional)
+            If specified, the rows of data are inserted into a table in an
+            SQLite database at [path_out] instead. [delim_out] should be
+            STR__record_delim. The list contains 3 elements:
+                1) The name of the table.
+                2) A list of the declared types of columns. Each consists of
+                        the column number (1-index) and the type.
+                3) A list of the columns to create indexes on. (1-index)
+            See SQLite_Output and Get_SQL_Types for details.
+    @npy
+            (list<list<[int,str]>>)
+            (Optional)
+            If specified, each column of the rows of data is written to a
+            separate NumPy array file, named after [path_out], instead.
+            [delim_out] should be STR__record_delim. The list contains 1
+            element:
+                1) A list of the declared types of columns, as for [sqlite].
+            See NPY_Output for details.
+    @incremental
+            (bool)
+            (Optional)
+            If True, the byte offset which processing stopped at, the row
+            counts and the combinations of values recorded for [novel_unique]
+            are saved to a state file next to the output file, with
+            ".state.json" appended. If a state file for the same job already
+            exists, only the lines appended to the input file since then are
+            processed, and the rows accepted are appended to the output file.
+            An incomplete line at the end of the input file is left for the
+            next run. See Save_State for details.
+    @follow
+            (bool)
+            (Optional)
+            If True, process the input file incrementally, and then keep
+            waiting for more lines to be appended to it, until interrupted.
+            See Follow_Lines for details.
+    @checkpoint
+            (int)
+            (Optional)
+            If non-zero, save the state to the same state file as for
+            [incremental] after every [checkpoint] rows read, so that an
+            interrupted run can be resumed. The state file is deleted once the
+            run is complete, unless [incremental] is True. A run stopped by
+            [limit] counts as interrupted.
+    @resume
+            (bool)
+            (Optional)
+            If True, and a state file for the same job exists, the output file
+            is truncated to its size at the last checkpoint, and processing
+            continues from there. The output is then identical to that of an
+            uninterrupted run.
+    @limit
+            (int)
+            (Optional)
+            If non-zero, stop reading once [limit] rows have been accepted.
+    @sample
+            (list<int,int>)
+            (Optional)
+            If specified, only a sample of the rows of data is processed. The
+            list contains 2 elements:
+                1) An integer denoting how the rows are sampled:
+                    1:  EVERY (Every Nth row, starting with the first.)
+                    2:  RESERVOIR (A uniform random sample of N rows, chosen
+                            using Sample_Reservoir.)
+                2) N.
+            Rows which are not sampled are rejected without being parsed.
+    @metrics_json
+            (str - filepath)
+            (Optional)
+            If specified, the throughput of the run, the time spent in each
+            stage, and the number of rows rejected by each filtering criteria,
+            by [global_unique] and by [novel_unique] are written to this file,
+            in JSON format. The progress so far is written periodically while
+            the rows are being read. See Run_Metrics for details.
+    
+    Return a value of 0 if the function runs successfully.
+    Return a value of 1 if the input file was found not to be sorted, or the
+    state file does not match the input and output files.
+    
+    Table_To_Table(str, str, str, str, list<int>, list<int,int,str/int/float>,
+            list<int,int,str/int/float>) -> int
+    """
+    printP(STR__t2t_begin)
+    
+    # Metrics Report
+    run_metrics = None
+    if metrics_json:
+        run_metrics = Run_Metrics(metrics_json, path_in, inc_filters,
+                exc_filters)
+    
+    # Incremental Processing and Checkpoints
+    incremental = incremental or follow
+    saving = incremental or bool(checkpoint) or resume
+    resumed = {}
+    if saving:
+        state_path = Get_State_Path(path_out)
+        job = Get_Job_Hash(delim_in, delim_out, columns, inc_filters,
+                exc_filters, headers, novel_unique, novel_unique_method, join)
+    if incremental or resume:
+        resumed = Load_State(state_path, path_in, path_out, job)
+        if resumed is None:
+            printE(STR__state_mismatch.format(s = state_path))
+            return 1
+    
+    # Initialize File IO
+    r = open(path_in, "U")
+    partitioned = bool(Get_Partition_Columns(path_out))
+    if partitioned: w = Partitioned_Output(path_out)
+    elif shard: w = Sharded_Output(path_out, shard[0], shard[1])
+    elif sqlite:
+        names = Get_SQL_Default_Names(columns, aggregates)
+        types = Get_SQL_Types(columns, inc_filters, exc_filters, aggregates,
+                sqlite[1])
+        indexes = [columns.index(i) for i in sqlite[2]]
+        w = SQLite_Output(path_out, sqlite[0], names, types, indexes,
+                delim_out)
+    elif npy:
+        names = Get_SQL_Default_Names(columns, aggregates)
+        types = Get_SQL_Types(columns, inc_filters, exc_filters, aggregates,
+                npy[0])
+        w = NPY_Output(path_out, names, types, delim_out)
+    elif resumed: # Discard anything written after the state was saved
+        w = open(path_out, "r+")
+        w.truncate(resumed["output_bytes"])
+        w.seek(0, 2)
+    else: w = open(path_out, "w")
+    sink = partitioned or bool(shard) or bool(sqlite) or bool(npy)
+    if sink: write_row = w.Write_Row
+    else: write_row = lambda data, string: w.write(string)
+    
+    # Lookup Table
+    lookup = None
+    joined = None
+    if join:
+        lookup_path, lookup_delim, join_col, lookup_col, join_type = join
+        lookup = Lookup_Table(lookup_path, lookup_delim, lookup_col, join_col,
+                headers)
+    
+    # Initialize Metrics
+    count_total = 0
+    count_passed = 0
+    count_start = 0 # The row number before the first row to be read
+    count_written = 0
+    bytes_written = 0 # Of the rows of data
+    count_join_rejected = 0
+    count_unique_rejected = 0
+    count_novel_rejected = 0
+    rows_before = 0 # Read and accepted by the runs this one continues from
+    passed_before = 0
+    
+    # Header and Comments
+    continued = bool(resumed) and resumed["header_count"] is not None
+    if continued: # Continue from where the previous run stopped
+        Seek_Line_End(r, resumed["offset"])
+        line = r.readline()
+        header_count = resumed["header_count"]
+        count_start = resumed["count_total"]
+        count_total = count_start
+        rows_before = count_start
+        passed_before = resumed["count_passed"]
+    elif incremental and not Has_Headers(r, headers, delim_in, follow):
+        line = ""
+        header_count = None # Processed once they are complete
+        follow = False # Interrupted while waiting for them
+    else:
+        line, header_count = Process_Headers(r, w, headers, delim_in,
+                delim_out, columns, lookup)
+    if saving:
+        state = {"job": job, "header_count": header_count,
+                "count_total": count_total, "count_passed": passed_before}
+    
+    # Line Index and Row Range
+    line_index = []
+    if index_interval: line_index = Get_Line_Index(path_in, index_interval)
+    elif row_range: line_index = Load_Line_Index(path_in)
+    if row_range:
+        count_start = row_range[0] - 1
+        count_total = count_start
+        if count_start and line:
+            if line_index:
+                Seek_Line(r, line_index, header_count + row_range[0])
+            else:
+                for i in xrange(count_start - 1): r.readline()
+            line = r.readline()
+    
+    # Zone Map
+    if zone_map_size: zone_map = Get_Zone_Map(path_in, delim_in, zone_map_size)
+    else: zone_map = Load_Zone_Map(path_in, delim_in)
+    if zone_map: zone_size, zone_blocks = zone_map
+    zone_skip_rows = 0
+    zone_skip_blocks = 0
+    
+    # Value Index
+    if value_index:
+        Get_Value_Index(path_in, delim_in, headers, header_count,
+                value_index[0], value_index[1])
+    index_rows = None
+    if not row_range and not saving and not sample:
+        index_rows = Find_Value_Index_Rows(path_in, delim_in, header_count,
+                inc_filters)
+    if index_rows:
+        index_col, index_total, index_rows = index_rows
+        index_count = len(index_rows)
+        index_rows = iter(index_rows)
+        zone_map = []
+        line, count_total = Read_Index_Row(r, index_rows, index_total)
+    
+    # Sampling
+    # (A random sample is chosen before any rows are processed)
+    count_sampled = 0
+    sample_every = 0
+    sample_rows = None
+    if sample and sample[0] == SAMPLE.EVERY: sample_every = sample[1]
+    elif sample:
+        last_row = 0
+        if row_range: last_row = row_range[1]
+        sample_rows, sample_total = Sample_Reservoir(r, line, count_total,
+                sample[1], last_row)
+        count_sampled = len(sample_rows)
+        sample_rows = iter(sample_rows)
+        zone_map = []
+        line, count_total = Read_Sample_Row(sample_rows, sample_total)
+    limit_stop = False
+    
+    # Intialize Other Processing Nnecessities
+    if not sorted_columns: sorted_columns = []
+    exact = not novel_unique_method or novel_unique_method[0] == DEDUPE.EXACT
+    if exact and Is_Sorted_Prefix(novel_unique, sorted_columns):
+        novel_unique_method = [DEDUPE.PREVIOUS]
+    temp = []
+    for i in novel_unique: temp.append(i - 1)
+    novel_unique = temp
+    recorded_combinations = Create_Recorded_Combinations(novel_unique_method)
+    if continued:
+        Load_Combinations_State(recorded_combinations, resumed["combinations"])
+    refresh_keys = isinstance(recorded_combinations, Window_Keys)
+    added = None # Recorded since the state was last saved, for the journal
+    if saving and novel_unique and isinstance(recorded_combinations, set):
+        added = []
+        journal_path = Get_Journal_Path(state_path)
+        if continued and resumed.get("journal_bytes"):
+            Load_Journal(journal_path, recorded_combinations,
+                    resumed["journal_bytes"])
+        else:
+            if os.path.exists(journal_path): os.remove(journal_path) # Stale
+            added.extend(recorded_combinations) # From an older state file
+    
+    # Sorted Input
+    sort_bounds = []
+    if sorted_columns:
+        sort_bounds = Get_Sort_Bounds(inc_filters, sorted_columns[0])
+    sorted_skip = 0
+    sorted_stop = False
+    prev_key = []
+    
+    # Aggregation
+    groups = None
+    if aggregates: groups = Group_Aggregates(aggregates)
+    
+    # Top K Rows
+    top_rows = None
+    if top: top_rows = Top_Rows(top[0], top[1], top[2])
+    
+    # Column Profile
+    column_profile = None
+    if profile: column_profile = Column_Profile(columns)
+    
+    # Sorted Output
+    # (Each record is the values of the sort columns, followed by the output)
+    sorter = None
+    if sort_output:
+        sort_count = len(sort_output)
+        get_key = lambda record: Get_Output_Sort_Key(
+                record.split(delim_in, sort_count), sort_output)
+        sorter = External_Sort(get_key)
+    
+    # Global Uniques
+    unique_rows = None
+    next_unique = 0
+    is_unique = True
+    if global_unique:
+        unique_rows = Iterate_Global_Uniques(path_in, delim_in, headers,
+                global_unique)
+        next_unique = next(unique_rows, 0)
+    
+    # Skip to the first row which could satisfy the sorted column's criteria
+    # (Not possible if the row numbers are needed)
+    if (sort_bounds and line and not global_unique and not row_range and
+            not index_rows and not sample):
+        data = Parse_Line(line, delim_in)
+        if Get_Sort_Position(data, sorted_columns[0], sort_bounds) < 0:
+            is_before = lambda l: Get_Sort_Position(Parse_Line(l, delim_in),
+                    sorted_columns[0], sort_bounds) < 0
+            start = r.tell()
+            end = os.path.getsize(path_in)
+            r.seek(Bisect_Lines(r, start, end, is_before))
+            sorted_skip = r.tell() - start
+            line = r.readline()
+    if sorted_skip: zone_map = [] # Line numbers are no longer known
+    
+    # Checkpoints
+    next_checkpoint = count_total + checkpoint
+    
+    # Metrics Report (2)
+    if run_metrics:
+        run_metrics.position_start = r.tell() - len(line)
+        run_metrics.position = run_metrics.position_start
+        run_metrics.rows_before = rows_before
+        run_metrics.Start_Stage("main_loop")
+    
+    # Main Loop
+    while line or follow:
+        if row_range and count_total >= row_range[1]: break
+        if incremental and not line.endswith("\n"): # Still being written
+            if not follow: break
+            state["count_total"] = count_total
+            state["count_passed"] = passed_before + count_passed
+            line = Follow_Lines(r, line, path_in, w, state_path, state,
+                    recorded_combinations, added)
+            if not line: break # Interrupted
+        if limit and count_passed >= limit:
+            limit_stop = True
+            break
+        
+        # Skip blocks of rows which cannot satisfy the filtering criteria
+        if zone_map and (header_count + count_total) % zone_size == 0:
+            block = (header_count + count_total) // zone_size
+            if block < len(zone_blocks) and Can_Skip_Block(zone_blocks[block],
+                    inc_filters, exc_filters):
+                if block + 1 < len(zone_blocks):
+                    r.seek(zone_blocks[block + 1][0])
+                else:
+                    r.seek(0, 2) # End of file
+                count_total += zone_blocks[block][1]
+                if row_range: count_total = min(count_total, row_range[1])
+                zone_skip_rows += zone_blocks[block][1]
+                zone_skip_blocks += 1
+                line = r.readline()
+                continue
+        
+        count_total += 1
+        
+        # Skip the rows which are not sampled
+        if sample_every:
+            if (count_total - 1) % sample_every:
+                line = r.readline()
+                continue
+            count_sampled += 1
+        
+        data = Parse_Line(line, delim_in)
+        
+        if check_sorted:
+            key = Get_Sort_Key(data, sorted_columns)
+            if not key or (prev_key and
+                    not Is_In_Order(prev_key, key, sorted_columns)):
+                if sorted_skip: printE(STR__not_sorted_skip.format(s = line))
+                else: printE(STR__not_sorted.format(N = count_total, s = line))
+                w.close()
+                r.close()
+                if groups: groups.Close()
+                if sorter: sorter.Close()
+                return 1
+            prev_key = key
+        
+        if sort_bounds:
+            if Get_Sort_Position(data, sorted_columns[0], sort_bounds) > 0:
+                sorted_stop = True
+                break
+        
+        if run_metrics: test = run_metrics.Filter(data)
+        else: test = Filter(data, inc_filters, exc_filters)
+        
+        if lookup and test:
+            joined = lookup.Get(data)
+            if joined is None:
+                if join_type == JOIN.INNER:
+                    test = False
+                    count_join_rejected += 1
+                else: joined = []
+        
+        if global_unique:
+            while next_unique and next_unique < count_total:
+                next_unique = next(unique_rows, 0)
+            is_unique = (next_unique == count_total)
+        
+        # (Only for rows which are otherwise accepted)
+        tup = True
+        if novel_unique and test and is_unique:
+            tup = Filter_Novel_Uniques(data, recorded_combinations,
+                    novel_unique)
+            if not tup and refresh_keys: # Seen again, so now the most recent
+                recorded_combinations.add(tuple([data[i]
+                        for i in novel_unique]))
+        
+        if test and is_unique and tup:
+            string = Create_Output(data, columns, delim_out, joined)
+            if groups: groups.Add(string, data)
+            elif top_rows: test = top_rows.Add(data, string)
+            elif sorter:
+                values = []
+                for col, order, sort_type in sort_output:
+                    if col > len(data): values.append("")
+                    else: values.append(data[col - 1])
+                sorter.add(delim_in.join(values) + delim_in + string)
+            else:
+                if sink: w.Write_Row(data, string)
+                else: w.write(string)
+                count_written += 1
+                bytes_written += len(string)
+            if test:
+                count_passed += 1
+                recorded_combinations.add(tup)
+                if added is not None: added.append(tup)
+                if column_profile: column_profile.Update(data, joined)
+        elif test and not is_unique: count_unique_rejected += 1
+        elif test: count_novel_rejected += 1
+        
+        if run_metrics: run_metrics.Update(r, rows_before + count_total -
+                count_start, passed_before + count_passed)
+        
+        # Checkpoint
+        if checkpoint and count_total >= next_checkpoint:
+            state["count_total"] = count_total
+            state["count_passed"] = passed_before + count_passed
+            Save_State(state_path, state, path_in, r.tell(), w,
+                    recorded_combinations, added)
+            next_checkpoint = count_total + checkpoint
         
         # Main Loop (2)
+        if index_rows: line, count_total = Read_Index_Row(r, index_rows,
+                index_total)
+        elif sample_rows: line, count_total = Read_Sample_Row(sample_rows,
+                sample_total)
+        else: line = r.readline()
+    if run_metrics:
+        run_metrics.position = r.tell() - len(line)
+        run_metrics.Start_Stage("output")
+
+    # Aggregation (2)
+    count_groups = 0
+    if groups:
+        for key, accs in groups.Iterate():
+            count_groups += 1
+            results = groups.Get_Results(accs)
+            string = delim_out.join([key[:-1]] + results) + "\n"
+            write_row(None, string)
+            count_written += 1
+            bytes_written += len(string)
+        groups.Close()
+    
+    # Top K Rows (2)
+    # (Only the rows output are counted as passed)
+    if top_rows:
+        count_passed = 0
+        for string in top_rows.Iterate():
+            write_row(None, string)
+            count_passed += 1
+            count_written += 1
+            bytes_written += len(string)
+    
+    # Sorted Output (2)
+    if sorter:
+        for record in sorter.Iterate():
+            string = record.split(delim_in, sort_count)[sort_count]
+            write_row(None, string)
+            count_written += 1
+            bytes_written += len(string)
+        sorter.Close()
+    
+    if run_metrics: run_metrics.Start_Stage("finish")
+    
+    # Incremental Processing and Checkpoints (2)
+    if incremental:
+        state["count_total"] = count_total
+        state["count_passed"] = passed_before + count_passed
+        Save_State(state_path, state, path_in, r.tell() - len(line), w,
+                recorded_combinations, added)
+    elif saving and not limit_stop: # The run is complete
+        if os.path.exists(state_path): os.remove(state_path)
+        if added is not None and os.path.exists(journal_path):
+            os.remove(journal_path)
+    
+    # Finish
+    w.close()
+    r.close()
+    if unique_rows: unique_rows.close()
+    if lookup: lookup.Close()
+    if column_profile: column_profile.Write(path_out + ".profile.json")
+
+    # Metrics Reporting
+    # (A continued run reports the totals of the whole job so far)
+    count_read = count_total - count_start
+    total_read = rows_before + count_read
+    total_passed = passed_before + count_passed
+    s_total, s_passed = Ints_To_Aligned_Strings(
+            [total_read, total_passed], ALIGN.RIGHT)
+    s_percentage = Get_Percentage_String(total_passed, max(1, total_read), 2,
+            6)
+    if run_metrics:
+        run_metrics.Start_Stage(None)
+        run_metrics.counts.update([
+                ["rows_read", total_read],
+                ["rows_passed", total_passed],
+                ["rows_written", count_written],
+                ["bytes_written", bytes_written],
+                ["join_rejected", count_join_rejected],
+                ["global_unique_rejected", count_unique_rejected],
+                ["novel_unique_rejected", count_novel_rejected]])
+        run_metrics.Write(True)
+
+    printM(STR__metrics_lines.format(N = s_total))
+    printM(STR__metrics_passed.format(N = s_passed, P = s_percentage))
+    if novel_unique and isinstance(recorded_combinations, Bloom_Filter):
+        fp_rate = recorded_combinations.Get_FP_Rate()
+        printM(STR__metrics_bloom.format(P = "%.6f" % (fp_rate*100)))
+    # (The row numbers are not known once the lines before them are skipped)
+    if sorted_skip:
+        printM(STR__metrics_sorted_skip.format(N = sorted_skip))
+        if sorted_stop: printM(STR__metrics_sorted_stop_skip)
+        if limit_stop: printM(STR__metrics_limit_skip.format(N = limit))
+    else:
+        if sorted_stop: printM(STR__metrics_sorted_stop.format(N = count_total))
+        if limit_stop: printM(STR__metrics_limit.format(N = count_total))
+    if sample: printM(STR__metrics_sample.format(N = count_sampled))
+    if row_range:
+        printM(STR__metrics_rows.format(M = count_start + 1, N = count_total))
+    if zone_skip_blocks:
+        printM(STR__metrics_zone_map.format(N = zone_skip_rows,
+                B = zone_skip_blocks))
+    if index_rows:
+        printM(STR__metrics_value_index.format(C = index_col, N = index_count))
+    if groups: printM(STR__metrics_groups.format(N = count_groups))
+    if partitioned: printM(STR__metrics_partitions.format(N = len(w.created)))
+    if shard: printM(STR__metrics_shards.format(N = len(w.shards)))
+    if continued:
+        printM(STR__metrics_resumed.format(N = count_start + 1, M = count_read))
+    # Exit
+    printP(STR__t2t_complete)
+    return 0
+
+
+
+def Estimate_Table_To_Table(path_in, delim_in, delim_out, columns, inc_filters,
+            exc_filters, headers, novel_unique, novel_unique_method=None,
+            join=None):
+    """
+    Estimate the cost of a job from a sample of the input file, without writing
+    any output. The sample consists of ESTIMATE_BLOCKS blocks of lines,
+    totalling ESTIMATE_SAMPLE_BYTES, the first of which begins at the start of
+    the rows of data, with the rest at random positions. (See SAMPLE_SEED)
+    
+    The rows in the sample are filtered, joined, checked for novel combinations
+    of values and output in the same manner as Table_To_Table, and the results
+    are extrapolated to the whole input file by its size. The number of rows
+    accepted and bytes written, the time Table_To_Table would take, and the
+    pass rate of each filtering criteria are reported.
+    
+    Rows with a combination of values seen earlier in the file, but not in the
+    sample, are counted as novel, so [novel_unique] may reject more rows than
+    estimated.
+    
+    @path_in
+            (str - filepath)
+            The filepath of the input file.
+    @delim_in
+            (str)
+            The delimiter use by the input file.
+    @delim_out
+            (str)
+            The delimiter use by the output file.
+    @columns
+    @inc_filters
+    @exc_filters
+    @headers
+    @novel_unique
+    @novel_unique_method
+    @join
+            See Table_To_Table for details.
+    
+    Return a value of 0 if the function runs successfully.
+    
+    Estimate_Table_To_Table(str, str, str, list<int>,
+            list<int,int,str/int/float>, list<int,int,str/int/float>) -> int
+    """
+    printP(STR__estimate_begin)
+    time_start = time.time()
+    
+    # Initialize File IO
+    r = open(path_in, "U")
+    size = os.path.getsize(path_in)
+    
+    # Lookup Table
+    lookup = None
+    joined = None
+    if join:
+        lookup_path, lookup_delim, join_col, lookup_col, join_type = join
+        lookup = Lookup_Table(lookup_path, lookup_delim, lookup_col, join_col,
+                headers)
+    
+    # Header and Comments
+    line, header_count = Process_Headers(r, None, headers, delim_in, delim_out,
+            columns, lookup)
+    start = r.tell() - len(line)
+    data_bytes = size - start
+    
+    # Sample Blocks
+    # (The whole file is read if it is no larger than the sample)
+    block_bytes = ESTIMATE_SAMPLE_BYTES // ESTIMATE_BLOCKS
+    offsets = [start]
+    if data_bytes > ESTIMATE_SAMPLE_BYTES:
+        rand = random.Random(SAMPLE_SEED)
+        for i in range(ESTIMATE_BLOCKS - 1):
+            offsets.append(rand.randint(start, size - 1))
+        offsets.sort()
+    else: block_bytes = data_bytes
+    
+    # Intialize Other Processing Nnecessities
+    temp = []
+    for i in novel_unique: temp.append(i - 1)
+    novel_unique = temp
+    recorded_combinations = Create_Recorded_Combinations(novel_unique_method)
+    
+    # Initialize Metrics
+    count_total = 0
+    count_filtered = 0 # Rows which satisfy the filtering criteria
+    count_joined = 0
+    count_novel = 0
+    count_passed = 0
+    sample_bytes = 0
+    output_bytes = 0
+    lines = []
+    time_setup = time.time() - time_start
+    
+    # Main Loop
+    time_start = time.time()
+    for offset in offsets:
+        position = r.tell() - len(line)
+        if offset > position: # Discard the rest of the line it falls in
+            Seek_Line_End(r, offset)
+            position = r.tell()
+            line = r.readline()
+        end = position + block_bytes
+        while line:
+            count_total += 1
+            lines.append(line)
+            data = Parse_Line(line, delim_in)
+            
+            test = Filter(data, inc_filters, exc_filters)
+            if test: count_filtered += 1
+            
+            if lookup and test:
+                joined = lookup.Get(data)
+                if joined is None:
+                    if join_type == JOIN.INNER: test = False
+                    else: joined = []
+                if test: count_joined += 1
+            
+            if novel_unique:
+                tup = Filter_Novel_Uniques(data, recorded_combinations,
+                        novel_unique)
+                if test and tup: count_novel += 1
+            else:
+                tup = True
+            
+            if test and tup:
+                string = Create_Output(data, columns, delim_out, joined)
+                output_bytes += len(string)
+                count_passed += 1
+                recorded_combinations.add(tup)
+            
+            line = r.readline()
+            if r.tell() - len(line) >= end: break
+        sample_bytes += r.tell() - len(line) - position
+    time_sample = time.time() - time_start
+    
+    # Finish
+    r.close()
+    if lookup: lookup.Close()
+    
+    # Pass Rate of Each Criteria
+    # (Each is applied to every row in the sample, regardless of the others)
+    criteria = [[1, f] for f in inc_filters] + [[0, f] for f in exc_filters]
+    counts = [0]*len(criteria)
+    for line in lines:
+        data = Parse_Line(line, delim_in)
+        for i, (inc_exc, f) in enumerate(criteria):
+            try:
+                b = Filter_Single(data, f)
+            except (IndexError, ValueError): # Neither satisfied nor excluded
+                continue
+            if b == bool(inc_exc): counts[i] += 1
+    
+    # Extrapolate
+    scale = float(data_bytes)/max(1, sample_bytes)
+    est_total = int(round(count_total*scale))
+    est_passed = int(round(count_passed*scale))
+    est_bytes = int(round(output_bytes*scale))
+    est_time = time_setup + time_sample*scale
+    
+    # Metrics Reporting
+    s_sample, s_total, s_passed = Ints_To_Aligned_Strings(
+            [count_total, est_total, est_passed], ALIGN.RIGHT)
+    s_percentage = Get_Percentage_String(sample_bytes, max(1, data_bytes), 2,
+            6)
+    printM(STR__metrics_est_sample.format(N = s_sample, P = s_percentage))
+    printM(STR__metrics_est_lines.format(N = s_total))
+    s_percentage = Get_Percentage_String(count_passed, max(1, count_total), 2,
+            6)
+    printM(STR__metrics_est_passed.format(N = s_passed, P = s_percentage))
+    printM(STR__metrics_est_bytes.format(N = est_bytes))
+    printM(STR__metrics_est_time.format(N = "%.1f" % est_time))
+    for (inc_exc, f), count in zip(criteria, counts):
+        s_percentage = Get_Percentage_String(count, max(1, count_total), 2, 6)
+        printM(STR__metrics_pass_rate.format(P = s_percentage,
+                s = Get_Criteria_String(f, inc_exc)))
+    if lookup:
+        s_percentage = Get_Percentage_String(count_joined,
+                max(1, count_filtered), 2, 6)
+        printM(STR__metrics_pass_rate.format(P = s_percentage,
+                s = STR__pass_rate_join))
+    if novel_unique:
+        s_percentage = Get_Percentage_String(count_novel,
+                max(1, count_joined if lookup else count_filtered), 2, 6)
+        printM(STR__metrics_pass_rate.format(P = s_percentage,
+                s = STR__pass_rate_novel))
+    # Exit
+    printP(STR__estimate_complete)
+    return 0
+
+def Get_Criteria_String(criteria, inc_exc):
+    """
+    Return a filtering criteria in the form in which it is specified on the
+    command line. Long lists of strings are shortened, and file queries for
+    "Contains any of" are shown as "...", since only the automaton is kept.
+    
+    @criteria
+            (list<int,int,str/int/float/set<str>/Aho_Corasick/Regex_Query>)
+            The filtering criteria. See Filter_Single for details.
+    @inc_exc
+            (int)
+            1 for an inclusion criteria, 0 for an exclusion criteria.
+    
+    Get_Criteria_String([int, int, str/int/float/set<str>/Aho_Corasick/
+            Regex_Query], int) -> str
+    """
+    col, op, query = criteria
+    for symbol in LIST__search_ops:
+        if DICT__ops[symbol] == op: break
+    if isinstance(query, frozenset):
+        query = ",".join(sorted(query))
+        if len(query) > 40: query = query[:37] + "..."
+    elif isinstance(query, Aho_Corasick): query = "..."
+    elif isinstance(query, Regex_Query): query = query.regex.pattern
+    else: query = str(query)
+    if inc_exc: return "col" + str(col) + symbol + query
+    return "!col" + str(col) + symbol + query
+
+
+
+def Process_Headers(readfile, writefile, headers, delim_in, delim_out,
+            columns, lookup=None):
+    """
+    Read the lines at the beginning of [readfile] and process them according to
+    [headers]. Return the first line which was not processed as a header line,
+    and the number of lines which were processed as header lines.
+    
+    If [writefile] is None, the header lines are read but not written.
+    
+    @readfile
+            (file)
+            The input file, which has not been read from yet.
+    @writefile
+            (file/None)
+            The file to which the output is written.
+    @headers
+            (list<[int,int,str/int]>)
+            See Table_To_Table for details.
+    @delim_in
+    @delim_out
+    @columns
+    @lookup
+            See Process_Header for details.
+    
+    Process_Headers(file, file, list<[int,int,str/int]>, str, str, list<int>,
+            Lookup_Table) -> [str, int]
+    """
+    line = readfile.readline()
+    count = 0
+    for header_list in headers:
+        action, action_type, value = header_list
+        if not writefile: action = KSR.SKIP
+        
+        # A set number of lines
+        if action_type == HEADER_TYPE.NUM:
+            while value > 0:
+                Process_Header(line, action, writefile, delim_in, delim_out,
+                        columns, lookup)
+                line = readfile.readline()
+                count += 1
+                value = value - 1
+        
+        # Lines beginning with a specified characters
+        elif action_type == HEADER_TYPE.CHAR:
+            while line and line[0] == value:
+                Process_Header(line, action, writefile, delim_in, delim_out,
+                        columns, lookup)
+                line = readfile.readline()
+                count += 1
+    return [line, count]
+
+
+
+def Process_Header(line, action, writefile, delim_in, delim_out, columns,
+            lookup=None):
+    """
+    Process the line according to the action specified.
+
+    If [action] is 1 (KRS.KEEP), then write [line] to [writefile] as is.
+
+    If [action] is 2 (KRS.SKIP), then the line is ignored.
+
+    If [action] is 3 (KRS.READ), then the contents of [line] are parsed using
+    [delim_in] and rearranged according to [delim_out] and [columns], before
+    being written to [writefile].
+
+    Return 0 if the operation was carried out without problem.
+    Return 1 if there was a problem.
+
+    @line
+            (str)
+            A line from the input file that needs to be processed different from
+            the rest of the tabulated data.
+    @action
+            (int) - Pseudo ENUM
+            An int which signifies the action which needs to be taken:
+                1: Keep the line as is
+                2: Skip the line
+                3: Rearrange the contents of the line
+    @writefile
+            (file)
+            The file to which the output is written.
+    @delim_in
+            (str)
+            The delimiter use by the input file. 
+    @delim_out
+            (str)
+            The delimiter use by the output file.
+    @columns
+            (list<int>)
+            An list of the columns to be retained from the input file, in that
+            specified order.
+            Uses the 1-index system. (The first column's index number is 1)
+    @lookup
+            (Lookup_Table/None)
+            (Optional)
+            The lookup table which rearranged lines are joined to, if any
+            columns from a lookup table are specified.
+    
+    Process_Header(str, int, file, str, str, list<int>, Lookup_Table) -> int
+    """
+    if action == KSR.KEEP: # Keep
+        writefile.write(line)
+        return 0
+    elif action == KSR.SKIP: # Skip
+        return 0
+    elif action == KSR.REAR: # Rearrange
+        values = Parse_Line(line, delim_in)
+        joined = None
+        if lookup: joined = lookup.Get_Header(values)
+        line = Create_Output(values, columns, delim_out, joined)
+        writefile.write(line)
+        return 0
+    return 1
+
+
+
+def Get_Line_Index_Path(path_in):
+    """
+    Return the filepath of the line index for the input file.
+    
+    Get_Line_Index_Path(str) -> str
+    """
+    return path_in + ".t2ti"
+
+def Get_File_Fingerprint(path):
+    """
+    Return a string made from the size and modification time of a file, which
+    is used to determine if a sidecar file made from it is up-to-date.
+    
+    Get_File_Fingerprint(str) -> str
+    """
+    return str(os.path.getsize(path)) + "\t" + repr(os.path.getmtime(path))
+
+def Build_Line_Index(path_in, interval):
+    """
+    Build a line index of the input file, recording the position of the start
+    of every [interval]th line, starting with the first line. Write the index to
+    its sidecar file if possible, and return it.
+    
+    The index is a list of 3 elements:
+        1) The interval between the lines whose positions are recorded.
+        2) The total number of lines in the file.
+        3) A list of the positions of the recorded lines.
+    
+    Build_Line_Index(str, int) -> [int, int, list<int>]
+    """
+    fingerprint = Get_File_Fingerprint(path_in)
+    positions = []
+    count = 0
+    r = open(path_in, "U")
+    while True:
+        if count % interval == 0: positions.append(r.tell())
+        if not r.readline(): break
+        count += 1
+    r.close()
+    if count % interval == 0: positions.pop() # Position of the end of the file
+    try:
+        w = open(Get_Line_Index_Path(path_in), "w")
+        w.write("T2T_LINE_INDEX\t" + fingerprint + "\t" + str(interval) + "\t" +
+                str(count) + "\n")
+        for i in positions: w.write(str(i) + "\n")
+        w.close()
+    except IOError:
+        pass # The index can still be used for this run
+    return [interval, count, positions]
+
+def Load_Line_Index(path_in):
+    """
+    Load the line index of the input file from its sidecar file.
+    Return an empty list if there is no such file or if it is out of date.
+    See Build_Line_Index for the format of the index.
+    
+    Load_Line_Index(str) -> [int, int, list<int>]
+    Load_Line_Index(str) -> []
+    """
+    try:
+        r = open(Get_Line_Index_Path(path_in), "r")
+    except IOError:
+        return []
+    values = r.readline().rstrip("\n").split("\t")
+    fingerprint = "\t".join(values[1:3])
+    if (values[0] != "T2T_LINE_INDEX" or len(values) != 5 or
+            fingerprint != Get_File_Fingerprint(path_in)):
+        r.close()
+        return []
+    positions = [int(i) for i in r]
+    r.close()
+    return [int(values[3]), int(values[4]), positions]
+
+def Get_Line_Index(path_in, interval):
+    """
+    Return the line index of the input file with the specified interval,
+    loading it from its sidecar file if it is up-to-date and building it
+    otherwise.
+    
+    Get_Line_Index(str, int) -> [int, int, list<int>]
+    """
+    line_index = Load_Line_Index(path_in)
+    if line_index and line_index[0] == interval: return line_index
+    return Build_Line_Index(path_in, interval)
+
+def Seek_Line(readfile, line_index, line_no):
+    """
+    Move to the start of the specified line of [readfile], using [line_index]
+    to jump to the closest recorded line before it.
+    
+    @readfile
+            (file)
+            The file, opened for reading.
+    @line_index
+            ([int, int, list<int>])
+            The line index of the file. See Build_Line_Index for details.
+    @line_no
+            (int)
+            The line number to move to. The first line of the file is 1.
+    
+    Seek_Line(file, [int, int, list<int>], int) -> None
+    """
+    interval, count, positions = line_index
+    i = min((line_no - 1) // interval, len(positions) - 1)
+    if i < 0: return # Empty file
+    readfile.seek(positions[i])
+    for j in xrange(line_no - 1 - (i * interval)): readfile.readline()
+
+
+
+def Get_Zone_Map_Path(path_in):
+    """
+    Return the filepath of the zone map for the input file.
+    
+    Get_Zone_Map_Path(str) -> str
+    """
+    return path_in + ".t2tz"
+
+def Build_Zone_Map(path_in, delim_in, size):
+    """
+    Build a zone map of the input file. Write the zone map to its sidecar file
+    if possible, and return it.
+    
+    The zone map is a list of 2 elements:
+        1) The number of lines in each block.
+        2) A list of blocks. Each block is a list of 3 elements:
+            1) The position of the start of the first line of the block.
+            2) The number of lines in the block.
+            3) A list of the statistics for each column, as produced by
+                    Update_Column_Stats.
+    
+    Build_Zone_Map(str, str, int) -> [int, list<[int, int, list<list>]>]
+    """
+    fingerprint = Get_File_Fingerprint(path_in)
+    blocks = []
+    r = open(path_in, "U")
+    position = r.tell()
+    line = r.readline()
+    count = 0
+    while line:
+        if count % size == 0:
+            stats = []
+            block = [position, 0, stats]
+            blocks.append(block)
+        data = Parse_Line(line, delim_in)
+        while len(stats) < len(data): stats.append(Create_Column_Stats())
+        for i in range(len(data)): Update_Column_Stats(stats[i], data[i])
+        block[1] += 1
+        count += 1
+        position = r.tell()
+        line = r.readline()
+    r.close()
+    try:
+        w = open(Get_Zone_Map_Path(path_in), "w")
+        w.write("T2T_ZONE_MAP_2\t" + fingerprint + "\t" +
+                delim_in.encode("hex") + "\t" + str(size) + "\n")
+        for block in blocks: w.write(json.dumps(block) + "\n")
+        w.close()
+    except IOError:
+        pass # The zone map can still be used for this run
+    return [size, blocks]
+
+def Load_Zone_Map(path_in, delim_in):
+    """
+    Load the zone map of the input file from its sidecar file.
+    Return an empty list if there is no such file, if it is out of date, or if
+    it was built using a different delimiter.
+    See Build_Zone_Map for the format of the zone map.
+    
+    Load_Zone_Map(str, str) -> [int, list<[int, int, list<list>]>]
+    Load_Zone_Map(str, str) -> []
+    """
+    try:
+        r = open(Get_Zone_Map_Path(path_in), "r")
+    except IOError:
+        return []
+    values = r.readline().rstrip("\n").split("\t")
+    fingerprint = "\t".join(values[1:3])
+    if (values[0] != "T2T_ZONE_MAP_2" or len(values) != 5 or
+            fingerprint != Get_File_Fingerprint(path_in) or
+            values[3] != delim_in.encode("hex")):
+        r.close()
+        return []
+    blocks = [json.loads(line) for line in r]
+    r.close()
+    return [int(values[4]), blocks]
+
+def Get_Zone_Map(path_in, delim_in, size):
+    """
+    Return the zone map of the input file with the specified block size,
+    loading it from its sidecar file if it is up-to-date and building it
+    otherwise.
+    
+    Get_Zone_Map(str, str, int) -> [int, list<[int, int, list<list>]>]
+    """
+    zone_map = Load_Zone_Map(path_in, delim_in)
+    if zone_map and zone_map[0] == size: return zone_map
+    return Build_Zone_Map(path_in, delim_in, size)
+
+def Get_Value_Index_Path(path_in, col):
+    """
+    Return the filepath of the value index for the specified column of the
+    input file.
+    
+    Get_Value_Index_Path(str, int) -> str
+    """
+    return path_in + ".t2tv" + str(col)
+
+def Get_Value_Index_Key(value, sort_type):
+    """
+    Return the key used to sort a value in a value index. Numbers in a numerical
+    index are sorted before all values which are not numbers.
+    
+    Get_Value_Index_Key(str, int) -> (int, int/float/str)
+    """
+    try:
+        return (0, Get_Sort_Value(value, sort_type))
+    except ValueError:
+        return (1, value)
+
+def Build_Value_Index(path_in, delim_in, headers, col, sort_type):
+    """
+    Build a value index for a column of the input file, and write it to its
+    sidecar file.
+    
+    Each line of the value index, after the first, consists of a value from the
+    column, the row number of the row of data it came from, and the position of
+    the start of that row, separated by tabs. The lines are sorted by value, and
+    then by row number.
+    
+    @path_in
+            (str - filepath)
+            The filepath of the input file.
+    @delim_in
+            (str)
+            The delimiter use by the input file.
+    @headers
+            (list<[int,int,str/int]>)
+            See Table_To_Table for details.
+    @col
+            (int)
+            The column number. (index-1 system)
+    @sort_type
+            (int)
+            An integer denoting the sort type:
+                1:  NUM
+                2:  STR
+    
+    Build_Value_Index(str, str, list<[int,int,str/int]>, int, int) -> None
+    """
+    fingerprint = Get_File_Fingerprint(path_in)
+    path_index = Get_Value_Index_Path(path_in, col)
+    
+    # Move to the start of the first row of data
+    r = open(path_in, "U")
+    header_count = Process_Headers(r, None, headers, delim_in, "", [])[1]
+    r.seek(0)
+    for i in range(header_count): r.readline()
+    
+    # Sort the records into a temporary file
+    total = [0]
+    def Iterate_Records():
+        position = r.tell()
         line = r.readline()
+        while line:
+            total[0] += 1
+            data = Parse_Line(line, delim_in)
+            if col > len(data): value = "" # A row without the column
+            else: value = data[col - 1]
+            yield value + "\t" + str(total[0]) + "\t" + str(position) + "\n"
+            position = r.tell()
+            line = r.readline()
+    get_key = lambda record: Get_Value_Index_Key(record.rsplit("\t", 2)[0],
+            sort_type)
+    w = open(path_index + ".tmp", "w")
+    w.writelines(Sort_Externally(Iterate_Records(), get_key))
+    w.close()
+    r.close()
+    
+    # Write the header line, then the records
+    w = open(path_index, "w")
+    w.write("T2T_VALUE_INDEX\t" + fingerprint + "\t" + delim_in.encode("hex") +
+            "\t" + str(header_count) + "\t" + str(total[0]) + "\t" +
+            str(sort_type) + "\n")
+    f = open(path_index + ".tmp", "r")
+    shutil.copyfileobj(f, w)
+    f.close()
+    w.close()
+    os.remove(path_index + ".tmp")
+
+def Load_Value_Index_Header(path_in, delim_in, header_count, col):
+    """
+    Open the value index for a column of the input file and read its header
+    line. Return a list containing the index file, positioned at the start of
+    the first record, the total number of rows of data, and the sort type.
+    Return an empty list if there is no such index, or if it is out of date.
+    
+    Load_Value_Index_Header(str, str, int, int) -> [file, int, int]
+    Load_Value_Index_Header(str, str, int, int) -> []
+    """
+    try:
+        f = open(Get_Value_Index_Path(path_in, col), "r")
+    except IOError:
+        return []
+    values = f.readline().rstrip("\n").split("\t")
+    fingerprint = "\t".join(values[1:3])
+    if (values[0] != "T2T_VALUE_INDEX" or len(values) != 7 or
+            fingerprint != Get_File_Fingerprint(path_in) or
+            values[3] != delim_in.encode("hex") or
+            values[4] != str(header_count)):
+        f.close()
+        return []
+    return [f, int(values[5]), int(values[6])]
+
+def Get_Value_Index(path_in, delim_in, headers, header_count, col, sort_type):
+    """
+    Build a value index for a column of the input file, unless an up-to-date
+    one with the same sort type already exists.
+    
+    Get_Value_Index(str, str, list<[int,int,str/int]>, int, int, int) -> None
+    """
+    index = Load_Value_Index_Header(path_in, delim_in, header_count, col)
+    if index:
+        index[0].close()
+        if index[2] == sort_type: return
+    Build_Value_Index(path_in, delim_in, headers, col, sort_type)
+
+def Find_Value_Index_Rows(path_in, delim_in, header_count, inc_filters):
+    """
+    Use an up-to-date value index, for the first column with usable inclusion
+    criteria, to find the rows of data which may satisfy those criteria.
+    
+    Return a list containing the column number, the total number of rows of
+    data, and a list of the row numbers and positions of the rows which may
+    satisfy the criteria, sorted by row number.
+    Return an empty list if no value index can be used, or if more than
+    MAX_RECORDS_IN_MEMORY rows match.
+    
+    Find_Value_Index_Rows(str, str, int, list<int, int, str/int/float>) ->
+            [int, int, list<[int, int]>]
+    Find_Value_Index_Rows(str, str, int, list<int, int, str/int/float>) -> []
+    """
+    tried = set([])
+    for f_col, op, query in inc_filters:
+        if f_col in tried: continue
+        tried.add(f_col)
+        index = Load_Value_Index_Header(path_in, delim_in, header_count, f_col)
+        if not index: continue
+        f, total, sort_type = index
+        sorted_column = [1, SORT_ORDER.ASC, sort_type]
+        bounds = Get_Sort_Bounds(inc_filters, [f_col, SORT_ORDER.ASC,
+                sort_type])
+        if not bounds:
+            f.close()
+            continue
+        # Find the first record within the bounds
+        get_position = lambda l: Get_Sort_Position([l.rsplit("\t", 2)[0]],
+                sorted_column, bounds)
+        start = f.tell()
+        end = os.path.getsize(f.name)
+        f.seek(Bisect_Lines(f, start, end, lambda l: get_position(l) < 0))
+        # Collect the records within the bounds
+        rows = []
+        for line in f:
+            value, row, position = line.rsplit("\t", 2)
+            try:
+                Get_Sort_Value(value, sort_type)
+            except ValueError:
+                break # Values which are not numbers come last
+            p = get_position(line)
+            if p > 0: break
+            if p == 0: rows.append([int(row), int(position)])
+            if len(rows) > MAX_RECORDS_IN_MEMORY: break
+        f.close()
+        if len(rows) > MAX_RECORDS_IN_MEMORY: return []
+        rows.sort()
+        return [f_col, total, rows]
+    return []
+
+def Read_Index_Row(readfile, index_rows, total):
+    """
+    Read the next row of data found using a value index. Return the line and the
+    row number before it. Return an empty string and the total number of rows of
+    data once all the rows have been read.
+    
+    Read_Index_Row(file, iterator<[int, int]>, int) -> [str, int]
+    """
+    for row, position in index_rows:
+        readfile.seek(position)
+        return [readfile.readline(), row - 1]
+    return ["", total]
+
+def Sample_Reservoir(readfile, line, count, size, last_row):
+    """
+    Choose a uniform random sample of [size] of the remaining rows of
+    [readfile], using reservoir sampling. (Algorithm L) The number of rows to
+    skip before the next row which enters the sample is drawn directly, so the
+    rows skipped are only read, and not parsed.
+    Return the sample, as a list of the row number before each row and the
+    line, in the order of the rows in the file, and the number of the last row
+    read.
+    
+    @readfile
+            (file)
+            The input file.
+    @line
+            (str)
+            The first row to consider, which has already been read.
+    @count
+            (int)
+            The row number before [line].
+    @size
+            (int)
+            The number of rows in the sample.
+    @last_row
+            (int)
+            If non-zero, the last row to consider.
+    
+    Sample_Reservoir(file, str, int, int, int) -> [list<[int, str]>, int]
+    """
+    rand = random.Random(SAMPLE_SEED)
+    uniform = lambda: 1.0 - rand.random() # Never 0
+    reservoir = []
+    while line and len(reservoir) < size:
+        if last_row and count >= last_row: break
+        reservoir.append([count, line])
+        count += 1
+        line = readfile.readline()
+    weight = math.exp(math.log(uniform()) / size)
+    while line:
+        if weight < 1: skip = int(math.log(uniform()) / math.log(1 - weight))
+        else: skip = 0
+        while line and skip and not (last_row and count >= last_row):
+            count += 1
+            skip -= 1
+            line = readfile.readline()
+        if not line or (last_row and count >= last_row): break
+        reservoir[rand.randrange(size)] = [count, line]
+        count += 1
+        line = readfile.readline()
+        weight *= math.exp(math.log(uniform()) / size)
+    reservoir.sort()
+    return [reservoir, count]
+
+def Read_Sample_Row(sample_rows, total):
+    """
+    Read the next row of a sample chosen by Sample_Reservoir. Return the line
+    and the row number before it. Return an empty string and the total number
+    of rows read once all the rows have been read.
+    
+    Read_Sample_Row(iterator<[int, str]>, int) -> [str, int]
+    """
+    for count, line in sample_rows:
+        return [line, count]
+    return ["", total]
+
+def Sort_Externally(records, get_key):
+    """
+    A generator which yields [records] sorted by the keys returned by
+    [get_key]. The sort is stable.
+    
+    See External_Sort for details.
+    
+    @records
+            (iterable<str>)
+            The records to be sorted. Each record is a line of text, ending in a
+            newline character.
+    @get_key
+            (function)
+            A function which takes a record and returns its sort key.
+    
+    Sort_Externally(iterable<str>, function) -> generator<str>
+    """
+    sorter = External_Sort(get_key)
+    try:
+        for record in records: sorter.add(record)
+        for record in sorter.Iterate(): yield record
+    finally:
+        sorter.Close()
+
+def Get_Cache_Fingerprint(path, content_hash):
+    """
+    Return a string identifying the contents of a file for a result cache. This
+    is either made from the absolute filepath, size and modification time of the
+    file, or, if [content_hash] is True, from an MD5 hash of its contents, so
+    that identical files anywhere share the same cached outputs.
+    
+    Get_Cache_Fingerprint(str, bool) -> str
+    """
+    if not content_hash:
+        return os.path.abspath(path) + "\t" + Get_File_Fingerprint(path)
+    md5 = hashlib.md5()
+    f = open(path, "rb")
+    block = f.read(1048576)
+    while block:
+        md5.update(block)
+        block = f.read(1048576)
+    f.close()
+    return md5.hexdigest()
+
+def Get_Cache_Value(value):
+    """
+    Return a version of a part of a job specification which can be written in
+    JSON format. Queries are replaced by the values they were created from, and
+    strings are decoded as Latin-1, so that any bytes can be written.
+    
+    Get_Cache_Value(list/frozenset/Aho_Corasick/Regex_Query/str/int/float)
+            -> list/unicode/int/float
+    """
+    if type(value) in (list, tuple):
+        return [Get_Cache_Value(v) for v in value]
+    if type(value) == str: return value.decode("latin-1")
+    if type(value) == frozenset:
+        return ["in", Get_Cache_Value(sorted(value))]
+    if type(value) == Aho_Corasick:
+        goto = [sorted(d.items()) for d in value.goto]
+        return ["any", Get_Cache_Value(goto), value.output]
+    if type(value) == Regex_Query:
+        return ["re", Get_Cache_Value(value.regex.pattern)]
+    return value
+
+def Get_Cache_Key(paths, content_hash, spec):
+    """
+    Return the key of the output of a job in a result cache, made from the
+    fingerprints of the files read and the specification of the job.
+    
+    @paths
+            (list<str - filepath>)
+            The filepaths of the files read by the job.
+    @content_hash
+            (bool)
+            Whether the files are identified by a hash of their contents.
+    @spec
+            (list)
+            The normalized arguments of the job which affect its output.
+    
+    Get_Cache_Key(list<str>, bool, list) -> str
+    """
+    # The program itself is included, so a changed program recreates outputs
+    fingerprints = [Get_File_Fingerprint(__file__)]
+    for path in paths: fingerprints.append(Get_Cache_Fingerprint(path,
+            content_hash))
+    string = json.dumps([fingerprints, Get_Cache_Value(spec)], sort_keys = True)
+    return hashlib.md5(string).hexdigest()
+
+def Link_Or_Copy(path_from, path_to):
+    """
+    Hard link [path_to] to the file at [path_from] if CACHE_HARD_LINKS is True
+    and the file system allows it. Otherwise, copy the file.
+    
+    Link_Or_Copy(str, str) -> None
+    """
+    if CACHE_HARD_LINKS:
+        try:
+            os.link(path_from, path_to)
+            return
+        except (OSError, AttributeError): # Another file system, or no support
+            pass
+    shutil.copyfile(path_from, path_to)
+
+def Get_Cached_Output(cache_dir, key, path_out):
+    """
+    Write the cached output with [key] to [path_out], replacing any existing
+    file, and mark it as the most recently used output in the cache.
+    Return True if the output was in the cache. Return False otherwise.
+    
+    Get_Cached_Output(str, str, str) -> bool
+    """
+    path_cache = os.path.join(cache_dir, key)
+    if not os.path.isfile(path_cache): return False
+    os.utime(path_cache, None)
+    if os.path.exists(path_out): os.remove(path_out)
+    Link_Or_Copy(path_cache, path_out)
+    return True
+
+def Add_Cached_Output(cache_dir, key, path_out):
+    """
+    Add the output at [path_out] to the cache with [key], and then remove the
+    least recently used outputs until the cache is no larger than
+    CACHE_MAX_BYTES.
+    
+    Add_Cached_Output(str, str, str) -> None
+    """
+    if not os.path.isdir(cache_dir): os.makedirs(cache_dir)
+    path_cache = os.path.join(cache_dir, key)
+    path_temp = path_cache + ".tmp"
+    if os.path.exists(path_temp): os.remove(path_temp)
+    Link_Or_Copy(path_out, path_temp)
+    if os.path.exists(path_cache): os.remove(path_cache)
+    os.rename(path_temp, path_cache)
+    os.utime(path_cache, None)
+    Trim_Cache(cache_dir, CACHE_MAX_BYTES)
+
+def Trim_Cache(cache_dir, max_bytes):
+    """
+    Remove the least recently used outputs from a result cache until their
+    total size is no more than [max_bytes]. The cached outputs are the files
+    in [cache_dir] named after their 32-character keys, and their modification
+    times record when they were last used.
+    
+    Trim_Cache(str, int) -> None
+    """
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        if len(name) != 32 or name.strip("0123456789abcdef"): continue
+        path = os.path.join(cache_dir, name)
+        size = os.path.getsize(path)
+        entries.append([os.path.getmtime(path), name, size])
+        total += size
+    entries.sort()
+    for mtime, name, size in entries:
+        if total <= max_bytes: break
+        os.remove(os.path.join(cache_dir, name))
+        total -= size
+
+
+
+def Get_State_Path(path_out):
+    """
+    Return the filepath of the state of an incremental run for the output file.
+    
+    Get_State_Path(str) -> str
+    """
+    return path_out + ".state.json"
 
-    # Finish
-    w.close()
-    r.close()
+def Get_Journal_Path(state_path):
+    """
+    Return the filepath of the journal which accompanies the state file at
+    [state_path], to which the combinations of values recorded for -n in an
+    exact set are appended. (See Save_State)
+    
+    Get_Journal_Path(str) -> str
+    """
+    return os.path.splitext(state_path)[0] + ".keys"
 
-    # Metrics Reporting
-    s_total, s_passed = Ints_To_Aligned_Strings(
-            [count_total, count_passed], ALIGN.RIGHT)
-    s_percentage = Get_Percentage_String(count_passed, count_total, 2, 6)
+def Get_Job_Hash(delim_in, delim_out, columns, inc_filters, exc_filters,
+            headers, novel_unique, novel_unique_method, join):
+    """
+    Return an MD5 hash of the arguments of Table_To_Table which determine how
+    each row is processed, which is used to check that an incremental run
+    continues the same job.
+    
+    Get_Job_Hash(str, str, list<int>, list, list, list, list<int>, list, list)
+            -> str
+    """
+    spec = [delim_in, delim_out, columns, inc_filters, exc_filters, headers,
+            novel_unique, novel_unique_method, (join or [])[1:]]
+    string = json.dumps(Get_Cache_Value(spec), sort_keys = True)
+    return hashlib.md5(string).hexdigest()
 
-    printM(STR__metrics_lines.format(N = s_total))
-    printM(STR__metrics_passed.format(N = s_passed, P = s_percentage))
-    # Exit
-    printP(STR__t2t_complete)
-    return 0
+def Get_Prefix_Hash(path, length):
+    """
+    Return an MD5 hash of the first [length] bytes of a file.
+    
+    Get_Prefix_Hash(str, int) -> str
+    """
+    f = open(path, "rb")
+    string = f.read(length)
+    f.close()
+    return hashlib.md5(string).hexdigest()
 
+def Get_Combinations_State(recorded):
+    """
+    Return the contents of a container created by Create_Recorded_Combinations,
+    in a form which can be written in JSON format. For a Bloom filter, this is
+    its bits in hexadecimal and the number of bits set. Otherwise, it is a list
+    of the combinations of values held, in the order they were added, with the
+    values decoded as Latin-1.
+    
+    Get_Combinations_State(set/Bloom_Filter/Window_Rows/Window_Keys/
+            Previous_Key) -> list
+    """
+    if isinstance(recorded, Bloom_Filter):
+        return [str(recorded.bits).encode("hex"), recorded.bits_set]
+    if isinstance(recorded, Window_Rows): items = recorded.queue
+    elif isinstance(recorded, Window_Keys): items = recorded.keys
+    elif isinstance(recorded, Previous_Key):
+        items = [recorded.key] if recorded.key else []
+    else: items = recorded
+    result = []
+    for item in items:
+        if item is True: continue # No novel unique columns
+        result.append([value.decode("latin-1") for value in item])
+    return result
 
+def Load_Combinations_State(recorded, state):
+    """
+    Restore the contents of a new container created by
+    Create_Recorded_Combinations from [state], as returned by
+    Get_Combinations_State.
+    
+    Load_Combinations_State(set/Bloom_Filter/Window_Rows/Window_Keys/
+            Previous_Key, list) -> None
+    """
+    if isinstance(recorded, Bloom_Filter):
+        recorded.bits = bytearray(state[0].decode("hex"))
+        recorded.bits_set = state[1]
+        return
+    for item in state:
+        recorded.add(tuple([value.encode("latin-1") for value in item]))
+
+def Load_State(state_path, path_in, path_out, job):
+    """
+    Load and return the state of an incremental run, as written by Save_State.
+    Return an empty dictionary if there is no state file, in which case the
+    run starts from the beginning of the input file.
+    Return None if the state does not belong to the same job, or the input or
+    output file no longer begins with what was already processed or written.
+    
+    Load_State(str, str, str, str) -> dict
+    Load_State(str, str, str, str) -> None
+    """
+    if not os.path.exists(state_path): return {}
+    f = open(state_path, "U")
+    state = json.load(f)
+    f.close()
+    if state["job"] != job: return None
+    if os.path.getsize(path_in) < state["offset"]: return None
+    if state["prefix_md5"] != Get_Prefix_Hash(path_in, state["prefix_bytes"]):
+        return None
+    if not os.path.exists(path_out) or (os.path.getsize(path_out) <
+            state["output_bytes"]):
+        return None
+    journal_bytes = state.get("journal_bytes", 0)
+    journal_path = Get_Journal_Path(state_path)
+    if journal_bytes and (not os.path.exists(journal_path) or
+            os.path.getsize(journal_path) < journal_bytes):
+        return None
+    return state
+
+def Save_State(state_path, state, path_in, offset, writefile, recorded,
+            added):
+    """
+    Write the state of an incremental run to [state_path], in JSON format.
+    [state] contains the job hash, the header count and the row counts, and is
+    updated with the byte offset in the input file which processing stopped at,
+    a hash of the start of the input file, the size of the output file once
+    flushed, and the combinations of values recorded so far.
+    
+    An exact set of combinations only grows, so rather than writing all of it
+    each time, [added], the combinations recorded since the state was last
+    saved, are appended to the journal (See Get_Journal_Path), and its size is
+    saved instead. [added] is then emptied. For the other containers, which
+    are of a fixed size, [added] is None.
+    
+    The output file and journal are flushed to disk first, and the state is
+    written to a temporary file which then replaces the previous state, so the
+    state file always describes a consistent point even if the program is
+    killed.
+    
+    Save_State(str, dict, str, int, file, set/Bloom_Filter/Window_Rows/
+            Window_Keys/Previous_Key, list<tuple<str>>/None) -> None
+    """
+    writefile.flush()
+    os.fsync(writefile.fileno())
+    prefix_bytes = min(offset, STATE_PREFIX_BYTES)
+    state["offset"] = offset
+    state["prefix_bytes"] = prefix_bytes
+    state["prefix_md5"] = Get_Prefix_Hash(path_in, prefix_bytes)
+    state["output_bytes"] = writefile.tell()
+    if added is None:
+        state["combinations"] = Get_Combinations_State(recorded)
+        state["journal_bytes"] = 0
+    else:
+        state["combinations"] = []
+        state["journal_bytes"] = Append_Journal(Get_Journal_Path(state_path),
+                added)
+    keys = ["job", "offset", "prefix_bytes", "prefix_md5", "output_bytes",
+            "header_count", "count_total", "count_passed", "combinations",
+            "journal_bytes"]
+    path_temp = state_path + ".tmp"
+    w = open(path_temp, "w")
+    json.dump(collections.OrderedDict([[k, state[k]] for k in keys]), w,
+            indent = 1, separators = (",", ": "))
+    w.write("\n")
+    w.flush()
+    os.fsync(w.fileno())
+    w.close()
+    Replace_File(path_temp, state_path)
 
-def Process_Header(line, action, writefile, delim_in, delim_out, columns):
+def Append_Journal(journal_path, added):
     """
-    Process the line according to the action specified.
+    Append the combinations of values in [added] to the journal at
+    [journal_path], one per line in JSON format, with the values decoded as
+    Latin-1, then empty [added]. Return the size of the journal once flushed to
+    disk.
+    
+    Append_Journal(str, list<tuple<str>>) -> int
+    """
+    w = open(journal_path, "ab")
+    w.seek(0, 2)
+    for item in added:
+        w.write(json.dumps([value.decode("latin-1") for value in item]) + "\n")
+    w.flush()
+    os.fsync(w.fileno())
+    size = w.tell()
+    w.close()
+    del added[:]
+    return size
 
-    If [action] is 1 (KRS.KEEP), then write [line] to [writefile] as is.
+def Load_Journal(journal_path, recorded, journal_bytes):
+    """
+    Add the combinations of values in the first [journal_bytes] bytes of the
+    journal at [journal_path] to the exact set [recorded]. Anything appended to
+    the journal after the state was saved is discarded.
+    
+    Load_Journal(str, set, int) -> None
+    """
+    f = open(journal_path, "r+b")
+    for line in f.read(journal_bytes).splitlines():
+        recorded.add(tuple([value.encode("latin-1")
+                for value in json.loads(line)]))
+    f.truncate(journal_bytes)
+    f.close()
+
+def Replace_File(path_temp, path):
+    """
+    Rename the file at [path_temp] to [path], replacing any file already there.
+    
+    Replace_File(str, str) -> None
+    """
+    try:
+        os.rename(path_temp, path)
+    except OSError: # Windows does not replace existing files
+        os.remove(path)
+        os.rename(path_temp, path)
 
-    If [action] is 2 (KRS.SKIP), then the line is ignored.
+def Seek_Line_End(readfile, offset):
+    """
+    Move to [offset] in [readfile], which is at the end of a line. If the line
+    ended in a carriage return, a line feed which follows it is skipped, so a
+    line ending written in two parts is not read as an extra, empty line.
+    
+    Seek_Line_End(file, int) -> None
+    """
+    if not offset:
+        readfile.seek(0)
+        return
+    readfile.seek(offset - 1)
+    readfile.readline() # The end of the previous line
 
-    If [action] is 3 (KRS.READ), then the contents of [line] are parsed using
-    [delim_in] and rearranged according to [delim_out] and [columns], before
-    being written to [writefile].
+def Has_Headers(readfile, headers, delim_in, follow):
+    """
+    Return True if the header lines at the start of [readfile] are complete,
+    which is once a complete line follows them. Return False otherwise. If
+    [follow] is True, wait until they are complete, unless interrupted.
+    [readfile] is left at the start of the file.
+    
+    Has_Headers(file, list<[int,int,str/int]>, str, bool) -> bool
+    """
+    while True:
+        line = Process_Headers(readfile, None, headers, delim_in, delim_in,
+                [])[0]
+        readfile.seek(0)
+        if line.endswith("\n") or not follow: return line.endswith("\n")
+        try:
+            time.sleep(FOLLOW_INTERVAL)
+        except KeyboardInterrupt:
+            return False
 
-    Return 0 if the operation was carried out without problem.
-    Return 1 if there was a problem.
+def Follow_Lines(readfile, line, path_in, writefile, state_path, state,
+            recorded, added):
+    """
+    Wait for a complete line to be appended to the input file, in the manner of
+    "tail -f", and return it. [line] is the incomplete line at the end of the
+    file, if any. The state is saved before waiting, and the file is checked
+    every FOLLOW_INTERVAL seconds.
+    Return an empty string if the user interrupts the wait, or the input file
+    is truncated, leaving [readfile] at the start of the incomplete line.
+    
+    Follow_Lines(file, str, str, file, str, dict, set/Bloom_Filter/
+            Window_Rows/Window_Keys/Previous_Key, list<tuple<str>>/None) -> str
+    """
+    offset = readfile.tell() - len(line)
+    Save_State(state_path, state, path_in, offset, writefile, recorded, added)
+    size = os.path.getsize(path_in)
+    try:
+        while True:
+            time.sleep(FOLLOW_INTERVAL)
+            new_size = os.path.getsize(path_in)
+            if new_size < offset: break # Truncated or replaced
+            if new_size == size: continue
+            size = new_size
+            Seek_Line_End(readfile, offset)
+            line = readfile.readline()
+            if line.endswith("\n"): return line
+    except KeyboardInterrupt:
+        pass
+    readfile.seek(offset)
+    return ""
+
+
+
+def Create_Column_Stats():
+    """
+    Return a new list of statistics for a column of data, with the elements:
+        1) The number of values.
+        2) The number of empty values.
+        3) The number of non-empty values which are not numbers, including
+                NaN, which no numerical criteria is met by.
+        4) The smallest number. (None if there are no numbers)
+        5) The largest number. (None if there are no numbers)
+    
+    Create_Column_Stats() -> [int, int, int, int/float, int/float]
+    """
+    return [0, 0, 0, None, None]
 
-    @line
-            (str)
-            A line from the input file that needs to be processed different from
-            the rest of the tabulated data.
-    @action
-            (int) - Pseudo ENUM
-            An int which signifies the action which needs to be taken:
-                1: Keep the line as is
-                2: Skip the line
-                3: Rearrange the contents of the line
-    @writefile
-            (file)
-            The file to which the output is written.
-    @delim_in
-            (str)
-            The delimiter use by the input file. 
-    @delim_out
-            (str)
-            The delimiter use by the output file.
-    @columns
-            (list<int>)
-            An list of the columns to be retained from the input file, in that
-            specified order.
-            Uses the 1-index system. (The first column's index number is 1)
+def Update_Column_Stats(stats, value):
+    """
+    Update a list of statistics for a column of data, as created by
+    Create_Column_Stats, with a value from that column.
     
-    Process_Header(str, int, file, str, str, list<int>) -> int
+    Update_Column_Stats([int, int, int, int/float, int/float], str) -> None
     """
-    if action == KSR.KEEP: # Keep
-        writefile.write(line)
-        return 0
-    elif action == KSR.SKIP: # Skip
-        return 0
-    elif action == KSR.REAR: # Rearrange
-        values = Parse_Line(line, delim_in)
-        line = Create_Output(values, columns, delim_out)
-        writefile.write(line)
-        return 0
-    return 1
+    stats[0] += 1
+    if not value:
+        stats[1] += 1
+        return
+    try:
+        try:
+            n = int(value)
+        except:
+            n = float(value)
+    except:
+        stats[2] += 1
+        return
+    if n != n: # NaN
+        stats[2] += 1
+        return
+    if stats[3] is None or n < stats[3]: stats[3] = n
+    if stats[4] is None or n > stats[4]: stats[4] = n
+
+def Can_Skip_Block(block, inc_filters, exc_filters):
+    """
+    Return True if the statistics of a block of rows show that none of the rows
+    in the block can be accepted by the filtering criteria. Return False
+    otherwise.
+    
+    A block can only be skipped on the basis of a column if every row in the
+    block has a number in that column.
+    
+    Can_Skip_Block([int, int, list<list>], list<int, int, str/int/float>,
+            list<int, int, str/int/float>) -> bool
+    """
+    position, count, stats = block
+    for col, op, query in inc_filters:
+        if col > len(stats): continue
+        present, empty, non_numeric, low, high = stats[col - 1]
+        if present < count or empty or non_numeric or low is None: continue
+        if op == OP.GREATER_THAN and high <= query: return True
+        if op == OP.GREAQUALS and high < query: return True
+        if op == OP.LESS_THAN and low >= query: return True
+        if op == OP.LEQUALS and low > query: return True
+        if op in [OP.EQUALS__INT, OP.EQUALS__FLOAT]:
+            if query < low or query > high: return True
+    for col, op, query in exc_filters: # Every row meets the criteria
+        if col > len(stats): continue
+        present, empty, non_numeric, low, high = stats[col - 1]
+        if present < count or empty or non_numeric or low is None: continue
+        if op == OP.GREATER_THAN and low > query: return True
+        if op == OP.GREAQUALS and low >= query: return True
+        if op == OP.LESS_THAN and high < query: return True
+        if op == OP.LEQUALS and high <= query: return True
+    return False
 
 
 
@@ -661,25 +5354,30 @@ def Parse_Line(line, delim):
 
 
 
-def Create_Output(data, columns, delim):
+def Create_Output(data, columns, delim, joined=None):
     """
     Take a list of data values, a list of column numbers and a delimiter and
     produce a string intended to be written to an output table file.
     The list of column numbers determines which values from [data] are kept, and
     in what order.
     The columns use a 1-index system.
+    Negative column numbers denote the columns of [joined], the values from the
+    row of a lookup table. Ex. -1 for the first value in [joined].
     
-    Create_Output(list<str>, list<int>, str) -> str
+    Create_Output(list<str>, list<int>, str, list<str>) -> str
     """
     first = columns[0]
     others = columns[1:]
 
     if first == 0: sb = ""
+    elif first < 0: sb = Get_Joined_Value(joined, first)
     else: sb = data[first - 1]
     
     for i in others:
         if i == 0:
             sb += (delim + "")
+        elif i < 0:
+            sb += (delim + Get_Joined_Value(joined, i))
         else:
             sb += (delim + data[i - 1])
 
@@ -689,6 +5387,19 @@ def Create_Output(data, columns, delim):
 
 
 
+def Get_Joined_Value(joined, column):
+    """
+    Return the value from the row of a lookup table for a negative column
+    number. Return an empty string if there is no such value.
+    
+    Get_Joined_Value(list<str>, int) -> str
+    """
+    i = -column - 1
+    if joined and i < len(joined): return joined[i]
+    return ""
+
+
+
 def Filter(data, inc_filters, exc_filters):
     """
     Take a list of data values, and 2 lists of filtering criteria. Return True
@@ -745,9 +5456,17 @@ def Filter_Single(data, criteria):
             10: NOT_EQUAL (int)
             11: EQUALS (float)
             12: NOT_EQUAL (float)
-        3) The string/substring/cutoff used for filtering.
+            13: IN
+            14: CONTAINS_ANY
+            15: NOT_CONTAIN_ANY
+            16: MATCHES
+            17: NOT_MATCH
+        3) The string/substring/cutoff used for filtering, the set of strings
+                for IN, the Aho_Corasick automaton for CONTAINS_ANY and
+                NOT_CONTAIN_ANY, or the Regex_Query for MATCHES and NOT_MATCH.
     
-    Filter(list<str>, [int, int, str/int/float]) -> bool
+    Filter(list<str>, [int, int, str/int/float/set<str>/Aho_Corasick/
+            Regex_Query]) -> bool
     """
     col, op, query = criteria
     col = col - 1
@@ -768,6 +5487,26 @@ def Filter_Single(data, criteria):
         if query not in data[col]: return True
         return False
     
+    elif op == OP.IN:
+        if data[col] in query: return True
+        return False
+    
+    elif op == OP.CONTAINS_ANY:
+        if query.Search(data[col]): return True
+        return False
+    
+    elif op == OP.NOT_CONTAIN_ANY:
+        if not query.Search(data[col]): return True
+        return False
+    
+    elif op == OP.MATCHES:
+        if query.Search(data[col]): return True
+        return False
+    
+    elif op == OP.NOT_MATCH:
+        if not query.Search(data[col]): return True
+        return False
+    
     elif op == OP.GREATER_THAN:
         try:
             d = int(data[col])
@@ -845,14 +5584,463 @@ def Filter_Novel_Uniques(data, recorded_combinations, novel_unique):
         (list<int>)
         A list of column numbers. (0-index)
     
-    Filter_Novel_Uniques(list<str>, set<tuple<str...>>, list<int>) ->
-            tuple<str...>
+    Filter_Novel_Uniques(list<str>, set<tuple<str...>>, list<int>) ->
+            tuple<str...>
+    """
+    temp = []
+    for i in novel_unique: temp.append(data[i])
+    temp = tuple(temp)
+    if temp in recorded_combinations: return ()
+    return temp
+
+
+
+def Create_Recorded_Combinations(novel_unique_method):
+    """
+    Create and return the container used to record the combinations of values
+    which have been seen so far, according to [novel_unique_method].
+    
+    The container supports the "in" operator and the add() method, in the same
+    manner as a set.
+    
+    @novel_unique_method
+        (list<int,...>)
+        A list whose first element is an integer denoting the method. See
+        Table_To_Table for details. If empty or None, an exact set is used.
+    
+    Create_Recorded_Combinations(list<int,...>) ->
+            set/Bloom_Filter/Window_Rows/Window_Keys
+    """
+    if not novel_unique_method: return set([])
+    method = novel_unique_method[0]
+    if method == DEDUPE.BLOOM:
+        expected_count, fp_rate = novel_unique_method[1:3]
+        return Bloom_Filter(expected_count, fp_rate)
+    elif method == DEDUPE.WINDOW_ROWS:
+        return Window_Rows(novel_unique_method[1])
+    elif method == DEDUPE.WINDOW_KEYS:
+        return Window_Keys(novel_unique_method[1])
+    elif method == DEDUPE.PREVIOUS:
+        return Previous_Key()
+    return set([])
+
+
+
+def Iterate_Global_Uniques(path_in, delim_in, headers, global_unique):
+    """
+    A generator which yields, in ascending order, the row numbers of the rows of
+    data whose combination of values in [global_unique] appears exactly once in
+    the input file. Rows of data are numbered from 1, after the header lines.
+    
+    The combinations of values are counted in memory. If there are more than
+    MAX_RECORDS_IN_MEMORY of them, they are instead partitioned by their hash
+    into temporary files, each of which is then counted separately. The row
+    numbers from each partition are merged back into order.
+    
+    @path_in
+            (str - filepath)
+            The filepath of the input file.
+    @delim_in
+            (str)
+            The delimiter use by the input file.
+    @headers
+            (list<[int,int,str/int]>)
+            See Table_To_Table for details.
+    @global_unique
+            (list<int>)
+            A list of column numbers. (1-index)
+    
+    Iterate_Global_Uniques(str, str, list<[int,int,str/int]>, list<int>) ->
+            generator<int>
+    """
+    cols = [i - 1 for i in global_unique]
+    size = max(1, os.path.getsize(path_in))
+    temp_dir = None
+    try:
+        # Count the combinations of values
+        r = open(path_in, "U")
+        line = Process_Headers(r, None, headers, delim_in, "", [])[0]
+        seen = {} # Key: row number of first occurrence, or 0 if not unique
+        partitions = []
+        row = 0
+        while line:
+            row += 1
+            data = Parse_Line(line, delim_in)
+            key = tuple([data[i] for i in cols])
+            if partitions:
+                p = partitions[hash(key) % len(partitions)]
+                p.write(str(row) + delim_in + delim_in.join(key) + "\n")
+            elif key in seen:
+                seen[key] = 0
+            else:
+                seen[key] = row
+                if len(seen) > MAX_RECORDS_IN_MEMORY: # Spill to partitions
+                    estimate = (len(seen) * size) / max(1, r.tell())
+                    count = (estimate // MAX_RECORDS_IN_MEMORY) + 2
+                    count = min(MAX_PARTITIONS, count)
+                    temp_dir = tempfile.mkdtemp(dir = TEMP_DIR)
+                    for i in range(count):
+                        path = os.path.join(temp_dir, "part_" + str(i))
+                        partitions.append(open(path, "w"))
+                    for key, first in seen.iteritems():
+                        p = partitions[hash(key) % count]
+                        p.write(str(first) + delim_in + delim_in.join(key) +
+                                "\n")
+                    seen = {}
+            line = r.readline()
+        r.close()
+        
+        # All counted in memory
+        if not partitions:
+            rows = sorted([i for i in seen.itervalues() if i])
+            seen = None
+            for i in rows: yield i
+            return
+        
+        # Count each partition separately
+        runs = []
+        for p in partitions:
+            p.close()
+            seen = {}
+            f = open(p.name, "r")
+            for line in f:
+                values = line[:-1].split(delim_in)
+                key = tuple(values[1:])
+                if key in seen: seen[key] = 0
+                else: seen[key] = int(values[0])
+            f.close()
+            os.remove(p.name)
+            rows = sorted([i for i in seen.itervalues() if i])
+            seen = None
+            f = open(p.name + ".rows", "w")
+            for i in rows: f.write(str(i) + "\n")
+            f.close()
+            runs.append(open(p.name + ".rows", "r"))
+        
+        # Merge the row numbers from each partition
+        for i in heapq.merge(*[(int(x) for x in f) for f in runs]): yield i
+        for f in runs: f.close()
+    finally:
+        if temp_dir: shutil.rmtree(temp_dir, True)
+
+
+
+def Is_Sorted_Prefix(novel_unique, sorted_columns):
+    """
+    Return True if the columns in [novel_unique] are the same as the leading
+    columns in [sorted_columns], and are all sorted lexically, in which case
+    rows with the same combination of values in [novel_unique] are adjacent to
+    each other in a sorted file. (Numerically sorted columns only make equal
+    numbers adjacent, such as "1" and "1.0", not identical strings)
+    Return False otherwise.
+    
+    @novel_unique
+        (list<int>)
+        A list of column numbers. (1-index)
+    @sorted_columns
+        (list<[int,int,int]>)
+        See Table_To_Table for details.
+    
+    Is_Sorted_Prefix(list<int>, list<[int,int,int]>) -> bool
+    """
+    unique = set(novel_unique)
+    if not unique or len(unique) > len(sorted_columns): return False
+    prefix = sorted_columns[:len(unique)]
+    for col, order, sort_type in prefix:
+        if sort_type != SORT_TYPE.STR: return False
+    return unique == set([c[0] for c in prefix])
+
+
+
+def Get_Sort_Value(value, sort_type):
+    """
+    Return the value used to compare [value] according to [sort_type]. Numbers
+    are returned as ints or floats, while strings are returned as is.
+    Raise a ValueError if a number is expected and [value] is not a number.
+    
+    Get_Sort_Value(str, int) -> int/float/str
+    """
+    if sort_type == SORT_TYPE.NUM:
+        try:
+            return int(value)
+        except:
+            return float(value)
+    return value
+
+def Get_Sort_Key(data, sorted_columns):
+    """
+    Return a list of the values used to compare [data] according to the sort
+    columns.
+    Return an empty list if [data] lacks a column, or if a numerically sorted
+    column does not contain a number.
+    
+    Get_Sort_Key(list<str>, list<[int,int,int]>) -> list<int/float/str>
+    """
+    result = []
+    try:
+        for col, order, sort_type in sorted_columns:
+            result.append(Get_Sort_Value(data[col - 1], sort_type))
+    except (IndexError, ValueError):
+        return []
+    return result
+
+def Get_Partition_Columns(path_out):
+    """
+    Return a list of the column numbers included in the output filepath, in the
+    form "{colN}". (1-index)
+    Return an empty list if there are none.
+    
+    Get_Partition_Columns(str) -> list<int>
+    """
+    return [int(i) for i in re.findall(STR__partition_pattern, path_out)]
+
+def Get_SQL_Default_Names(columns, aggregates):
+    """
+    Return the default names of the columns of an SQLite table, named after the
+    column numbers and the aggregate functions.
+    
+    Get_SQL_Default_Names(list<int>, list<[int,int]>) -> list<str>
+    """
+    names = []
+    for col in columns:
+        if col < 0: names.append("j" + str(-col))
+        else: names.append("col" + str(col))
+    functions = {AGGREGATE.COUNT: "count", AGGREGATE.SUM: "sum",
+            AGGREGATE.MIN: "min", AGGREGATE.MAX: "max", AGGREGATE.MEAN: "mean"}
+    for function, col in aggregates or []:
+        if function == AGGREGATE.COUNT: names.append("count")
+        else: names.append(functions[function] + "_col" + str(col))
+    return names
+
+def Get_SQL_Names(names):
+    """
+    Return the column names for an SQLite table, replacing empty names with
+    the column number and making duplicate names unique.
+    
+    Get_SQL_Names(list<str>) -> list<str>
+    """
+    result = []
+    used = set()
+    for i, name in enumerate(names):
+        if not name: name = "c" + str(i + 1)
+        unique = name
+        n = 1
+        while unique.lower() in used:
+            n += 1
+            unique = name + "_" + str(n)
+        used.add(unique.lower())
+        result.append(unique)
+    return result
+
+def Quote_SQL_Name(name):
+    """
+    Return the name of a table, column or index quoted for use in SQL.
+    
+    Quote_SQL_Name(str) -> str
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+def Get_SQL_Types(columns, inc_filters, exc_filters, aggregates, declared):
+    """
+    Return the types of the columns of an SQLite table.
+    
+    Declared types take precedence. Otherwise, columns with numerical
+    filtering criteria are NUMERIC, INTEGER or REAL, depending on the operator,
+    and all others are TEXT. The results of aggregate functions are INTEGER for
+    COUNT and NUMERIC otherwise.
+    
+    Get_SQL_Types(list<int>, list<int,int,str/int/float>,
+            list<int,int,str/int/float>, list<[int,int]>, list<[int,str]>)
+            -> list<str>
+    """
+    inferred = {}
+    for col, op, query in inc_filters + exc_filters:
+        if op in [OP.EQUALS__INT, OP.NOT_EQUAL__INT]:
+            inferred[col] = "INTEGER"
+        elif op in [OP.EQUALS__FLOAT, OP.NOT_EQUAL__FLOAT]:
+            inferred[col] = "REAL"
+        elif op in [OP.GREATER_THAN, OP.GREAQUALS, OP.LESS_THAN, OP.LEQUALS]:
+            inferred.setdefault(col, "NUMERIC")
+    for col, sql_type in declared: inferred[col] = sql_type
+    types = []
+    for col in columns:
+        if col > 0: types.append(inferred.get(col, "TEXT"))
+        else: types.append("TEXT")
+    for function, col in aggregates or []:
+        if function == AGGREGATE.COUNT: types.append("INTEGER")
+        else: types.append("NUMERIC")
+    return types
+
+def Write_NPY_Header(writefile, dtype, length):
+    """
+    Write the header of a NumPy array file (version 1.0) for a one-dimensional
+    array, padded to NPY_HEADER_BYTES.
+    
+    Write_NPY_Header(file, str, int) -> None
+    """
+    header = ("{'descr': '" + dtype + "', 'fortran_order': False, 'shape': (" +
+            str(length) + ",), }")
+    header = header.ljust(NPY_HEADER_BYTES - 11) + "\n"
+    writefile.write("\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) +
+            header)
+
+def Get_Output_Sort_Key(values, sort_output):
+    """
+    Return the key used to sort a row of output, from its values in the sort
+    columns.
+    
+    Numbers are placed before all other values, which are compared as strings.
+    Values sorted as strings in descending order are wrapped in a Reverse_Key.
+    
+    @values
+            (list<str>)
+            The row's values in the sort columns, in the same order as
+            [sort_output]. Any further elements are ignored.
+    @sort_output
+            (list<[int,int,int]>)
+            The sort columns. See Table_To_Table for details.
+    
+    Get_Output_Sort_Key(list<str>, list<[int,int,int]>) -> list
+    """
+    result = []
+    for value, sort_column in zip(values, sort_output):
+        col, order, sort_type = sort_column
+        if sort_type == SORT_TYPE.STR:
+            if order == SORT_ORDER.DESC: result.append(Reverse_Key(value))
+            else: result.append(value)
+            continue
+        try:
+            n = Get_Sort_Value(value, SORT_TYPE.NUM)
+        except ValueError:
+            n = None
+        if n is None or n != n: result.append([1, value]) # Not a number
+        elif order == SORT_ORDER.DESC: result.append([0, -n])
+        else: result.append([0, n])
+    return result
+
+def Is_In_Order(key1, key2, sorted_columns):
+    """
+    Return True if a row with the sort key [key1] may come before a row with the
+    sort key [key2] according to the sort columns.
+    Return False otherwise.
+    
+    Is_In_Order(list<int/float/str>, list<int/float/str>,
+            list<[int,int,int]>) -> bool
+    """
+    for value1, value2, sort_column in zip(key1, key2, sorted_columns):
+        if value1 == value2: continue
+        if sort_column[1] == SORT_ORDER.ASC: return value1 < value2
+        return value1 > value2
+    return True
+
+def Get_Sort_Bounds(inc_filters, sorted_column):
+    """
+    Return the range of values which the inclusion criteria allow for a sorted
+    column, as a list of 4 elements:
+        1) The lower bound. (None if there is no lower bound)
+        2) Whether the lower bound is inclusive.
+        3) The upper bound. (None if there is no upper bound)
+        4) Whether the upper bound is inclusive.
+    Return an empty list if none of the inclusion criteria can be used.
+    
+    Numerical criteria are used for a numerically sorted column, and string
+    equality criteria are used for a lexically sorted column.
+    
+    Get_Sort_Bounds(list<int, int, str/int/float>, [int,int,int]) ->
+            [int/float/str, bool, int/float/str, bool]
+    Get_Sort_Bounds(list<int, int, str/int/float>, [int,int,int]) -> []
+    """
+    col, order, sort_type = sorted_column
+    lower, lower_inc, upper, upper_inc = None, True, None, True
+    used = False
+    for f_col, op, query in inc_filters:
+        if f_col != col: continue
+        new_lower = []
+        new_upper = []
+        if sort_type == SORT_TYPE.NUM:
+            if op == OP.GREATER_THAN: new_lower = [query, False]
+            elif op == OP.GREAQUALS: new_lower = [query, True]
+            elif op == OP.LESS_THAN: new_upper = [query, False]
+            elif op == OP.LEQUALS: new_upper = [query, True]
+            elif op in [OP.EQUALS__INT, OP.EQUALS__FLOAT]:
+                new_lower = new_upper = [query, True]
+        else:
+            if op == OP.EQUALS: new_lower = new_upper = [query, True]
+        # Tighten the bounds
+        if new_lower:
+            used = True
+            if (lower is None or new_lower[0] > lower or
+                    (new_lower[0] == lower and not new_lower[1])):
+                lower, lower_inc = new_lower
+        if new_upper:
+            used = True
+            if (upper is None or new_upper[0] < upper or
+                    (new_upper[0] == upper and not new_upper[1])):
+                upper, upper_inc = new_upper
+    if not used: return []
+    return [lower, lower_inc, upper, upper_inc]
+
+def Get_Sort_Position(data, sorted_column, bounds):
+    """
+    Return the position of a row relative to the rows which could satisfy the
+    range of values in [bounds], in the order of the sorted column.
+    Return -1 if the row comes before all such rows.
+    Return 1 if the row comes after all such rows.
+    Return 0 if the row is within the range, or if its value cannot be
+    compared.
+    
+    Get_Sort_Position(list<str>, [int,int,int],
+            [int/float/str, bool, int/float/str, bool]) -> int
+    """
+    col, order, sort_type = sorted_column
+    lower, lower_inc, upper, upper_inc = bounds
+    try:
+        value = Get_Sort_Value(data[col - 1], sort_type)
+    except (IndexError, ValueError):
+        return 0
+    result = 0
+    if lower is not None:
+        if value < lower or (value == lower and not lower_inc): result = -1
+    if upper is not None and not result:
+        if value > upper or (value == upper and not upper_inc): result = 1
+    if order == SORT_ORDER.DESC: return -result
+    return result
+
+def Bisect_Lines(f, start, end, is_before):
+    """
+    Perform a binary search on the lines of a sorted file, for the first line
+    which does not satisfy [is_before]. Return the position of the start of a
+    line from which a sequential read will reach that line, having only read
+    a small number of lines which satisfy [is_before].
+    
+    @f
+        (file)
+        A file opened for reading.
+    @start
+        (int)
+        The position of the start of the first line to be searched.
+    @end
+        (int)
+        The position of the end of the last line to be searched.
+    @is_before
+        (function)
+        A function which takes a line and returns True if the line comes before
+        the line being searched for.
+    
+    Bisect_Lines(file, int, int, function) -> int
     """
-    temp = []
-    for i in novel_unique: temp.append(data[i])
-    temp = tuple(temp)
-    if temp in recorded_combinations: return ()
-    return temp
+    while end - start > BISECT_MIN_BYTES:
+        middle = (start + end) // 2
+        f.seek(middle)
+        f.readline() # Discard the partial line
+        position = f.tell()
+        if position >= end:
+            end = middle
+            continue
+        line = f.readline()
+        if is_before(line): start = position
+        else: end = middle
+    return start
 
 
 
@@ -974,7 +6162,37 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
         printE(STR__invalid_file_format.format(io = "input", s = inputs[1]))
         return 1
     
-    valid_out = Validate_Write_Path(inputs[2])
+    partition_columns = Get_Partition_Columns(inputs[2])
+    if 0 in partition_columns:
+        printE(STR__invalid_partition_col.format(s = "{col0}"))
+        return 1
+    sqlite_out = False
+    npy_out = False
+    if "-f" in inputs[3:]:
+        i = inputs.index("-f", 3)
+        sqlite_out = inputs[i + 1:i + 2] and inputs[i + 1] in LIST__sqlite
+        npy_out = inputs[i + 1:i + 2] and inputs[i + 1] in LIST__npy
+    appended_out = ("--incremental" in inputs[3:] or
+            "--follow" in inputs[3:] or "--resume" in inputs[3:])
+    if "--estimate" in inputs[3:]:
+        valid_out = 0 # Nothing is written
+    elif partition_columns: # One file per value
+        valid_out = Validate_Write_Pattern([re.sub(r"\{col[0-9]+\}", "*",
+                Escape_Glob(inputs[2]))])
+    elif "--shard" in inputs[3:]: # One file per shard
+        root, ext = os.path.splitext(inputs[2])
+        valid_out = Validate_Write_Pattern([
+                Escape_Glob(root) + "_[0-9]*" + Escape_Glob(ext),
+                Escape_Glob(inputs[2] + ".manifest.json")])
+    elif sqlite_out:
+        valid_out = 0 # Checked once the table name is known
+    elif npy_out: # One file per column
+        root = os.path.splitext(inputs[2])[0]
+        valid_out = Validate_Write_Pattern([Escape_Glob(root) + ".*.npy",
+                Escape_Glob(root + ".schema.json")])
+    elif appended_out and os.path.exists(Get_State_Path(inputs[2])):
+        valid_out = 0 # Appended to
+    else: valid_out = Validate_Write_Path(inputs[2])
     if valid_out == 2: return 0
     if valid_out == 3:
         printE(STR__IO_error_write_forbid)
@@ -993,6 +6211,37 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
     exc_filters = []
     headers = []
     n_uniques = []
+    n_unique_method = [DEDUPE.EXACT]
+    bloom = False
+    window = False
+    sorted_columns = []
+    check_sorted = False
+    profile = False
+    g_uniques = []
+    row_range = []
+    index_interval = 0
+    zone_map_size = 0
+    value_index = []
+    join = []
+    aggregates = []
+    top = []
+    sort_output = []
+    shard = []
+    sqlite = False
+    npy = False
+    sql_table = ""
+    sql_types = []
+    sql_indexes = []
+    cache_dir = ""
+    cache_hash = False
+    incremental = False
+    follow = False
+    checkpoint = 0
+    resume = False
+    limit = 0
+    sample = []
+    estimate = False
+    metrics_json = ""
     
     # Parse the rest
     while inputs:
@@ -1004,7 +6253,11 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
             except:
                 printE(STR__specify_an_output_format)
                 return 1
-            if delim:
+            sqlite = temp in LIST__sqlite
+            npy = temp in LIST__npy
+            if sqlite or npy:
+                delim_out = STR__record_delim
+            elif delim:
                 delim_out = delim
             else:
                 printE(STR__invalid_file_format.format(io = "output", s = temp))
@@ -1043,6 +6296,392 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
             else:
                 # Error messages already printed by Validate_Header_ALL
                 return 1
+        elif arg == "-u": # Columns for globally unique value combinations
+
+            # 1 Arg
+            try:
+                temp = inputs.pop(0)
+            except:
+                printE(STR__specify_global_unique_columns)
+                return 1
+
+            # Validate
+            g_uniques = Validate_Novel_Unique_Columns(temp)
+            if not g_uniques:
+                printE(STR__specify_global_unique_columns)
+                return 1
+        elif arg == "--index": # Build a line index of the input file
+
+            # 1 Arg
+            try:
+                temp = inputs.pop(0)
+            except:
+                printE(STR__specify_index)
+                return 1
+
+            # Validate
+            index_interval = Validate_NC_Num(temp)
+            if not index_interval:
+                printE(STR__invalid_nc_num)
+                return 1
+        elif arg == "--zone-map": # Build a zone map of the input file
+
+            # 1 Arg
+            try:
+                temp = inputs.pop(0)
+            except:
+                printE(STR__specify_zone_map)
+                return 1
+
+            # Validate
+            zone_map_size = Validate_NC_Num(temp)
+            if not zone_map_size:
+                printE(STR__invalid_nc_num)
+                return 1
+        elif arg == "--value-index": # Build a value index of the input file
+
+            # 2 Args
+            try:
+                index_col = inputs.pop(0)
+                index_type = inputs.pop(0)
+            except:
+                printE(STR__specify_value_index)
+                return 1
+
+            # Validate
+            index_col_ = Validate_Column_Number(index_col)
+            if not index_col_:
+                printE(STR__invalid_value_index_col.format(s = index_col))
+                return 1
+            index_type_ = DICT__sort_type.get(index_type, 0)
+            if not index_type_:
+                printE(STR__invalid_sort_type.format(s = index_type))
+                return 1
+            value_index = [index_col_, index_type_]
+        elif arg == "--join": # Join to a lookup table
+
+            # 5 Args
+            try:
+                lookup_path = inputs.pop(0)
+                lookup_format = inputs.pop(0)
+                join_col = inputs.pop(0)
+                lookup_col = inputs.pop(0)
+                join_type = inputs.pop(0)
+            except:
+                printE(STR__specify_join)
+                return 1
+
+            # Validate
+            if Validate_Read_Path(lookup_path) == 1:
+                printE(STR__IO_error_read_lookup)
+                return 1
+            lookup_delim = Validate_File_Format(lookup_format)
+            if not lookup_delim:
+                printE(STR__invalid_file_format.format(io = "lookup",
+                        s = lookup_format))
+                return 1
+            join_col_ = Validate_Column_Number(join_col)
+            lookup_col_ = Validate_Column_Number(lookup_col)
+            if not join_col_ or not lookup_col_:
+                printE(STR__invalid_join_col.format(s = join_col + " " +
+                        lookup_col))
+                return 1
+            join_type_ = DICT__join.get(join_type, 0)
+            if not join_type_:
+                printE(STR__invalid_join_type.format(s = join_type))
+                return 1
+            join = [lookup_path, lookup_delim, join_col_, lookup_col_,
+                    join_type_]
+        elif arg == "--aggregate": # Aggregate the rows of each group
+
+            # 1 or 2 Args
+            try:
+                function = inputs.pop(0)
+            except:
+                printE(STR__specify_aggregate)
+                return 1
+
+            # Validate
+            function_ = DICT__aggregate.get(function, 0)
+            if not function_:
+                printE(STR__invalid_aggregate.format(s = function))
+                return 1
+            col_ = 0
+            if function_ != AGGREGATE.COUNT:
+                try:
+                    col = inputs.pop(0)
+                except:
+                    printE(STR__specify_aggregate)
+                    return 1
+                col_ = Validate_Column_Number(col)
+                if not col_:
+                    printE(STR__invalid_aggregate_col.format(s = col))
+                    return 1
+            aggregates.append([function_, col_])
+        elif arg == "--top": # Keep the top K rows
+
+            # 3 Args
+            try:
+                top_count = inputs.pop(0)
+                top_col = inputs.pop(0)
+                top_order = inputs.pop(0)
+            except:
+                printE(STR__specify_top)
+                return 1
+
+            # Validate
+            top_count_ = Validate_NC_Num(top_count)
+            if not top_count_:
+                printE(STR__invalid_top_count.format(s = top_count))
+                return 1
+            top_col_ = Validate_Column_Number(top_col)
+            if not top_col_:
+                printE(STR__invalid_top_col.format(s = top_col))
+                return 1
+            top_order_ = DICT__top.get(top_order, 0)
+            if not top_order_:
+                printE(STR__invalid_top_order.format(s = top_order))
+                return 1
+            top = [top_count_, top_col_, top_order_]
+        elif arg == "--sort": # Sort the output
+
+            # 3 Args
+            try:
+                sort_col = inputs.pop(0)
+                sort_order = inputs.pop(0)
+                sort_type = inputs.pop(0)
+            except:
+                printE(STR__specify_sort)
+                return 1
+
+            # Validate and Append
+            sort_col_ = Validate_Column_Number(sort_col)
+            if not sort_col_:
+                printE(STR__invalid_sort_col.format(s = sort_col))
+                return 1
+            sort_order_ = DICT__sort_order.get(sort_order, 0)
+            if not sort_order_:
+                printE(STR__invalid_sort_order.format(s = sort_order))
+                return 1
+            sort_type_ = DICT__sort_type.get(sort_type, 0)
+            if not sort_type_:
+                printE(STR__invalid_sort_type.format(s = sort_type))
+                return 1
+            sort_output.append([sort_col_, sort_order_, sort_type_])
+        elif arg == "--shard": # Split the output into shards
+
+            # 2 Args
+            try:
+                shard_type = inputs.pop(0)
+                shard_size = inputs.pop(0)
+            except:
+                printE(STR__specify_shard)
+                return 1
+
+            # Validate
+            shard_type_ = DICT__shard.get(shard_type, 0)
+            if not shard_type_:
+                printE(STR__invalid_shard_type.format(s = shard_type))
+                return 1
+            shard_size_ = Validate_NC_Num(shard_size)
+            if not shard_size_:
+                printE(STR__invalid_shard_size)
+                return 1
+            shard = [shard_type_, shard_size_]
+        elif arg == "--sql-table": # Name of the SQLite table
+            try:
+                sql_table = inputs.pop(0)
+            except:
+                printE(STR__specify_sql_table)
+                return 1
+        elif arg == "--sql-type": # Type of a column of the SQLite table
+
+            # 2 Args
+            try:
+                sql_col = inputs.pop(0)
+                sql_type = inputs.pop(0)
+            except:
+                printE(STR__specify_sql_type)
+                return 1
+
+            # Validate and Append
+            sql_col_ = Validate_Column_Number(sql_col)
+            if not sql_col_:
+                printE(STR__invalid_sql_col.format(s = sql_col))
+                return 1
+            sql_type_ = DICT__sql_type.get(sql_type, "")
+            if not sql_type_:
+                printE(STR__invalid_sql_type.format(s = sql_type))
+                return 1
+            sql_types.append([sql_col_, sql_type_])
+        elif arg == "--sql-index": # Index on a column of the SQLite table
+            try:
+                sql_col = inputs.pop(0)
+            except:
+                printE(STR__invalid_sql_col.format(s = ""))
+                return 1
+            sql_col_ = Validate_Column_Number(sql_col)
+            if not sql_col_:
+                printE(STR__invalid_sql_col.format(s = sql_col))
+                return 1
+            sql_indexes.append(sql_col_)
+        elif arg == "--rows": # Range of rows to process
+
+            # 2 Args
+            try:
+                row_first = inputs.pop(0)
+                row_last = inputs.pop(0)
+            except:
+                printE(STR__specify_rows)
+                return 1
+
+            # Validate
+            row_first_ = Validate_NC_Num(row_first)
+            row_last_ = Validate_NC_Num(row_last)
+            if not row_first_ or row_last_ < row_first_:
+                printE(STR__invalid_rows.format(s = row_first + " " +
+                        row_last))
+                return 1
+            row_range = [row_first_, row_last_]
+        elif arg == "--bloom": # Record unique value combinations approximately
+
+            # 2 Args
+            try:
+                bloom_count = inputs.pop(0)
+                bloom_fp = inputs.pop(0)
+            except:
+                printE(STR__specify_bloom)
+                return 1
+
+            # Validate
+            temp = Validate_Bloom(bloom_count, bloom_fp)
+            if temp:
+                n_unique_method = [DEDUPE.BLOOM] + temp
+                bloom = True
+            else:
+                printE(STR__invalid_bloom.format(s = bloom_count + " " +
+                        bloom_fp))
+                return 1
+        elif arg == "--window": # Record unique value combinations in a window
+
+            # 2 Args
+            try:
+                window_type = inputs.pop(0)
+                window_size = inputs.pop(0)
+            except:
+                printE(STR__specify_window)
+                return 1
+
+            # Validate
+            window_type_ = DICT__window.get(window_type, 0)
+            if not window_type_:
+                printE(STR__invalid_window.format(s = window_type))
+                return 1
+            window_size_ = Validate_NC_Num(window_size)
+            if not window_size_:
+                printE(STR__invalid_window_size)
+                return 1
+            n_unique_method = [window_type_, window_size_]
+            window = True
+        elif arg == "--sorted": # Declare the sort order of the input file
+
+            # 3 Args
+            try:
+                sorted_col = inputs.pop(0)
+                sorted_order = inputs.pop(0)
+                sorted_type = inputs.pop(0)
+            except:
+                printE(STR__specify_sorted)
+                return 1
+
+            # Validate and Append
+            sorted_col_ = Validate_Column_Number(sorted_col)
+            if not sorted_col_:
+                printE(STR__invalid_sorted_col.format(s = sorted_col))
+                return 1
+            sorted_order_ = DICT__sort_order.get(sorted_order, 0)
+            if not sorted_order_:
+                printE(STR__invalid_sort_order.format(s = sorted_order))
+                return 1
+            sorted_type_ = DICT__sort_type.get(sorted_type, 0)
+            if not sorted_type_:
+                printE(STR__invalid_sort_type.format(s = sorted_type))
+                return 1
+            sorted_columns.append([sorted_col_, sorted_order_, sorted_type_])
+        elif arg == "--check-sorted": # Verify the declared sort order
+            check_sorted = True
+        elif arg == "--profile": # Record the statistics of the output
+            profile = True
+        elif arg == "--cache": # Reuse the outputs of identical jobs
+            try:
+                cache_dir = inputs.pop(0)
+            except:
+                printE(STR__specify_cache)
+                return 1
+        elif arg == "--cache-hash": # Identify input files by their contents
+            cache_hash = True
+        elif arg == "--incremental": # Only process newly appended lines
+            incremental = True
+        elif arg == "--follow": # Keep processing newly appended lines
+            follow = True
+        elif arg == "--checkpoint": # Periodically save the state
+
+            # 1 Arg
+            try:
+                temp = inputs.pop(0)
+            except:
+                printE(STR__specify_checkpoint)
+                return 1
+
+            # Validate
+            checkpoint = Validate_NC_Num(temp)
+            if not checkpoint:
+                printE(STR__invalid_nc_num)
+                return 1
+        elif arg == "--resume": # Continue from the last checkpoint
+            resume = True
+        elif arg == "--limit": # Stop once a number of rows are accepted
+
+            # 1 Arg
+            try:
+                temp = inputs.pop(0)
+            except:
+                printE(STR__specify_limit)
+                return 1
+
+            # Validate
+            limit = Validate_NC_Num(temp)
+            if not limit:
+                printE(STR__invalid_nc_num)
+                return 1
+        elif arg == "--metrics-json": # Report the throughput in JSON format
+            try:
+                metrics_json = inputs.pop(0)
+            except:
+                printE(STR__specify_metrics_json)
+                return 1
+        elif arg == "--estimate": # Estimate the cost without any output
+            estimate = True
+        elif arg == "--sample": # Only process a sample of the rows
+
+            # 2 Args
+            try:
+                sample_type = inputs.pop(0)
+                sample_size = inputs.pop(0)
+            except:
+                printE(STR__specify_sample)
+                return 1
+
+            # Validate
+            sample_type_ = DICT__sample.get(sample_type, 0)
+            if not sample_type_:
+                printE(STR__invalid_sample_type.format(s = sample_type))
+                return 1
+            sample_size_ = Validate_NC_Num(sample_size)
+            if not sample_size_:
+                printE(STR__invalid_sample_size)
+                return 1
+            sample = [sample_type_, sample_size_]
             
         else: # Column number of filtering criteria
             flag_error = True
@@ -1055,6 +6694,12 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
                 columns.append(c)
                 flag_error = False
 
+            # If column number of the lookup table
+            c = Validate_Join_Column(arg)
+            if c != 0:
+                columns.append(c)
+                flag_error = False
+
             # If filter criteria
             f_ = Validate_Filter(arg)
             # f_ is either [] or [int, [int,int,str/int/float]]
@@ -1075,9 +6720,130 @@ def Parse_Command_Line_Input__t2t(raw_command_line_input):
         printE(STR__at_least_one_column)
         return 1
     
+    # Ensure the top K rows are not kept from aggregated rows
+    if top and aggregates:
+        printE(STR__top_with_aggregate)
+        return 1
+    
+    # Ensure the SQLite options are used with an SQLite database
+    if ((sql_table or sql_indexes) and not sqlite) or (sql_types and
+            not (sqlite or npy)):
+        printE(STR__sql_without_sqlite)
+        return 1
+    for col in sql_indexes:
+        if col not in columns:
+            printE(STR__sql_index_not_output.format(s = col))
+            return 1
+    if (sqlite or npy) and (partition_columns or shard):
+        printE(STR__sqlite_with_partition)
+        return 1
+    if sqlite: sqlite = [sql_table or "data", sql_types, sql_indexes]
+    else: sqlite = []
+    if sqlite:
+        valid_out = Validate_SQLite_Path(path_out, sqlite[0])
+        if valid_out == 2: return 0
+        if valid_out == 3:
+            printE(STR__IO_error_write_forbid)
+            return 1
+        if valid_out == 4:
+            printE(STR__IO_error_write_unable)
+            return 1
+        if valid_out == 5:
+            printE(STR__IO_error_not_database)
+            return 1
+    if npy: npy = [sql_types]
+    else: npy = []
+    
+    # Ensure the output is either split by value or into shards
+    if partition_columns and shard:
+        printE(STR__shard_with_partition)
+        return 1
+    
+    # Ensure the rows are written to a file per value as they are accepted
+    # (The profile is named after a single output file)
+    if partition_columns and (aggregates or top or sort_output or profile):
+        printE(STR__partition_with_aggregate)
+        return 1
+    
+    # Ensure the output is not sorted if its order is already determined
+    if sort_output and (aggregates or top):
+        printE(STR__sort_with_aggregate)
+        return 1
+    
+    # Ensure the rows profiled are the rows written
+    if profile and (aggregates or top):
+        printE(STR__profile_with_aggregate)
+        return 1
+    
+    # Ensure a single output file for the cache to hold
+    if cache_dir and (profile or shard or sqlite or npy or partition_columns):
+        printE(STR__cache_with_partition)
+        return 1
+    if cache_hash and not cache_dir:
+        printE(STR__hash_without_cache)
+        return 1
+    
+    # Ensure the rows are written to a single file as they are read
+    if (incremental or follow or checkpoint or resume) and (row_range or
+            sorted_columns or g_uniques or aggregates or top or sort_output or
+            profile or shard or cache_dir or sqlite or npy or
+            partition_columns or (sample and sample[0] == SAMPLE.RESERVOIR)):
+        printE(STR__incremental_with_x)
+        return 1
+    
+    # Ensure a lookup table for the lookup table's columns
+    if min(columns) < 0 and not join:
+        printE(STR__join_col_without_join)
+        return 1
+    
+    # Ensure novel unique columns for an approximate record of them
+    if n_unique_method[0] != DEDUPE.EXACT and not n_uniques:
+        printE(STR__method_without_n)
+        return 1
+    
+    # Ensure a single method of recording novel unique columns
+    if bloom and window:
+        printE(STR__bloom_with_window)
+        return 1
+    
+    # Ensure sort columns to check against
+    if check_sorted and not sorted_columns:
+        printE(STR__check_without_sorted)
+        return 1
+    
+    # Estimate the cost of the job from a sample of the input file instead
+    if estimate:
+        Estimate_Table_To_Table(path_in, delim_in, delim_out, columns,
+                inc_filters, exc_filters, headers, n_uniques, n_unique_method,
+                join)
+        return 0
+    
+    # Serve the output of an identical job from the cache
+    # (Random samples differ each time unless SAMPLE_SEED is set)
+    if sample and sample[0] == SAMPLE.RESERVOIR and SAMPLE_SEED is None:
+        cache_dir = ""
+    if cache_dir:
+        paths = [path_in]
+        if join: paths.append(join[0])
+        spec = [delim_in, delim_out, columns, inc_filters, exc_filters,
+                headers, n_uniques, n_unique_method, sorted_columns, g_uniques,
+                row_range, join[1:], aggregates, top, sort_output, limit,
+                sample]
+        if sample and sample[0] == SAMPLE.RESERVOIR: spec.append(SAMPLE_SEED)
+        cache_key = Get_Cache_Key(paths, cache_hash, spec)
+        if Get_Cached_Output(cache_dir, cache_key, path_out):
+            printP(STR__cache_hit)
+            return 0
+    
     # Run program
-    Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
-            inc_filters, exc_filters, headers, n_uniques)
+    result = Table_To_Table(path_in, delim_in, path_out, delim_out, columns,
+            inc_filters, exc_filters, headers, n_uniques, n_unique_method,
+            sorted_columns, check_sorted, g_uniques, row_range, index_interval,
+            zone_map_size, value_index, join, aggregates, top, sort_output,
+            profile, shard, sqlite, npy, incremental, follow, checkpoint,
+            resume, limit, sample, metrics_json)
+    if cache_dir and not result:
+        Add_Cached_Output(cache_dir, cache_key, path_out)
     
     # Safe exit
     return 0
@@ -1129,6 +6895,8 @@ def Validate_Write_Path(filepath):
         if confirm not in LIST__yes: return 2
     # User is not prevented from overwritting and may have chosen to overwrite
     try:
+        if os.stat(filepath).st_nlink > 1: # Leave the other links to the file,
+            os.remove(filepath)            # such as in a result cache, intact
         f = open(filepath, "w")
         f.close()
         if WRITE_CONFIRM: return 1 # User has chosen to overwrite existing file
@@ -1138,6 +6906,83 @@ def Validate_Write_Path(filepath):
 
 
 
+def Validate_Write_Pattern(patterns):
+    """
+    Validates the filepaths of a set of output files whose names are not known
+    in advance, such as a file for each value in a column. Any existing files
+    matching [patterns] may be overwritten.
+    Return 0 if no such files exist.
+    Return 1 if the user decides to overwrite existing files.
+    Return 2 if the user declines to overwrite existing files.
+    Return 3 if such files exist and the program is set to forbid overwriting.
+    
+    @patterns
+        (list<str>)
+        Filepaths in which "*" stands for any part of a filename. See
+        Escape_Glob.
+    
+    Validate_Write_Pattern(list<str>) -> int
+    """
+    existing = []
+    for pattern in patterns: existing += glob.glob(pattern)
+    if not existing: return 0
+    if WRITE_PREVENT: return 3
+    if WRITE_CONFIRM:
+        confirm = raw_input(STR__overwrite_files_confirm.format(
+                N = len(existing)))
+        if confirm not in LIST__yes: return 2
+        return 1
+    return 0
+
+def Escape_Glob(filepath):
+    """
+    Return [filepath] with the characters which have a special meaning in a
+    glob pattern escaped, so that it only matches itself.
+    
+    Escape_Glob(str) -> str
+    """
+    return re.sub(r"([*?[])", r"[\1]", filepath)
+
+
+
+def Validate_SQLite_Path(filepath, table):
+    """
+    Validates the filepath of the SQLite database which the rows of data are
+    inserted into, and whether [table] already exists in it.
+    Return 0 if the table can be created.
+    Return 1 if the user decides to replace an existing table.
+    Return 2 if the user declines to replace an existing table.
+    Return 3 if the table exists and the program is set to forbid overwriting.
+    Return 4 if the program is unable to write to the filepath specified.
+    Return 5 if the file exists but is not an SQLite database.
+    
+    Validate_SQLite_Path(str, str) -> int
+    """
+    if not os.path.exists(filepath):
+        try:
+            f = open(filepath, "w")
+            f.close()
+            return 0 # An empty file is an empty database
+        except:
+            return 4
+    try:
+        connection = sqlite3.connect(filepath)
+        cursor = connection.execute("SELECT 1 FROM sqlite_master WHERE "
+                "type = 'table' AND name = ?", [table])
+        exists = cursor.fetchone() is not None
+        connection.close()
+    except sqlite3.DatabaseError:
+        return 5
+    if not exists: return 0
+    if WRITE_PREVENT: return 3
+    if WRITE_CONFIRM:
+        confirm = raw_input(STR__overwrite_table_confirm.format(s = table))
+        if confirm not in LIST__yes: return 2
+        return 1
+    return 0
+
+
+
 def Validate_File_Format(string):
     """
     Validates the file format specified.
@@ -1189,6 +7034,25 @@ def Validate_Column_Number(string):
 
 
 
+def Validate_Join_Column(string):
+    """
+    Validates and returns the column number of a lookup table, specified as a
+    "j" followed by the column number in the index 1 system.
+    Returns the negative of the column number if valid.
+    Return 0 if the input is invalid.
+    
+    Validate_Join_Column(str) -> int
+    """
+    if string[:1] != "j": return 0
+    try:
+        n = int(string[1:])
+    except:
+        return 0
+    if n < 1: return 0
+    return -n
+
+
+
 def Validate_Filter(string):
     """
     Validates and returns a filter criteria.
@@ -1251,7 +7115,7 @@ def Validate_Filter(string):
         return []
     
     # Validate query
-    query_ = string.replace(s, "")
+    query_ = string[len(s):]
     
     if op in LIST__math_ops: # Greater,less,greaquals,lequals
         try:
@@ -1272,6 +7136,31 @@ def Validate_Filter(string):
             query = float(query_)
         except:
             return [] # Not a float
+    elif s == "in=": # Set membership, listed
+        query = frozenset(query_.split(","))
+    elif s == "in@": # Set membership, from a file
+        query = Load_Query_File(query_)
+        if query is None:
+            printE(STR__IO_error_query_file.format(s = query_))
+            return []
+        query = frozenset(query)
+    elif op in [OP.CONTAINS_ANY, OP.NOT_CONTAIN_ANY]: # Substrings from a file
+        if query_.startswith("@"): # An escaped "@", for a single substring
+            if op == OP.CONTAINS_ANY: op = OP.CONTAINS
+            else: op = OP.NOT_CONTAIN
+            query = query_
+        else:
+            query = Load_Query_File(query_)
+            if query is None:
+                printE(STR__IO_error_query_file.format(s = query_))
+                return []
+            query = Aho_Corasick(query)
+    elif op in [OP.MATCHES, OP.NOT_MATCH]: # Regular expression
+        try:
+            query = Regex_Query(query_)
+        except re.error:
+            printE(STR__invalid_regex.format(s = query_))
+            return []
     else:
         query = query_ # String operation
     
@@ -1280,6 +7169,51 @@ def Validate_Filter(string):
 
 
 
+def Load_Query_File(filepath):
+    """
+    Return a list of the lines in a query file, excluding newline characters.
+    Blank lines are ignored.
+    Return None if the file could not be read.
+    
+    Load_Query_File(str) -> list<str>
+    Load_Query_File(str) -> None
+    """
+    try:
+        f = open(filepath, "U")
+    except IOError:
+        return None
+    result = []
+    for line in f:
+        line = line.rstrip("\n")
+        if line: result.append(line)
+    f.close()
+    return result
+
+
+
+def Get_Required_Literal(pattern, flags):
+    """
+    Return the longest run of literal characters which appears outside of any
+    group, repetition or alternation in a regular expression, and which must
+    therefore be contained by any string it matches.
+    Return an empty string if there is no such run, or if the regular expression
+    ignores case.
+    
+    Get_Required_Literal(str, int) -> str
+    """
+    if flags & re.IGNORECASE: return ""
+    best = ""
+    run = ""
+    for opcode, arg in sre_parse.parse(pattern, flags):
+        if opcode == sre_parse.LITERAL and arg < 256:
+            run += chr(arg)
+        else:
+            run = ""
+        if len(run) > len(best): best = run
+    return best
+
+
+
 def Strip_Non_Inputs(list1):
     """
     Remove the runtime environment variable and program name from the inputs.
@@ -1440,6 +7374,27 @@ def Validate_Novel_Unique_Columns(string):
 
 
 
+def Validate_Bloom(count, fp_rate):
+    """
+    Validate the parameters used to size a Bloom filter.
+    Return a list containing the expected number of items (int) and the false
+    positive rate (float) if they are valid.
+    Return an empty list if either is invalid.
+    
+    Validate_Bloom(str, str) -> [int, float]
+    Validate_Bloom(str, str) -> []
+    """
+    try:
+        count = int(count)
+        fp_rate = float(fp_rate)
+    except:
+        return []
+    if count < 1: return []
+    if not (0 < fp_rate < 1): return []
+    return [count, fp_rate]
+
+
+
 # Controlled Print Statements ##################################################
 
 def printE(string):